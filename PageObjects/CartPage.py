@@ -8,6 +8,7 @@ class CartPage(BaseClass):
     """Page object model for the Cart Page."""
 
     # Locators for elements on the Cart Page
+    l_cart_list = (By.CSS_SELECTOR, ".cart_list")
     l_all_page_products_names = (By.CSS_SELECTOR, ".inventory_item_name")
     l_continue_shopping_button = (By.ID, "continue-shopping")
     l_remove_from_cart_buttons = (By.XPATH, "//button[text() = 'Remove']")
@@ -37,11 +38,11 @@ class CartPage(BaseClass):
 
         :return: An instance of the CheckOutInfoPage class.
         """
-        self._driver.find_element(*CartPage.l_checkout_button).click()
+        self.find(CartPage.l_checkout_button).click()
         return CheckOutInfoPage(self._driver)
 
     def continue_shopping(self):
-        self._driver.find_element(*CartPage.l_continue_shopping_button).click()
+        self.find(CartPage.l_continue_shopping_button).click()
         from PageObjects.ProductsPage import ProductsPage
         return ProductsPage(self._driver)
 
@@ -49,7 +50,7 @@ class CartPage(BaseClass):
         """
         Removes all visible products from the cart by clicking on each "Remove" button.
         """
-        remove_from_cart_buttons = self._driver.find_elements(*CartPage.l_remove_from_cart_buttons)
+        remove_from_cart_buttons = self.find_remove_buttons(CartPage.l_cart_list, CartPage.l_remove_from_cart_buttons)
         for button in remove_from_cart_buttons:
             button.click()
 
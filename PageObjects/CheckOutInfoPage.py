@@ -38,34 +38,34 @@ class CheckOutInfoPage(BaseClass):
         # Clear all and fill in first name
         self.clear_first_name()
         if first_name != '':
-            self._driver.find_element(*CheckOutInfoPage.l_first_name).send_keys(first_name)
+            self.find(CheckOutInfoPage.l_first_name).send_keys(first_name)
 
         # Clear and fill in last name
         self.clear_last_name()
         if last_name != '':
-            self._driver.find_element(*CheckOutInfoPage.l_last_name).send_keys(last_name)
+            self.find(CheckOutInfoPage.l_last_name).send_keys(last_name)
 
         # Clear and fill in postal code
         self.clear_postal_code()
         if postal != '':
-            self._driver.find_element(*CheckOutInfoPage.l_postal_code).send_keys(postal)
+            self.find(CheckOutInfoPage.l_postal_code).send_keys(postal)
 
         # Click 'Continue' to proceed
-        self._driver.find_element(*CheckOutInfoPage.l_continue).click()
+        self.find(CheckOutInfoPage.l_continue).click()
 
         return CheckoutOverviewPage(self._driver)
 
     def clear_first_name(self):
         """Clear the first name input field."""
-        return self._driver.find_element(*CheckOutInfoPage.l_first_name).clear()
+        return self.find(CheckOutInfoPage.l_first_name).clear()
 
     def clear_last_name(self):
         """Clear the last name input field."""
-        self._driver.find_element(*CheckOutInfoPage.l_last_name).clear()
+        self.find(CheckOutInfoPage.l_last_name).clear()
 
     def clear_postal_code(self):
         """Clear the postal code input field."""
-        self._driver.find_element(*CheckOutInfoPage.l_postal_code).clear()
+        self.find(CheckOutInfoPage.l_postal_code).clear()
 
     def get_submit_error_message(self):
         """
@@ -73,7 +73,7 @@ class CheckOutInfoPage(BaseClass):
 
         :return: The login error message as a string.
         """
-        return self._driver.find_element(*CheckOutInfoPage.l_err_msg).text
+        return self.find(CheckOutInfoPage.l_err_msg).text
 
     def clear_submit_error_message(self):
         """
@@ -81,7 +81,7 @@ class CheckOutInfoPage(BaseClass):
 
         :return: None
         """
-        self._driver.find_element(*CheckOutInfoPage.l_err_msg_btn).click()
+        self.find(CheckOutInfoPage.l_err_msg_btn).click()
 
 
 
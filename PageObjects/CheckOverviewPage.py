@@ -30,7 +30,7 @@ class CheckoutOverviewPage(BaseClass):
         :return: Subtotal price as a float.
         """
         # The first 13 characters represent the label (e.g., "Item total: "), so we slice them off
-        return float(self._driver.find_element(*self.l_subtotal_price).text[13:])
+        return float(self.find(self.l_subtotal_price).text[13:])
 
     def _get_tax(self):
         """
@@ -39,7 +39,7 @@ class CheckoutOverviewPage(BaseClass):
         :return: Tax amount as a float.
         """
         # The first 6 characters represent the label (e.g., "Tax: "), so we slice them off
-        return float(self._driver.find_element(*self.l_tax).text[6:])
+        return float(self.find(self.l_tax).text[6:])
 
     def _get_total_price(self):
         """
@@ -48,7 +48,7 @@ class CheckoutOverviewPage(BaseClass):
         :return: Total price as a float.
         """
         # The first 8 characters represent the label (e.g., "Total: "), so we slice them off
-        return float(self._driver.find_element(*self.l_total_price).text[8:])
+        return float(self.find(self.l_total_price).text[8:])
 
     def check_sub_total_price(self):
         """
@@ -60,7 +60,7 @@ class CheckoutOverviewPage(BaseClass):
         displayed_subtotal = self._get_subtotal_price()
 
         # Iterate through each product in the cart and sum up the prices
-        products = self._driver.find_elements(*self.l_cart_items)
+        products = self.find_all(self.l_cart_items)
         for product in products:
             product_price = float(product.find_element(By.CSS_SELECTOR, '.inventory_item_price').text.strip('$'))
             calc_subtotal += product_price
@@ -104,5 +104,5 @@ class CheckoutOverviewPage(BaseClass):
 
         :return: A CheckoutCompletePage object after the checkout is completed.
         """
-        self._driver.find_element(*self.l_finish).click()
+        self.find(self.l_finish).click()
         return CheckoutCompletePage(self._driver)
@@ -22,4 +22,4 @@ class CheckoutCompletePage(BaseClass):
 
         :return: The login error message as a string.
         """
-        return self._driver.find_element(*CheckoutCompletePage.l_success_msg).text
+        return self.find(CheckoutCompletePage.l_success_msg).text
@@ -2,6 +2,7 @@ from Utils.BaseClass import BaseClass
 from selenium.webdriver.common.by import By
 from selenium.common.exceptions import NoSuchElementException
 from PageObjects.ProductsPage import ProductsPage
+from TestData.HomePageData import HomePageData
 
 
 # TODO: Catch exceptions in BaseClass if necessary
@@ -19,6 +20,18 @@ class HomePage(BaseClass):
     l_err_msg = (By.CSS_SELECTOR, 'h3')
     l_err_msg_btn = (By.CSS_SELECTOR, 'h3 button')
 
+    # The application keeps the logged-in user in this cookie
+    SESSION_COOKIE = 'session-username'
+    INVENTORY_PAGE = 'inventory.html'
+
+    # Returns the session user when the browser is on the inventory page with a session cookie, otherwise null
+    _SESSION_STATE_SCRIPT = """
+        if (!window.location.pathname.endsWith('/' + arguments[1])) return null;
+        var prefix = arguments[0] + '=';
+        var cookie = document.cookie.split('; ').find(function (c) { return c.indexOf(prefix) === 0; });
+        return cookie ? cookie.substring(prefix.length) : null;
+    """
+
     def __init__(self, driver):
         """
         Initializes the HomePage object with the WebDriver instance.
@@ -42,10 +55,7 @@ class HomePage(BaseClass):
 
         :return: True if the logo is displayed, False otherwise.
         """
-        try:
-            return self._driver.find_element(*HomePage.l_logo).is_displayed()
-        except NoSuchElementException:
-            return False
+        return self.is_displayed(HomePage.l_logo)
 
     def is_login_btn_displayed(self) -> bool:
         """
@@ -53,10 +63,7 @@ class HomePage(BaseClass):
 
         :return: True if the login button is displayed, False otherwise.
         """
-        try:
-            return self._driver.find_element(*HomePage.l_login_btn).is_displayed()
-        except NoSuchElementException:
-            return False
+        return self.is_displayed(HomePage.l_login_btn)
 
     def get_valid_user_name(self) -> list:
         """
@@ -65,7 +72,7 @@ class HomePage(BaseClass):
         :return: A list of valid usernames found in the 'login_credentials' div.
         """
         try:
-            user_div = self._driver.find_element(*HomePage.l_valid_users)
+            user_div = self.find(HomePage.l_valid_users)
             # Split the content by <br> tags to get each username
             usernames = user_div.get_attribute('innerHTML').split('<br>')
 
@@ -85,7 +92,7 @@ class HomePage(BaseClass):
         """
         try:
             # Locate the password div and extract its inner HTML
-            password_div = self._driver.find_element(*HomePage.l_valid_pw)
+            password_div = self.find(HomePage.l_valid_pw)
             full_text = password_div.get_attribute('innerHTML')
 
             # Extract password from the HTML content by splitting after </h4> tag
@@ -100,7 +107,7 @@ class HomePage(BaseClass):
 
         :return: Placeholder text for the username input field.
         """
-        return self._driver.find_element(*self.l_user_name).get_attribute('placeholder')
+        return self.find(self.l_user_name).get_attribute('placeholder')
 
     def get_password_hint(self) -> str:
         """
@@ -108,7 +115,7 @@ class HomePage(BaseClass):
 
         :return: Placeholder text for the password input field.
         """
-        return self._driver.find_element(*self.l_pw).get_attribute('placeholder')
+        return self.find(self.l_pw).get_attribute('placeholder')
 
     def login(self, user='standard_user', pw='secret_sauce') -> ProductsPage:
         """
@@ -122,10 +129,40 @@ class HomePage(BaseClass):
         :return: ProductsPage object representing the products page after login.
         """
         self.clear_username()
-        self._driver.find_element(*HomePage.l_user_name).send_keys(user)
+        self.find(HomePage.l_user_name).send_keys(user)
         self.clear_password()
-        self._driver.find_element(*HomePage.l_pw).send_keys(pw)
-        self._driver.find_element(*HomePage.l_login_btn).click()
+        self.find(HomePage.l_pw).send_keys(pw)
+        self.find(HomePage.l_login_btn).click()
+        return ProductsPage(self._driver)
+
+    def login_with_session(self, user='standard_user', pw='secret_sauce') -> ProductsPage:
+        """
+        Opens the Products Page as an authenticated user without going through the login form.
+
+        Sets the application's session cookie for the user and navigates straight to the inventory page.
+        Falls back to the UI login when the run is started with --ui_login.
+
+        :param user: A valid username from HomePageData.
+        :param pw: The password, only used by the UI login fallback.
+        :return: ProductsPage object representing the products page after login.
+        :raises ValueError: If the user is not a valid user in HomePageData.
+        """
+        if BaseClass.force_ui_login:
+            return self.login(user, pw)
+
+        login_data = HomePageData.test_home_page_login[0]
+        valid_users = login_data['users']
+        if user not in valid_users or user == login_data['locked_user']:
+            raise ValueError(f"Can't open a session for '{user}', expected one of: {valid_users}")
+
+        # A session kept by the previous reset is reused as is
+        if BaseClass.keep_session and self._driver.execute_script(
+                HomePage._SESSION_STATE_SCRIPT, HomePage.SESSION_COOKIE, HomePage.INVENTORY_PAGE) == user:
+            return ProductsPage(self._driver)
+
+        # The cookie is set for the current domain, the driver is already on the application
+        self._driver.add_cookie({'name': HomePage.SESSION_COOKIE, 'value': user, 'path': '/'})
+        self._driver.get(self.BASE_URL + HomePage.INVENTORY_PAGE)
         return ProductsPage(self._driver)
 
     def clear_username(self):
@@ -134,7 +171,7 @@ class HomePage(BaseClass):
 
         :return: None
         """
-        self._driver.find_element(*HomePage.l_user_name).clear()
+        self.find(HomePage.l_user_name).clear()
 
     def clear_password(self):
         """
@@ -142,7 +179,7 @@ class HomePage(BaseClass):
 
         :return: None
         """
-        self._driver.find_element(*HomePage.l_pw).clear()
+        self.find(HomePage.l_pw).clear()
 
     def get_login_error_message(self):
         """
@@ -150,7 +187,7 @@ class HomePage(BaseClass):
 
         :return: The login error message as a string.
         """
-        return self._driver.find_element(*HomePage.l_err_msg).text
+        return self.find(HomePage.l_err_msg).text
 
     def clear_login_error_message(self):
         """
@@ -158,5 +195,5 @@ class HomePage(BaseClass):
 
         :return: None
         """
-        self._driver.find_element(*HomePage.l_err_msg_btn).click()
+        self.find(HomePage.l_err_msg_btn).click()
 
@@ -14,6 +14,7 @@ class ProductsPage(BaseClass):
     """
 
     # Locators for elements on the Products Page
+    l_inventory_list = (By.CSS_SELECTOR, ".inventory_list")
     l_all_products = (By.CSS_SELECTOR, ".inventory_item")
     l_all_page_products_names = (By.CSS_SELECTOR, ".inventory_item_name")
     l_all_product_description = (By.CSS_SELECTOR, ".inventory_item_desc")
@@ -22,6 +23,30 @@ class ProductsPage(BaseClass):
     l_remove_from_cart_buttons = (By.XPATH, "//button[text() = 'Remove']")
     l_sort_dropdown = (By.CSS_SELECTOR, ".product_sort_container")
 
+    # The application keeps the cart as a JSON list of product ids in localStorage
+    CART_STORAGE_KEY = 'cart-contents'
+
+    # Product name -> product id, read once from the inventory page and shared by all instances
+    _product_ids = None
+
+    # Reads every product of the page, in display order, in one round trip. The id comes from the
+    # 'item_<id>_title_link' link, the button id tells whether the product is in the cart ('remove-...')
+    _CATALOG_SCRIPT = """
+        return Array.prototype.map.call(document.querySelectorAll('.inventory_item'), function (item) {
+            var link = item.querySelector('a[id$="_title_link"]');
+            var image = item.querySelector('img.inventory_item_img');
+            var button = item.querySelector('button');
+            return {
+                id: parseInt(link.id.split('_')[1], 10),
+                name: item.querySelector('.inventory_item_name').innerText.trim(),
+                description: item.querySelector('.inventory_item_desc').innerText.trim(),
+                price: item.querySelector('.inventory_item_price').innerText.trim(),
+                image: image ? image.src : null,
+                button_id: button ? button.id : null
+            };
+        });
+    """
+
     def __init__(self, driver):
         """
         Initializes the ProductsPage object
@@ -30,6 +55,7 @@ class ProductsPage(BaseClass):
         """
         super().__init__()
         self._driver = driver
+        self._catalog = None  # Snapshot of the current page view, see get_catalog
 
     def get_page_products_name(self):
         """
@@ -39,6 +65,26 @@ class ProductsPage(BaseClass):
         """
         return self.get_products_name(ProductsPage.l_all_page_products_names)
 
+    def get_catalog(self) -> list:
+        """
+        Returns a snapshot of every product on the page, in display order.
+
+        The snapshot is read in a single script call and kept until the page view changes (sort, navigation,
+        cart change), so repeated product queries cost no further round trips.
+
+        :return: A list of dicts with the keys id, name, description, price, image and button_id.
+        """
+        if self._catalog is None:
+            if not self.find_all(ProductsPage.l_all_products):
+                return []
+            self._catalog = self._driver.execute_script(ProductsPage._CATALOG_SCRIPT)
+            if ProductsPage._product_ids is None:
+                ProductsPage._product_ids = {item['name']: item['id'] for item in self._catalog}
+        return self._catalog
+
+    def _page_changed(self):
+        self._catalog = None
+
     def get_product_info(self, product_name):
         """
         Retrieves the details, price, and image source for a given product.
@@ -46,15 +92,9 @@ class ProductsPage(BaseClass):
         :param product_name: The name of the product to retrieve information for.
         :return: A tuple containing product details (description), price, and image URL.
         """
-        products = self._driver.find_elements(*ProductsPage.l_all_products)
-        for product in products:
-            if product_name in product.text:
-                product_image = self._driver.find_element(By.CSS_SELECTOR, f"img[alt='{product_name}']")
-                image_src = product_image.get_attribute('src')
-                info = product.text.split('\n')
-                product_details = info[1]
-                product_price = info[2]
-                return product_details, product_price, image_src
+        for product in self.get_catalog():
+            if product['name'] == product_name:
+                return product['description'], product['price'], product['image']
 
     def get_product_details(self, product_name):
         """
@@ -87,17 +127,20 @@ class ProductsPage(BaseClass):
         """
         Adds all visible products to the cart by clicking on each "Add to cart" button.
         """
-        add_to_cart_buttons = self._driver.find_elements(*ProductsPage.l_add_to_cart_buttons)
+        add_to_cart_buttons = self.find_all(ProductsPage.l_add_to_cart_buttons)
         for button in add_to_cart_buttons:
             button.click()
+        self._page_changed()
 
     def remove_all_products_from_the_cart(self):
         """
         Removes all visible products from the cart by clicking on each "Remove" button.
         """
-        remove_from_cart_buttons = self._driver.find_elements(*ProductsPage.l_remove_from_cart_buttons)
+        remove_from_cart_buttons = self.find_remove_buttons(ProductsPage.l_inventory_list,
+                                                            ProductsPage.l_remove_from_cart_buttons)
         for button in remove_from_cart_buttons:
             button.click()
+        self._page_changed()
 
     def add_product_to_cart(self, product_name):
         """
@@ -130,7 +173,45 @@ class ProductsPage(BaseClass):
                 btn_id = f"add-to-cart-{product_formatted}"
             else:  # remove
                 btn_id = f"remove-{product_formatted}"
-            self._driver.find_element(By.ID, btn_id).click()
+            self.find((By.ID, btn_id)).click()
+        self._page_changed()
+
+    def get_product_ids(self):
+        """
+        Returns the product name to product id map, reading it from the inventory page on first use.
+
+        :return: A dict mapping product names to their ids in the application.
+        """
+        if ProductsPage._product_ids is None:
+            self.get_catalog()
+        return ProductsPage._product_ids
+
+    def seed_cart(self, product_names=None):
+        """
+        Puts products in the cart by writing the application's cart storage directly, instead of clicking
+        each "Add to cart" button. The page is refreshed so the cart badge and the buttons reflect the cart.
+
+        Any product already in the cart is replaced. Use add_product_to_cart for tests about adding products.
+
+        :param product_names: The name or list of names of products to put in the cart, all products if None.
+        :raises ValueError: If a product name is unknown.
+        """
+        product_ids = self.get_product_ids()
+        if product_names is None:
+            product_names = list(product_ids)
+        elif type(product_names) is str:  # handle cases where a single name is sent
+            product_names = [product_names]
+
+        unknown = [name for name in product_names if name not in product_ids]
+        if unknown:
+            raise ValueError(f"Unknown products: {unknown}")
+
+        cart = sorted({product_ids[name] for name in product_names})
+        self._driver.execute_script(
+            "window.localStorage.setItem(arguments[0], JSON.stringify(arguments[1]));",
+            ProductsPage.CART_STORAGE_KEY, cart)
+        self._driver.refresh()
+        self._page_changed()
 
     def check_if_product_added(self, product_name):
         """
@@ -138,10 +219,10 @@ class ProductsPage(BaseClass):
 
         :param product_name: The name of the product to check for.
         :return: The WebElement representing the remove button if found.
-        :raises NoSuchElementException: If the remove button for the product is not found.
+        :raises NoSuchElementException: If the remove button for the product is not found (checked without waiting).
         """
         l_remove_btn_by_name = f"remove-{product_name.lower().replace(' ', '-')}"
-        return self._driver.find_element(By.ID, l_remove_btn_by_name)
+        return self.find((By.ID, l_remove_btn_by_name), timeout=0)
 
     def click_product_by_name(self, product_name):
         """
@@ -150,7 +231,8 @@ class ProductsPage(BaseClass):
         :param product_name: The name of the product to click on.
         :return: An instance of the SingleProductPage class.
         """
-        self._driver.find_element(By.LINK_TEXT, product_name).click()
+        self.find((By.LINK_TEXT, product_name)).click()
+        self._page_changed()
         return SingleProductPage(self._driver)
 
     def sort_products_by(self, sorting_option):
@@ -159,8 +241,9 @@ class ProductsPage(BaseClass):
 
         :param sorting_option: The sorting option to select (e.g., 'Name (A to Z)', 'Price (low to high)').
         """
-        self._driver.find_element(*ProductsPage.l_sort_dropdown).click()
-        self._driver.find_element(By.XPATH, f"//option[text()='{sorting_option}']").click()
+        self.find(ProductsPage.l_sort_dropdown).click()
+        self.find((By.XPATH, f"//option[text()='{sorting_option}']")).click()
+        self._page_changed()
 
     def verify_sorting_is_correct(self, sorting_option):
         """
@@ -169,21 +252,20 @@ class ProductsPage(BaseClass):
         :param sorting_option: The sorting option used for verification.
         :return: True if the products are sorted correctly, False otherwise.
         """
-        products_names = self._driver.find_elements(*ProductsPage.l_all_page_products_names)
-        products_prices = self._driver.find_elements(*ProductsPage.l_all_page_products_prices)
+        catalog = self.get_catalog()
 
         if sorting_option == 'Name (Z to A)':
-            product_list = [pr.text for pr in products_names]
+            product_list = [product['name'] for product in catalog]
             return product_list == sorted(product_list, reverse=True)
 
         elif sorting_option == 'Name (A to Z)':
-            product_list = [pr.text for pr in products_names]
+            product_list = [product['name'] for product in catalog]
             return product_list == sorted(product_list)
 
         elif sorting_option == 'Price (low to high)':
-            product_list = [float(pr.text.strip('$')) for pr in products_prices]
+            product_list = [float(product['price'].strip('$')) for product in catalog]
             return product_list == sorted(product_list)
 
         elif sorting_option == 'Price (high to low)':
-            product_list = [float(pr.text.strip('$')) for pr in products_prices]
+            product_list = [float(product['price'].strip('$')) for product in catalog]
             return product_list == sorted(product_list, reverse=True)
@@ -30,7 +30,7 @@ class SideBar(BaseClass):
         This method locates the 'log out' button within the sidebar and clicks it.
         """
         # Locate and click the log-out button in the sidebar
-        self._driver.find_element(*SideBar.l_log_out).click()
+        self.find(SideBar.l_log_out).click()
 
     def reset_app_and_logout(self):
         """
@@ -40,7 +40,7 @@ class SideBar(BaseClass):
         then proceeds to log out of the application.
         """
         # Click the reset application state button in the sidebar to clear data
-        self._driver.find_element(*SideBar.l_reset_app_state).click()
+        self.find(SideBar.l_reset_app_state).click()
 
         # After resetting the app, log out of the application
         self.log_out()
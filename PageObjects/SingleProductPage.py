@@ -26,27 +26,27 @@ class SingleProductPage(BaseClass):
 
     def get_product_name(self):
         """Retrieve the product name."""
-        return self._driver.find_element(*self.l_product_name).text
+        return self.find(self.l_product_name).text
 
     def get_product_price(self):
         """Retrieve the product price."""
-        return self._driver.find_element(*self.l_product_price).text
+        return self.find(self.l_product_price).text
 
     def get_product_details(self):
         """Retrieve the product description."""
-        return self._driver.find_element(*self.l_product_details).text
+        return self.find(self.l_product_details).text
 
     def get_product_image(self):
         """Retrieve the product image URL."""
-        return self._driver.find_element(*self.l_product_image).get_attribute('src')
+        return self.find(self.l_product_image).get_attribute('src')
 
     def add_product_to_cart(self):
         """Add the product to the cart."""
-        self._driver.find_element(*self.l_add_to_cart_button).click()
+        self.find(self.l_add_to_cart_button).click()
 
     def remove_product_from_cart(self):
         """Remove the product from the cart."""
-        self._driver.find_element(*self.l_remove_from_cart_button).click()
+        self.find(self.l_remove_from_cart_button).click()
 
     def back_to_product_page_click(self):
         """
@@ -54,6 +54,6 @@ class SingleProductPage(BaseClass):
 
         :return: ProductsPage instance.
         """
-        self._driver.find_element(*self.l_back_to_products).click()
+        self.find(self.l_back_to_products).click()
         from PageObjects.ProductsPage import ProductsPage
         return ProductsPage(self._driver)
@@ -18,7 +18,7 @@ class Name_TestSingleProductsPageRemove(BaseClass):
         try:
 
             # Log into the application
-            products_page = home_page.login()
+            products_page = home_page.login_with_session()
             log.info("Login successful")
 
 
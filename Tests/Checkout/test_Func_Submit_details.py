@@ -26,11 +26,11 @@ class TestSubmitData(BaseClass):
 
         try:
             # Log into the application
-            products_page = home_page.login()
+            products_page = home_page.login_with_session()
             log.info("Login successful")
 
             # Add all products to the cart and navigate to checkout
-            products_page.add_all_products_to_cart()
+            products_page.seed_cart()
             cart_page = products_page.click_shopping_cart()
             checkout_info_page = cart_page.checkout()
 
@@ -46,12 +46,12 @@ class TestPriceInCartCalc(BaseClass):
             number_of_products_to_add = len(product_name_from_data)
 
             # Login to the application
-            products_page = home_page.login()
+            products_page = home_page.login_with_session()
             log.info("Login successful")
 
             # Add specified products to the shopping cart
             log.info(f"Starting test with products: {product_name_from_data}")
-            products_page.add_product_to_cart(product_name_from_data)
+            products_page.seed_cart(product_name_from_data)
             log.info(f"Added {product_name_from_data} to the cart")
 
             # Proceed to the shopping cart and initiate the checkout process
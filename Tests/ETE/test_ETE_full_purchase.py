@@ -27,7 +27,7 @@ class TestFullPurchase(BaseClass):
 
         try:
             # Step 1: Log into the application
-            products_page = home_page.login()
+            products_page = home_page.login_with_session()
             log.info("Login successful")
 
             # Step 2: Add the product to the cart
@@ -0,0 +1,84 @@
+import allure
+from PageObjects.HomePage import HomePage
+from Utils.BaseClass import BaseClass
+
+
+@allure.feature("ETE")
+@allure.story("Concurrent Shoppers")
+@allure.severity(allure.severity_level.CRITICAL)
+class TestFullPurchaseLoad:
+    """
+    Runs the full purchase flow with many concurrent virtual users, following the --load_stages profile.
+    Skipped unless --load_stages is given.
+    """
+    MAX_ERROR_RATE = 0.02  # Highest tolerated share of failed flows
+    MAX_STEP_P90 = 5  # Highest tolerated p90 of each step, in seconds
+    # performance_glitch_user is slow by design (its product page alone takes seconds), it has its own budget
+    MAX_STEP_P90_BY_USER = {'performance_glitch_user': 10}
+
+    USERS = ['standard_user', 'performance_glitch_user', 'visual_user']
+    PRODUCTS = ['Sauce Labs Onesie', 'Sauce Labs Backpack', 'Sauce Labs Bike Light']
+
+    @classmethod
+    def full_purchase_flow(cls, vu):
+        """
+        One shopper's purchase, each page transition timed as a step:
+        login -> add a product -> cart -> checkout -> finish, thinking between the steps.
+
+        :param vu: The VirtualUser running the flow.
+        """
+        with vu.step("login"):
+            products_page = HomePage(vu.driver).login(vu.user)
+        vu.think()
+
+        with vu.step("add product"):
+            products_page.add_product_to_cart(cls.PRODUCTS[vu.iteration % len(cls.PRODUCTS)])
+        vu.think()
+
+        with vu.step("cart"):
+            cart_page = products_page.click_shopping_cart()
+        vu.think()
+
+        with vu.step("checkout"):
+            check_out_overview_page = cart_page.checkout().submit_info()
+        vu.think()
+
+        with vu.step("finish"):
+            success_message = check_out_overview_page.finish_buy().get_success_message()
+            assert success_message == 'Thank you for your order!', f"Unexpected message '{success_message}'"
+
+        # Untimed: the next flow starts logged out from the base URL
+        products_page.reset_application_state(keep_session=False)
+
+    def test_full_purchase_under_load(self, load_runner):
+        """
+        Runs the load profile and checks the share of failed flows and the p90 latency of every step, per user.
+
+        :param load_runner: The LoadRunner configured from the --load_* options.
+        """
+        log = BaseClass.log_manager.get_logger()
+        load_runner.flow = self.full_purchase_flow
+        load_runner.users = self.USERS
+
+        stats = load_runner.run()
+
+        summary = "\n".join(stats.summary_lines())
+        log.info(f"Load profile finished:\n{summary}")
+        allure.attach(summary + "\n\nLive reports:\n" + "\n".join(load_runner.reports),
+                      name="Load summary", attachment_type=allure.attachment_type.TEXT)
+
+        failures = []
+        if stats.error_rate() > self.MAX_ERROR_RATE:
+            failures.append(f"{stats.error_rate() * 100:.1f}% of the flows failed "
+                            f"(limit {self.MAX_ERROR_RATE * 100:.0f}%)")
+        for step in stats.latencies:
+            for user in self.USERS:
+                p90 = stats.step_percentile(step, 0.9, user)
+                limit = self.MAX_STEP_P90_BY_USER.get(user, self.MAX_STEP_P90)
+                if p90 > limit:
+                    failures.append(f"Step '{step}' p90 {p90:.3f}s for {user} exceeds {limit}s")
+
+        if failures:
+            failure_lines = "\n".join(failures)
+            log.error(f"Failures detected:\n{failure_lines}")
+            assert False, f"Load test failed:\n{failure_lines}"
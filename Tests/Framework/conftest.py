@@ -0,0 +1,81 @@
+import functools
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+import pytest
+from PIL import Image
+
+
+class CountingHandler(SimpleHTTPRequestHandler):
+    """Static file handler that counts requests and full (non-304) responses."""
+
+    requests = 0
+    full_responses = 0
+
+    def send_response(self, code, message=None):
+        type(self).requests += 1
+        if code == 200:
+            type(self).full_responses += 1
+        super().send_response(code, message)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class RecordingDriver:
+    """Driver stand-in that records the DevTools commands it receives."""
+
+    def __init__(self, browser):
+        self.capabilities = {'browserName': browser}
+        self.commands = []
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append((command, params))
+        return {}
+
+
+@pytest.fixture
+def recording_driver():
+    """
+    Creates drivers that record their DevTools commands instead of sending them to a browser.
+
+    :return: Callable taking the browser name, e.g. recording_driver('chrome').
+    """
+    return RecordingDriver
+
+
+@pytest.fixture(scope="session")
+def static_server():
+    """
+    Starts static file servers on free ports of 127.0.0.1, all stopped at the end of the session.
+
+    :return: Callable taking a directory and returning (base URL, handler class with the request counters).
+    """
+    servers = []
+
+    def serve(directory):
+        handler = type('Handler', (CountingHandler,), {'requests': 0, 'full_responses': 0})
+        server = ThreadingHTTPServer(('127.0.0.1', 0), functools.partial(handler, directory=str(directory)))
+        server.daemon_threads = True
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        servers.append(server)
+        return f"http://127.0.0.1:{server.server_address[1]}/", handler
+
+    yield serve
+    for server in servers:
+        server.shutdown()
+        server.server_close()
+
+
+@pytest.fixture
+def image_server(tmp_path, static_server):
+    """
+    Serves two identical product images and a different one from a local static file server.
+
+    :return: Tuple of (base URL, handler class with the request counters, directory of the images).
+    """
+    Image.new('RGB', (500, 500), (200, 30, 30)).save(tmp_path / 'backpack.png')
+    Image.new('RGB', (500, 500), (200, 30, 30)).save(tmp_path / 'backpack_copy.png')
+    Image.new('RGB', (500, 500), (30, 30, 200)).save(tmp_path / 'bike_light.png')
+
+    base_url, handler = static_server(tmp_path)
+    return base_url, handler, tmp_path
@@ -0,0 +1,55 @@
+import allure
+from Utils import BrowserTiming as browser_timing
+from Utils.BrowserTiming import BrowserTiming
+
+
+class ScriptedDriver:
+    """Driver stand-in answering the quiet checks in turn, as a page rendering a delayed response would."""
+
+    def __init__(self, quiet, end):
+        self.quiet = list(quiet)
+        self.end = end
+        self.scripts = []
+
+    def execute_script(self, script, *args):
+        if script == browser_timing._QUIET_SCRIPT:
+            self.scripts.append('quiet')
+            return self.quiet.pop(0) if len(self.quiet) > 1 else self.quiet[0]
+        if script == browser_timing._END_SCRIPT:
+            self.scripts.append('end')
+            return dict(self.end)
+        self.scripts.append('start')
+        return None
+
+
+@allure.feature("Framework")
+@allure.story("Browser Timing")
+@allure.severity(allure.severity_level.NORMAL)
+class TestBrowserTiming:
+    """
+    Tests how a browser timed step waits for the page to settle before it ends.
+    """
+
+    def test_step_ends_after_the_quiet_window(self):
+        # Loading a new document (None), then mutating (10, 150 ms since the last mutation), then quiet
+        driver = ScriptedDriver([None, 10, 150, 600], {'same_document': True, 'triggered': True, 'duration': 1250})
+        timing = BrowserTiming(driver, quiet_window=0.5, poll_interval=0)
+
+        with timing.step("Sort") as step:
+            pass
+
+        assert driver.scripts == ['start', 'quiet', 'quiet', 'quiet', 'quiet', 'end']
+        assert step.duration == 1.25
+        assert step.details['timed_out'] is False
+        assert timing.steps == [step]
+
+    def test_step_ends_at_the_timeout(self):
+        driver = ScriptedDriver([0], {'same_document': False, 'from_trigger': True, 'duration': 3000})
+        timing = BrowserTiming(driver, quiet_window=0.5, timeout=0.05, poll_interval=0.01)
+
+        with timing.step("Login") as step:
+            pass
+
+        assert step.details['timed_out'] is True
+        assert step.duration == 3.0
+        assert driver.scripts[-1] == 'end'
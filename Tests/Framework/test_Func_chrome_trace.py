@@ -0,0 +1,91 @@
+import json
+import pytest
+import allure
+from Utils.ChromeTrace import ChromeTracer, TraceSummary, events_from_performance_log, load_trace
+from Utils.PerfHarness import PerfStats
+from Utils.PerfHistory import PerfHistory
+
+# One long task (a click handler running a render function, then a layout) and one short task painting
+EVENTS = [
+    {'ph': 'X', 'pid': 1, 'tid': 1, 'ts': 0, 'dur': 120000, 'name': 'RunTask'},
+    {'ph': 'X', 'pid': 1, 'tid': 1, 'ts': 500, 'dur': 82000, 'name': 'EventDispatch',
+     'args': {'data': {'type': 'click'}}},
+    {'ph': 'X', 'pid': 1, 'tid': 1, 'ts': 1000, 'dur': 80000, 'name': 'FunctionCall',
+     'args': {'data': {'url': 'http://localhost/static/js/app.js', 'functionName': 'render', 'lineNumber': 10}}},
+    {'ph': 'X', 'pid': 1, 'tid': 1, 'ts': 85000, 'dur': 20000, 'name': 'Layout'},
+    {'ph': 'X', 'pid': 1, 'tid': 1, 'ts': 200000, 'dur': 10000, 'name': 'RunTask'},
+    {'ph': 'B', 'pid': 1, 'tid': 1, 'ts': 201000, 'name': 'Paint'},
+    {'ph': 'E', 'pid': 1, 'tid': 1, 'ts': 205000, 'name': 'Paint'},
+]
+
+
+def performance_log(events):
+    """Wraps trace events the way chromedriver's performance log hands them over."""
+    entries = [{'level': 'INFO', 'timestamp': 0, 'message': json.dumps(
+        {'webview': '', 'message': {'method': 'Tracing.bufferUsage', 'params': {'percentFull': 0.1}}})}]
+    return entries + [{'level': 'INFO', 'timestamp': 0, 'message': json.dumps(
+        {'webview': '', 'message': {'method': 'Tracing.dataCollected', 'params': event}})} for event in events]
+
+
+class TracedDriver:
+    """Driver stand-in whose performance log holds the test's trace after the first read."""
+
+    capabilities = {'browserName': 'chrome'}
+
+    def __init__(self):
+        self.reads = 0
+
+    def get_log(self, log_type):
+        self.reads += 1
+        return performance_log(EVENTS) if self.reads > 1 else performance_log([])
+
+
+@allure.feature("Framework")
+@allure.story("Chrome Performance Trace")
+@allure.severity(allure.severity_level.NORMAL)
+class TestChromeTrace:
+    """
+    Tests the trace summary and the tracer on a synthetic trace.
+    """
+
+    def test_summary_finds_hot_spots(self):
+        summary = TraceSummary(events_from_performance_log(performance_log(EVENTS)))
+
+        times = summary.category_times()
+        assert times['scripting'] == pytest.approx(0.082)
+        assert times['layout'] == pytest.approx(0.020)
+        assert times['paint'] == pytest.approx(0.004)
+        assert times['other'] == pytest.approx(0.024)  # RunTask self time
+        assert summary.long_tasks() == [(0.0, 0.12, 'EventDispatch (click) 82.0 ms')]
+        assert summary.slowest_handlers() == [('click', 0.0005, 0.082)]
+        assert summary.duration == pytest.approx(0.21)
+
+    def test_tracer_stores_compressed_trace(self, tmp_path):
+        tracer = ChromeTracer(str(tmp_path / 'traces'))
+        driver = TracedDriver()
+
+        assert tracer.begin(driver)
+        summary, path = tracer.end(driver, 'Tests/Products/test_sort.py::TestSort::test_sort[az]', 1.5)
+
+        assert path.endswith('Tests_Products_test_sort.py_TestSort_test_sort_az.json.gz')
+        assert load_trace(path) == EVENTS
+        assert 'Long tasks (>= 50 ms):\n  +0.000s   120.0 ms  EventDispatch (click) 82.0 ms' in summary
+        assert tracer.traces == 1 and tracer.traced_seconds == 1.5 and tracer.collection_seconds > 0
+
+        class Firefox:
+            capabilities = {'browserName': 'firefox'}
+        assert not tracer.begin(Firefox())
+
+    def test_overhead_against_untraced_history(self, tmp_path):
+        history = PerfHistory(str(tmp_path / 'perf_history.db'))
+        history.record(1, 'chrome', 'local', 'performance_glitch_user', 'Sort [network 3g]', [1.0] * 5)
+        traced = PerfStats('Sort [trace on, network 3g] (performance_glitch_user)', [1.02] * 5, [], resamples=10)
+        traced.series = ('Sort', 'performance_glitch_user')
+        tracer = ChromeTracer(str(tmp_path / 'traces'))
+
+        lines = tracer.overhead_report([('Sort (performance_glitch_user)', {'trace': 'on', 'network': '3g'}, traced)],
+                                       history, (2, 'chrome', 'local'))
+        history.close()
+
+        assert '1.000s in 1 untraced runs (+2.0%)' in lines[1]
+        assert lines[-1] == "Median tracing overhead on perf steps +2.0% (limit 5%): safe to leave on"
@@ -0,0 +1,124 @@
+import pytest
+import allure
+from Utils.BaseClass import BaseClass
+from Utils.CommandProfiler import TEST_CODE, CommandProfiler, framework_commands
+from Utils.MemoryMonitor import MemoryMonitor
+
+
+class FakeExecutor:
+    """RemoteConnection stand-in answering every command at once."""
+
+    def __init__(self):
+        self.commands = []
+
+    def execute(self, command, params):
+        self.commands.append(command)
+        return {'value': None}
+
+
+class FakeDriver:
+    """Chrome driver stand-in sending its commands through the executor, like WebDriver.execute."""
+
+    capabilities = {'browserName': 'chrome'}
+    session_id = 'session-1'
+
+    def __init__(self):
+        self.command_executor = FakeExecutor()
+
+    def execute(self, command, params=None):
+        return self.command_executor.execute(command, params or {})
+
+    def execute_cdp_cmd(self, command, params):
+        self.execute('executeCdpCommand', {'cmd': command, 'params': params})
+        return {'metrics': []}
+
+
+class OverviewPage(BaseClass):
+    """Page object reading every cart item with its own command, as check_sub_total_price does."""
+
+    def __init__(self, driver):
+        super().__init__()
+        self._driver = driver
+
+    def item_prices(self, items):
+        self._driver.execute('findElements')
+        return [self._price() for _ in range(items)]
+
+    def _price(self):
+        self._driver.execute('findChildElement')
+        return self._driver.execute('getElementText')
+
+
+@allure.feature("Framework")
+@allure.story("WebDriver Command Profiler")
+@allure.severity(allure.severity_level.NORMAL)
+class TestCommandProfiler:
+    """
+    Tests the WebDriver command counting and attribution on a fake driver.
+    """
+
+    @pytest.fixture(autouse=True)
+    def no_session_monitors(self, monkeypatch):
+        """
+        Keeps the memory monitor and method profiler of the session (--memory_monitor, --method_profile) off
+        the fake driver.
+        """
+        monkeypatch.setattr(BaseClass, 'memory_monitor', None)
+        monkeypatch.setattr(BaseClass, 'method_profiler', None)
+
+    def test_commands_are_counted_and_attributed(self):
+        driver = FakeDriver()
+        profiler = CommandProfiler()
+        profiler.attach(driver)
+        profiler.attach(driver)  # Attaching twice doesn't count twice
+
+        driver.execute('get')  # Outside of a test, not counted
+        profiler.start_test('test_prices')
+        OverviewPage(driver).item_prices(3)
+        driver.execute('getTitle')
+        round_trips = profiler.finish_test()
+
+        assert round_trips.by_command.counts == {'findElements': 1, 'findChildElement': 3, 'getElementText': 3,
+                                                 'getTitle': 1}
+        assert round_trips.by_caller.counts == {'OverviewPage.item_prices': 1, 'OverviewPage._price': 6, TEST_CODE: 1}
+        assert len(driver.command_executor.commands) == 9
+        assert "8 WebDriver round trips" in round_trips.report()
+        assert not round_trips.over_budget
+
+    def test_round_trip_budget(self):
+        driver = FakeDriver()
+        profiler = CommandProfiler(max_round_trips=5)
+        profiler.attach(driver)
+
+        profiler.start_test('test_prices[3 items]')
+        OverviewPage(driver).item_prices(3)
+        over = profiler.finish_test()
+        profiler.start_test('test_prices[9 items]', budget=20)
+        OverviewPage(driver).item_prices(9)
+        within = profiler.finish_test()
+
+        assert over.over_budget and over.budget == 5
+        assert not within.over_budget
+        lines = profiler.report()
+        assert lines[0].startswith("26 WebDriver round trips in 2 tests (13.0 per test)")
+        assert lines[3].split()[:2] == ['findChildElement', '12']
+        assert lines[-2:] == ["1 tests over their round trip budget:", "  test_prices[3 items]: 7 > 5"]
+
+    def test_framework_commands_are_not_counted(self, monkeypatch):
+        driver = FakeDriver()
+        profiler = CommandProfiler(max_round_trips=3)
+        profiler.attach(driver)
+        monkeypatch.setattr(BaseClass, 'memory_monitor', MemoryMonitor())
+        BaseClass.memory_monitor.start_test('test_prices')
+
+        profiler.start_test('test_prices')
+        OverviewPage(driver).item_prices(1)  # The memory monitor samples the new page object
+        with framework_commands():
+            driver.execute('getLog')
+        round_trips = profiler.finish_test()
+
+        assert round_trips.by_command.counts == {'findElements': 1, 'findChildElement': 1, 'getElementText': 1}
+        assert not round_trips.over_budget
+        # Performance.enable and Performance.getMetrics of the memory monitor, the tracer's getLog
+        assert profiler.framework_commands == 3 and len(driver.command_executor.commands) == 6
+        assert profiler.report()[0].endswith("(3 framework commands not counted)")
@@ -0,0 +1,46 @@
+import pytest
+import allure
+from Utils.CpuProfiles import apply_cpu_profile, cpu_comparison_table, get_cpu_profile
+from Utils.DevTools import DevToolsUnsupported
+from Utils.PerfHarness import PerfStats
+
+
+@allure.feature("Framework")
+@allure.story("CPU Profiles")
+@allure.severity(allure.severity_level.NORMAL)
+class TestCpuProfiles:
+    """
+    Tests the CPU throttling profiles and the latency comparison across them.
+    """
+
+    def test_profile_names(self):
+        assert get_cpu_profile('4x') == 4
+        assert get_cpu_profile(' 2.5X ') == 2.5
+        for name in ('0.5x', 'fast', '4'):
+            with pytest.raises(ValueError):
+                get_cpu_profile(name)
+
+    def test_throttling_goes_through_devtools(self, recording_driver):
+        driver = recording_driver('MicrosoftEdge')
+
+        apply_cpu_profile(driver, 6)
+
+        assert driver.commands == [('Emulation.setCPUThrottlingRate', {'rate': 6})]
+        with pytest.raises(DevToolsUnsupported):
+            apply_cpu_profile(recording_driver('firefox'), 6)
+
+    def test_comparison_table(self):
+        def stats(*samples):
+            return PerfStats("Sort", list(samples), [], resamples=10)
+
+        measurements = [
+            ("Sort (glitch)", {}, stats(1.0, 1.0, 1.0)),
+            ("Sort (glitch)", {'cpu': '4x'}, stats(3.0, 3.0, 3.0)),
+            ("Sort (glitch)", {'cpu': '6x', 'network': '3g'}, stats(5.0)),
+            ("Login (standard)", {}, stats(0.5)),
+        ]
+
+        lines = cpu_comparison_table(measurements)
+
+        # Steps measured under one profile only, with the same other conditions, are left out
+        assert lines == ["Sort (glitch): 1x: p50 1.000s p90 1.000s | 4x: p50 3.000s p90 3.000s (3.0x)"]
@@ -0,0 +1,85 @@
+import threading
+import time
+import pytest
+import allure
+from selenium.webdriver.chrome.options import Options as ChromeOptions
+from Utils.GridScheduler import GridScheduler, GridEndpoint
+from Utils.StandInGrid import StandInGridEndpoint
+
+
+@allure.feature("Framework")
+@allure.story("Selenium Grid Scheduler")
+@allure.severity(allure.severity_level.NORMAL)
+class TestGridScheduler:
+    """
+    Tests the multi-endpoint grid scheduler against local stand-in endpoints that speak the
+    W3C session protocol.
+    """
+
+    @pytest.fixture
+    def endpoints(self):
+        """
+        Starts two healthy stand-in endpoints with two slots each.
+
+        :return: List of running StandInGridEndpoint objects.
+        """
+        stand_ins = [StandInGridEndpoint(capacity=2).start(), StandInGridEndpoint(capacity=2).start()]
+        yield stand_ins
+        for stand_in in stand_ins:
+            stand_in.stop()
+
+    def test_sessions_spread_to_least_loaded_endpoint(self, endpoints):
+        scheduler = GridScheduler([GridEndpoint(e.url, 2) for e in endpoints])
+
+        drivers = [scheduler.create_driver(ChromeOptions()) for _ in range(4)]
+
+        # Every endpoint got two sessions and none was oversubscribed
+        assert [e.peak_sessions for e in endpoints] == [2, 2]
+        assert [e.sessions for e in scheduler.endpoints] == [2, 2]
+
+        for driver in drivers:
+            scheduler.quit_driver(driver)
+        assert [len(e.sessions) for e in endpoints] == [0, 0]
+        assert all(e.active == 0 for e in scheduler.endpoints)
+
+    def test_requests_queue_while_all_slots_busy(self, endpoints):
+        scheduler = GridScheduler([GridEndpoint(endpoints[0].url, 1)])
+        first = scheduler.create_driver(ChromeOptions())
+        queued = {}
+
+        thread = threading.Thread(target=lambda: queued.update(driver=scheduler.create_driver(ChromeOptions())))
+        thread.start()
+        time.sleep(0.3)
+
+        # The second request waits for the only slot
+        assert 'driver' not in queued
+        assert scheduler.queued_requests == 1
+
+        scheduler.quit_driver(first)
+        thread.join(timeout=5)
+        assert 'driver' in queued
+        scheduler.quit_driver(queued['driver'])
+
+    def test_failed_session_retries_on_another_endpoint(self, endpoints):
+        with StandInGridEndpoint(capacity=2, fail_sessions=True) as broken:
+            scheduler = GridScheduler.from_option(f"{broken.url}=2,{endpoints[0].url}=2")
+
+            driver = scheduler.create_driver(ChromeOptions())
+
+            assert broken.session_requests == 1
+            assert len(endpoints[0].sessions) == 1
+            assert [e.failures for e in scheduler.endpoints] == [1, 0]
+            assert scheduler.endpoints[0].active == 0
+
+            report = scheduler.utilization_report()
+            assert len(report) == 3
+            assert "1 failed" in report[0]
+            scheduler.quit_driver(driver)
+
+    def test_timeout_when_no_slot_frees_up(self, endpoints):
+        scheduler = GridScheduler([GridEndpoint(endpoints[0].url, 1)], acquire_timeout=0.2)
+        driver = scheduler.create_driver(ChromeOptions())
+
+        with pytest.raises(TimeoutError):
+            scheduler.create_driver(ChromeOptions())
+        scheduler.quit_driver(driver)
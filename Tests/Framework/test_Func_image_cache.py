@@ -0,0 +1,87 @@
+import json
+import os
+import allure
+from PIL import Image
+from Utils.ImageCache import ImageCache
+
+
+@allure.feature("Framework")
+@allure.story("Image Cache")
+@allure.severity(allure.severity_level.NORMAL)
+class TestImageCache:
+    """
+    Tests the image cache behind BaseClass.compare_images against a local static file server.
+    """
+
+    def test_compare_images(self, image_server):
+        base_url, _, _ = image_server
+        cache = ImageCache()
+
+        assert cache.compare(base_url + 'backpack.png', base_url + 'backpack.png')
+        assert cache.compare(base_url + 'backpack.png', base_url + 'backpack_copy.png')
+        assert not cache.compare(base_url + 'backpack.png', base_url + 'bike_light.png')
+        cache.close()
+
+    def test_memory_hits_skip_the_network(self, image_server):
+        base_url, handler, _ = image_server
+        cache = ImageCache()
+
+        for _ in range(5):
+            cache.compare(base_url + 'backpack.png', base_url + 'bike_light.png')
+
+        assert handler.requests == 2
+        assert cache.stats['memory_hits'] == 8
+        cache.close()
+
+    def test_disk_cache_revalidates(self, image_server, tmp_path_factory):
+        base_url, handler, _ = image_server
+        cache_dir = tmp_path_factory.mktemp('image_cache')
+        ImageCache(cache_dir=str(cache_dir)).compare(base_url + 'backpack.png', base_url + 'bike_light.png')
+
+        # A new run finds the images on disk and only asks the server whether they changed
+        cache = ImageCache(cache_dir=str(cache_dir))
+        assert not cache.compare(base_url + 'backpack.png', base_url + 'bike_light.png')
+        assert cache.stats['disk_hits'] == 2
+        assert cache.stats['downloads'] == 0
+        assert handler.full_responses == 2
+        cache.close()
+
+    def test_changed_content_is_downloaded_again(self, image_server, tmp_path_factory):
+        base_url, _, image_dir = image_server
+        cache_dir = tmp_path_factory.mktemp('image_cache')
+        ImageCache(cache_dir=str(cache_dir)).get(base_url + 'backpack.png')
+
+        Image.new('RGB', (500, 500), (30, 30, 200)).save(image_dir / 'backpack.png')
+        # Last-Modified has a one second resolution, move it past the cached one
+        modified = os.path.getmtime(image_dir / 'backpack.png') + 10
+        os.utime(image_dir / 'backpack.png', (modified, modified))
+        cache = ImageCache(cache_dir=str(cache_dir))
+        assert cache.compare(base_url + 'backpack.png', base_url + 'bike_light.png')
+        assert cache.stats['downloads'] >= 1
+        cache.close()
+
+    def test_disk_cache_is_bounded(self, image_server, tmp_path_factory):
+        base_url, _, _ = image_server
+        cache_dir = tmp_path_factory.mktemp('image_cache')
+        cache = ImageCache(cache_dir=str(cache_dir), disk_entries=1)
+
+        cache.get_many([base_url + 'backpack.png', base_url + 'bike_light.png'])
+
+        assert len([p for p in cache_dir.iterdir() if p.suffix == '.raw']) == 1
+        cache.close()
+
+    def test_disk_entries_are_evicted_with_their_pixels(self, image_server, tmp_path_factory):
+        base_url, _, _ = image_server
+        cache_dir = tmp_path_factory.mktemp('image_cache')
+        cache = ImageCache(cache_dir=str(cache_dir), disk_entries=2)
+
+        # Two URLs share the pixels of the same content, the third has its own
+        for name in ('backpack.png', 'backpack_copy.png', 'bike_light.png'):
+            cache.get(base_url + name)
+        cache.close()
+
+        entries = [p for p in cache_dir.iterdir() if p.suffix == '.json']
+        pixels = {p.name for p in cache_dir.iterdir() if p.suffix == '.raw'}
+        assert len(entries) == 2 and len(pixels) == 2
+        # Every entry left points to a pixel file that is still there
+        assert {os.path.basename(cache._pixels_path(json.loads(p.read_text())['hash'])) for p in entries} <= pixels
@@ -0,0 +1,91 @@
+import numpy as np
+import pytest
+import allure
+from PIL import Image, ImageDraw
+from Utils.ImageCache import ImageCache
+from Utils.ImageDiff import ImageDiff, rect_mask
+
+
+def product_image(seed):
+    """A product-like picture: a gradient background with a few shapes."""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 255, 400, dtype=np.float32)
+    background = np.stack([np.add.outer(x, x) / 2, np.add.outer(x[::-1], x) / 2, np.tile(x, (400, 1))], axis=2)
+    image = Image.fromarray(background.astype(np.uint8))
+    draw = ImageDraw.Draw(image)
+    for _ in range(6):
+        left, top = rng.integers(0, 300, 2)
+        draw.ellipse([left, top, left + 90, top + 90], fill=tuple(int(c) for c in rng.integers(0, 255, 3)))
+    return image
+
+
+@pytest.fixture(scope="module")
+def image_urls(tmp_path_factory, static_server):
+    """
+    Serves a reference image, a JPEG re-encoded copy, a copy with a small badge, and an unrelated image.
+
+    :return: Dict of image name -> URL.
+    """
+    directory = tmp_path_factory.mktemp('images')
+    reference = product_image(1)
+    reference.save(directory / 'reference.png')
+    reference.save(directory / 'compressed.jpg', quality=60)
+    badged = reference.copy()
+    ImageDraw.Draw(badged).rectangle([0, 0, 60, 60], fill=(255, 0, 0))
+    badged.save(directory / 'badged.png')
+    product_image(2).save(directory / 'other.png')
+
+    base_url, _ = static_server(directory)
+    return {name: base_url + name for name in ('reference.png', 'compressed.jpg', 'badged.png', 'other.png')}
+
+
+@allure.feature("Framework")
+@allure.story("Perceptual Image Diff")
+@allure.severity(allure.severity_level.NORMAL)
+class TestImageDiff:
+    """
+    Tests the perceptual image diff engine against images served by a local static file server.
+    """
+
+    @pytest.fixture
+    def image_diff(self):
+        cache = ImageCache()
+        yield ImageDiff(cache)
+        cache.close()
+
+    def test_batch_verdicts(self, image_diff, image_urls):
+        reference = image_urls['reference.png']
+        results = image_diff.compare_batch([
+            (reference, reference),
+            (reference, image_urls['compressed.jpg']),
+            (reference, image_urls['badged.png']),
+            (reference, image_urls['other.png']),
+        ])
+
+        assert [r.is_match for r in results] == [True, True, False, False]
+        assert results[0].similarity == 1.0
+        assert results[0].hash_distances == {'ahash': 0, 'dhash': 0, 'phash': 0}
+        # Compression noise stays well above a different picture
+        assert results[1].similarity > 0.97
+        assert results[3].similarity < results[1].similarity
+        assert results[3].hash_distances['phash'] > image_diff.hash_threshold
+
+    def test_ignore_mask(self, image_diff, image_urls):
+        size = image_diff.image_cache.size
+        badge = rect_mask(size, [(0, 0, 0.2, 0.2)])
+
+        result = image_diff.compare(image_urls['reference.png'], image_urls['badged.png'], mask=badge)
+
+        assert result.is_match
+        assert np.isnan(result.tile_mae).any()  # Fully masked tiles have no score
+
+    def test_heatmap_points_at_the_changed_region(self, image_diff, image_urls):
+        result = image_diff.compare(image_urls['reference.png'], image_urls['badged.png'])
+
+        # The badge covers the top left 15% of the image, i.e. the first 3x3 tiles
+        changed = result.tile_mae > 0.01
+        assert changed[:3, :3].any()
+        assert not changed[3:, :].any() and not changed[:, 3:].any()
+        heatmap = result.heatmap_png()
+        assert heatmap.startswith(b'\x89PNG')
+        allure.attach(heatmap, name="Badge heatmap", attachment_type=allure.attachment_type.PNG)
@@ -0,0 +1,98 @@
+import math
+import threading
+import time
+import pytest
+import allure
+from Utils.LoadRunner import LoadRunner, LoadStats, ThinkTime, parse_stages, target_users
+
+
+class FakePool:
+    """Leases numbered fake drivers and counts the resets."""
+
+    def __init__(self):
+        self.leased = set()
+        self.peak = 0
+        self.leases = 0
+        self.resets = 0
+        self._lock = threading.Lock()
+
+    def lease(self):
+        with self._lock:
+            self.leases += 1
+            driver = f"driver-{self.leases}"
+            self.leased.add(driver)
+            self.peak = max(self.peak, len(self.leased))
+            return driver
+
+    def release(self, driver):
+        with self._lock:
+            self.leased.remove(driver)
+
+    def reset_driver(self, driver):
+        self.resets += 1
+
+
+def shopping_flow(vu):
+    with vu.step("login"):
+        time.sleep(0.01)
+    vu.think()
+    with vu.step("checkout"):
+        time.sleep(0.02)
+        if vu.iteration % 5 == 0:
+            raise RuntimeError("Checkout button not found")
+
+
+@allure.feature("Framework")
+@allure.story("Virtual User Load Runner")
+@allure.severity(allure.severity_level.NORMAL)
+class TestLoadRunner:
+    """
+    Tests the load runner's profile, think time and reporting with a fake driver pool.
+    """
+
+    def test_profile(self):
+        stages = parse_stages("10s:4, 1m:4, 10:0")
+
+        assert [(s.duration, s.users) for s in stages] == [(10, 4), (60, 4), (10, 0)]
+        assert [target_users(stages, t) for t in (0, 5, 10, 40, 75, 80)] == [0, 2, 4, 4, 2, 0]
+        with pytest.raises(ValueError):
+            parse_stages("10s")
+
+    def test_think_time_models(self):
+        assert ThinkTime(1.5, 'constant').sample() == 1.5
+        uniform = [ThinkTime(2, 'uniform', seed=1).sample() for _ in range(50)]
+        assert all(1 <= t <= 3 for t in uniform)
+        exponential = ThinkTime(1, 'exponential', seed=1)
+        samples = [exponential.sample() for _ in range(2000)]
+        assert max(samples) <= 5 and 0.8 < sum(samples) / len(samples) < 1.2
+        with pytest.raises(ValueError):
+            ThinkTime(1, 'gaussian')
+
+    def test_ramp_up_steady_state_and_ramp_down(self):
+        pool, reports = FakePool(), []
+        runner = LoadRunner(pool, shopping_flow, parse_stages("0.5s:4,0.8s:4,0.4s:0"),
+                            think_time=ThinkTime(0.01, 'constant'), report_interval=0.5, on_report=reports.append)
+
+        stats = runner.run()
+
+        assert pool.peak == stats.peak_users == 4
+        assert not pool.leased  # Every virtual user gave its browser back
+        assert stats.iterations > 10
+        assert stats.failed_iterations == pool.resets == stats.errors['checkout'] > 0
+        assert len(stats.latencies['login']) == stats.iterations
+        assert 0.01 <= stats.step_percentile('login', 0.5) < 0.1
+        assert len(reports) >= 3 and "flows/s" in reports[0] and "p90" in reports[1]
+        summary = stats.summary_lines()
+        assert summary[0].startswith(f"{stats.iterations} flows") and "checkout" in summary[2]
+
+    def test_step_percentiles_per_user(self):
+        stats = LoadStats()
+        for latency in (1.0, 1.2, 1.1):
+            stats.record("login", latency, user='standard_user')
+        stats.record("login", 6.0, user='performance_glitch_user')
+        stats.record("login", 9.0, ok=False, user='performance_glitch_user')
+
+        assert stats.step_percentile("login", 0.5) == pytest.approx(1.15)
+        assert stats.step_percentile("login", 1.0, 'standard_user') == 1.2
+        assert stats.step_percentile("login", 0.9, 'performance_glitch_user') == 6.0
+        assert math.isnan(stats.step_percentile("login", 0.9, 'visual_user'))  # No sample, no budget check
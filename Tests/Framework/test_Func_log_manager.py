@@ -0,0 +1,78 @@
+import json
+import os
+import allure
+from Utils.LogManager import LogManager
+from Utils.Parallel import merge_worker_logs
+
+
+@allure.feature("Framework")
+@allure.story("Logging")
+@allure.severity(allure.severity_level.NORMAL)
+class TestLogManager:
+    """
+    Tests the cached, queue-based logging subsystem behind BaseClass.get_logger.
+    """
+
+    def test_logger_is_cached_per_test(self, tmp_path):
+        manager = LogManager(str(tmp_path / 'logfile.log'))
+
+        logger = manager.get_logger()
+        assert manager.get_logger() is logger
+        assert logger.name == 'test_logger_is_cached_per_test'
+        assert len(logger.handlers) == 1
+
+        logger.info("first")
+        logger.info("second")
+        manager.shutdown()
+
+        lines = (tmp_path / 'logfile.log').read_text().splitlines()
+        assert [line.rsplit(' : ', 1)[1] for line in lines] == ["first", "second"]
+        assert not logger.handlers
+
+    def test_json_lines(self, tmp_path):
+        manager = LogManager(str(tmp_path / 'logfile.log'), json_format=True)
+
+        manager.get_logger().warning("Cart badge missing")
+        manager.shutdown()
+
+        entry = json.loads((tmp_path / 'logfile.log').read_text())
+        assert entry['level'] == 'WARNING'
+        assert entry['message'] == "Cart badge missing"
+        assert entry['test'].endswith("::TestLogManager::test_json_lines")
+
+    def test_worker_files_merge(self, tmp_path, monkeypatch):
+        log_file = str(tmp_path / 'logfile.log')
+        for worker in ('gw0', 'gw1'):
+            monkeypatch.setenv('PYTEST_XDIST_WORKER', worker)
+            manager = LogManager(log_file, json_format=True)
+            manager.get_logger().info(f"from {worker}")
+            manager.shutdown()
+            assert os.path.exists(tmp_path / f'logfile_{worker}.log')
+
+        assert merge_worker_logs(log_file) == 2
+        entries = [json.loads(line) for line in (tmp_path / 'logfile.log').read_text().splitlines()]
+        assert [entry['message'] for entry in entries] == ["from gw0", "from gw1"]
+
+    def test_capture_writes_only_kept_tests(self, tmp_path):
+        manager = LogManager(str(tmp_path / 'logfile.log'))
+        manager.configure(capture_size=2)
+        logger = manager.get_logger()
+
+        manager.begin_test()
+        for i in range(5):
+            logger.info(f"passing {i}")
+        assert manager.end_test(keep=False) is None
+
+        manager.begin_test()
+        logger.info("failing 0")
+        logger.error("failing 1")
+        captured = manager.end_test(keep=True)
+        manager.shutdown()
+
+        assert captured.splitlines()[-1].endswith("failing 1")
+        lines = (tmp_path / 'logfile.log').read_text().splitlines()
+        assert len(lines) == 3
+        assert "Passed, 5 log records captured and not written" in lines[0]
+        assert manager.capture_stats['flushed_tests'] == 1
+        assert manager.capture_stats['dropped_records'] == 3
+        assert manager.capture_stats['saved_bytes'] > 0
@@ -0,0 +1,97 @@
+import pytest
+import allure
+from Utils.BaseClass import BaseClass
+from Utils.MemoryMonitor import MB, MemoryMonitor, monotonic_growth
+
+
+class MetricsDriver:
+    """Driver stand-in answering Performance.getMetrics with scripted heap sizes."""
+
+    def __init__(self, heaps, browser='chrome', session_id='session-1'):
+        self.capabilities = {'browserName': browser}
+        self.session_id = session_id
+        self.commands = []
+        self._heaps = iter(heaps)
+
+    def execute_cdp_cmd(self, command, params):
+        self.commands.append(command)
+        if command != 'Performance.getMetrics':
+            return {}
+        return {'metrics': [{'name': 'JSHeapUsedSize', 'value': next(self._heaps) * MB},
+                            {'name': 'JSHeapTotalSize', 'value': 64 * MB}, {'name': 'Nodes', 'value': 300},
+                            {'name': 'JSEventListeners', 'value': 40}, {'name': 'Documents', 'value': 2}]}
+
+
+class Page(BaseClass):
+    """Page object stand-in."""
+
+    def __init__(self, driver):
+        super().__init__()
+        self._driver = driver
+
+
+class DerivedPage(Page):
+    """Page object calling its parent's constructor."""
+
+    def __init__(self, driver):
+        super().__init__(driver)
+
+
+@allure.feature("Framework")
+@allure.story("Memory Monitor")
+@allure.severity(allure.severity_level.NORMAL)
+class TestMemoryMonitor:
+    """
+    Tests the memory sampling at page object creation and test end.
+    """
+
+    @pytest.fixture
+    def monitor(self):
+        """
+        Installs a memory monitor with a 5 MB budget and leaks over 3 tests.
+
+        :return: The installed MemoryMonitor.
+        """
+        monitor, BaseClass.memory_monitor = BaseClass.memory_monitor, MemoryMonitor(budget_mb=5, leak_runs=3)
+        yield BaseClass.memory_monitor
+        BaseClass.memory_monitor = monitor
+
+    def test_page_objects_are_sampled_once(self, monitor):
+        driver = MetricsDriver([10, 12, 11])
+        monitor.start_test('test_a')
+
+        Page(driver)
+        DerivedPage(driver)
+        report = monitor.finish_test(driver)
+
+        assert [sample.label for sample in monitor.samples] == ['Page', 'DerivedPage', 'test end (after GC)']
+        assert driver.commands.count('Performance.enable') == 1
+        assert driver.commands[-2:] == ['HeapProfiler.collectGarbage', 'Performance.getMetrics']
+        assert 'Heap delta +1.00 MB (budget 5 MB)' in report
+        assert monitor.over_budget == []
+
+    def test_budget_and_growth_across_tests(self, monitor):
+        driver = MetricsDriver([10, 11, 11, 12, 12, 20])
+        for name in ('test_a', 'test_b', 'test_c'):
+            monitor.start_test(name)
+            Page(driver)
+            report = monitor.finish_test(driver)
+
+        assert monitor.over_budget == [('test_c', 8.0)]
+        assert 'Possible leak: heap_used grew at each of the last 3 tests' in report
+        assert len(monitor.leaks) == 1 and monitor.report()[0] == (
+            "3 tests sampled, 1 over the 5 MB heap budget, 1 possible leaks")
+
+    def test_firefox_and_disabled_monitor_are_skipped(self, monitor):
+        monitor.start_test('test_a')
+        assert monitor.finish_test(MetricsDriver([], browser='firefox')) is None
+
+        BaseClass.memory_monitor = None
+        driver = MetricsDriver([])
+        Page(driver)
+        assert driver.commands == []
+
+    def test_monotonic_growth(self):
+        assert monotonic_growth([5, 1, 2, 3], 3) == 2
+        assert monotonic_growth([1, 2, 2], 3) is None
+        assert monotonic_growth([1, 2], 3) is None
@@ -0,0 +1,112 @@
+import pytest
+import allure
+from Utils.BaseClass import BaseClass
+from Utils.MethodProfiler import MethodProfiler
+
+
+def define_pages():
+    """Defines a page object hierarchy the way PageObjects does, test classes (no __init__) included."""
+
+    class Pages(BaseClass):
+        def test_something(self):
+            pass
+
+    class ProductsPage(Pages):
+        def __init__(self, driver):
+            super().__init__()
+            self._driver = driver
+
+        def title(self):
+            return self._read_title()
+
+        def _read_title(self):
+            return 'Products'
+
+        def fail(self):
+            raise TimeoutError("element not found")
+
+    return Pages, ProductsPage
+
+
+class FakeTitle:
+    text = 'Products'
+
+
+@allure.feature("Framework")
+@allure.story("Page Object Method Profiler")
+@allure.severity(allure.severity_level.NORMAL)
+class TestMethodProfiler:
+    """
+    Tests the instrumentation of the page object methods.
+    """
+
+    def test_nothing_is_wrapped_when_disabled(self, monkeypatch):
+        monkeypatch.setattr(BaseClass, 'method_profiler', None)
+        _, products_page = define_pages()
+        assert not hasattr(products_page.title, '__profiled__')
+
+    def test_existing_and_new_page_objects_are_instrumented(self, monkeypatch):
+        monkeypatch.setattr(BaseClass, 'method_profiler', None)
+        pages, products_page = define_pages()
+        original_title = products_page.title
+        profiler = MethodProfiler(allure_steps=False)
+        monkeypatch.setattr(BaseClass, 'method_profiler', profiler)
+        profiler.instrument_subclasses(pages)
+
+        class CartPage(products_page):
+            def __init__(self, driver):
+                super().__init__(driver)
+
+            def checkout(self):
+                return self.title()
+
+        page = CartPage(None)
+        assert page.checkout() == 'Products'
+        for _ in range(2):
+            with pytest.raises(TimeoutError):
+                page.fail()
+
+        assert set(profiler.stats) == {'CartPage.checkout', 'ProductsPage.title', 'ProductsPage.fail'}
+        assert profiler.stats['ProductsPage.fail'].calls == 2
+        assert profiler.stats['ProductsPage.fail'].errors == {'TimeoutError': 2}
+        assert profiler.stats['CartPage.checkout'].total >= profiler.stats['ProductsPage.title'].total
+        assert not hasattr(pages.test_something, '__profiled__')
+
+        # Instrumenting twice doesn't stack the wrappers
+        profiler.instrument(products_page)
+        assert products_page.title.__wrapped__ is original_title
+
+    def test_methods_inherited_from_base_class_are_instrumented(self, monkeypatch):
+        monkeypatch.setattr(BaseClass, 'method_profiler', None)
+        monkeypatch.setattr(BaseClass, 'find', lambda self, locator, timeout=None: FakeTitle())
+        pages, products_page = define_pages()
+        profiler = MethodProfiler(allure_steps=False)
+        profiler.instrument_subclasses(pages)
+
+        class CartPage(products_page):
+            def __init__(self, driver):
+                super().__init__(driver)
+
+        profiler.instrument(CartPage)
+        assert products_page(None).get_page_title() == 'Products'
+        assert CartPage(None).get_page_title() == 'Products'
+
+        assert set(profiler.stats) == {'ProductsPage.get_page_title', 'CartPage.get_page_title'}
+        assert hasattr(products_page.click_shopping_cart, '__profiled__')
+        assert hasattr(products_page.reset_application_state, '__profiled__')
+        # BaseClass itself and its wait primitives are left alone
+        assert not hasattr(BaseClass.get_page_title, '__profiled__')
+        assert not hasattr(products_page.find_all, '__profiled__')
+
+    def test_hot_path_table(self):
+        profiler = MethodProfiler(top=2)
+        for seconds in (0.5, 0.5, 2.0):
+            profiler.record('ProductsPage.get_product_info', seconds)
+        profiler.record('CartPage.checkout', 1.0, 'TimeoutException')
+        profiler.record('HomePage.login', 0.2)
+
+        lines = profiler.hot_paths()
+
+        assert lines[1].split() == ['ProductsPage.get_product_info', '3', '3.00s', '1.000s', '2.000s', '2.000s', '-']
+        assert lines[2].endswith('1.000s  TimeoutException x1')
+        assert lines[-1] == "5 calls of 3 page object methods, 1 more not listed"
@@ -0,0 +1,50 @@
+import pytest
+import allure
+from Utils.DevTools import DevToolsUnsupported
+from Utils.NetworkProfiles import NETWORK_PROFILES, apply_network_profile, get_network_profile
+from Utils.PerfHarness import PerfHarness
+
+
+@allure.feature("Framework")
+@allure.story("Network Profiles")
+@allure.severity(allure.severity_level.NORMAL)
+class TestNetworkProfiles:
+    """
+    Tests the network profiles and how they are sent to the browser.
+    """
+
+    def test_named_and_custom_profiles(self):
+        assert not NETWORK_PROFILES['none'].emulated
+        assert get_network_profile('3G') is NETWORK_PROFILES['3g']
+        assert get_network_profile('offline').conditions()['offline'] is True
+
+        custom = get_network_profile('custom:80:4000')
+        assert custom.emulated
+        assert custom.conditions() == {'offline': False, 'latency': 80, 'downloadThroughput': 500000.0,
+                                       'uploadThroughput': 500000.0}
+
+        with pytest.raises(ValueError):
+            get_network_profile('5g')
+
+    def test_profile_is_applied_through_devtools(self, recording_driver):
+        driver = recording_driver('chrome')
+
+        apply_network_profile(driver, NETWORK_PROFILES['3g'])
+        apply_network_profile(driver, NETWORK_PROFILES['none'])
+
+        assert driver.commands[1] == ('Network.emulateNetworkConditions', {
+            'offline': False, 'latency': 300, 'downloadThroughput': 200000.0, 'uploadThroughput': 96000.0})
+        # 'none' lifts the throttling
+        assert driver.commands[3][1]['downloadThroughput'] == -1 and driver.commands[3][1]['latency'] == 0
+
+    def test_firefox_is_not_supported(self, recording_driver):
+        with pytest.raises(DevToolsUnsupported, match='firefox'):
+            apply_network_profile(recording_driver('firefox'), NETWORK_PROFILES['3g'])
+
+    def test_active_profile_names_the_perf_series(self, monkeypatch):
+        monkeypatch.setattr(PerfHarness, 'history', None)
+        monkeypatch.setattr(PerfHarness, 'conditions', {'network': '3g'})
+
+        stats = PerfHarness(warmup=0, iterations=2).run("Login", lambda: None, user='standard_user')
+
+        assert stats.name == "Login [network 3g] (standard_user)"
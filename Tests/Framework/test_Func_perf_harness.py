@@ -0,0 +1,79 @@
+import xml.etree.ElementTree as ET
+import pytest
+import allure
+from Utils.PerfHarness import PerfHarness, PerfStats, percentile
+
+
+class ScriptedClock:
+    """Clock that runs the action and returns the next scripted duration instead of measuring it."""
+
+    def __init__(self, durations):
+        self._durations = iter(durations)
+        self.calls = 0
+
+    def __call__(self, action):
+        self.calls += 1
+        action()
+        return next(self._durations)
+
+
+@allure.feature("Framework")
+@allure.story("Statistical Perf Harness")
+@allure.severity(allure.severity_level.NORMAL)
+class TestPerfHarness:
+    """
+    Tests the statistics of the perf harness with scripted durations.
+    """
+
+    @pytest.fixture(autouse=True)
+    def no_history(self):
+        """
+        Keeps the scripted samples out of the perf history of the session.
+        """
+        history, PerfHarness.history = PerfHarness.history, None
+        yield
+        PerfHarness.history = history
+
+    def test_percentiles(self):
+        values = [float(v) for v in range(1, 11)]
+
+        assert percentile(values, 0.5) == 5.5
+        assert percentile(values, 0.9) == pytest.approx(9.1)
+        assert percentile(values, 0) == 1 and percentile(values, 1) == 10
+
+    def test_warmup_is_not_timed_and_outliers_are_left_out_of_the_mean(self):
+        actions, setups = [], []
+        # The first (warmup) sample is a cold start, one timed sample is a hiccup
+        clock = ScriptedClock([9.0] + [1.0, 1.1, 0.9, 1.0, 1.2, 1.0, 0.9, 1.1, 6.0, 1.0])
+        harness = PerfHarness(warmup=1, iterations=10)
+
+        stats = harness.run("Action", lambda: actions.append(1), setup=lambda: setups.append(1), clock=clock)
+
+        assert clock.calls == len(actions) == len(setups) == 11
+        assert stats.outliers == [6.0]
+        assert len(stats.samples) == 9 and max(stats.samples) == 1.2
+        assert stats.p50 == 1.0
+        # The outlier is left out of the mean, not of the percentiles
+        assert stats.mean == pytest.approx(1.0222, abs=1e-4)
+        assert stats.p90 == pytest.approx(1.68)
+        assert stats.check(p90=1.5) == ["Action: p90 1.680s exceeds 1.5s"]
+        assert stats.mean_ci[0] <= stats.mean <= stats.mean_ci[1]
+        assert stats.p90_ci[0] <= stats.p90 <= stats.p90_ci[1]
+        assert harness.results == [stats]
+
+    def test_check_reports_exceeded_percentiles(self):
+        stats = PerfStats("Sort", [0.1] * 8 + [0.5, 0.6], [])
+
+        assert stats.check(p50=0.2) == []
+        failures = stats.check(p50=0.2, p90=0.3)
+        assert len(failures) == 1 and failures[0].startswith("Sort: p90")
+
+    def test_distribution_chart_is_valid_svg(self):
+        stats = PerfStats("Login <user>", [0.2, 0.25, 0.3, 0.22], [1.5])
+
+        root = ET.fromstring(stats.to_svg())
+
+        assert root.tag == '{http://www.w3.org/2000/svg}svg'
+        rects = root.findall('{http://www.w3.org/2000/svg}rect')
+        assert any(rect.get('fill') == '#d9534f' for rect in rects)  # The outlier is drawn
+        assert "Login <user>" in stats.summary()
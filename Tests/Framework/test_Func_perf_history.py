@@ -0,0 +1,98 @@
+import random
+import pytest
+import allure
+from Utils.PerfHarness import PerfHarness
+from Utils.PerfHistory import PerfHistory, mann_whitney_u, trend_svg
+
+
+def login_times(rng, median, count=10):
+    return [rng.gauss(median, median * 0.04) for _ in range(count)]
+
+
+@allure.feature("Framework")
+@allure.story("Perf History")
+@allure.severity(allure.severity_level.NORMAL)
+class TestPerfHistory:
+    """
+    Tests the perf history store and its regression detection on a temporary database.
+    """
+
+    @pytest.fixture
+    def history(self, tmp_path):
+        history = PerfHistory(str(tmp_path / 'perf_history.db'), baseline_runs=10)
+        yield history
+        history.close()
+
+    def test_mann_whitney_u(self):
+        # Fully separated groups of 10: U = 100, z = 49.5 / sqrt(175)
+        u, p_value = mann_whitney_u([float(v) for v in range(11, 21)], [float(v) for v in range(1, 11)])
+        assert u == 100
+        assert p_value == pytest.approx(9.13e-5, rel=0.01)
+
+        rng = random.Random(3)
+        same = mann_whitney_u(login_times(rng, 1.0, 30), login_times(rng, 1.0, 30))[1]
+        faster = mann_whitney_u(login_times(rng, 0.8, 30), login_times(rng, 1.0, 30))[1]
+        assert same > 0.05 and faster > 0.99
+        assert mann_whitney_u([1.0, 1.0], [1.0, 1.0]) == (2.0, 1.0)
+
+    def test_regression_against_rolling_baseline(self, history):
+        rng = random.Random(7)
+        for run_label in range(1, 16):
+            history.record(run_label, 'chrome', 'local', 'standard_user', 'Login', login_times(rng, 1.0))
+        history.record(16, 'chrome', 'local', 'standard_user', 'Login', login_times(rng, 1.3))
+        history.record(16, 'chrome', 'local', 'problem_user', 'Login', login_times(rng, 1.0))
+        # Same step on another browser is a separate series
+        history.record(16, 'firefox', 'local', 'standard_user', 'Login', login_times(rng, 3.0))
+
+        slow, new_series, other_user = history.compare_run(16)
+
+        assert slow.regressed and slow.user == 'standard_user' and slow.browser == 'chrome'
+        assert slow.baseline_runs == 10 and slow.change == pytest.approx(0.3, abs=0.06)
+        assert new_series.baseline_runs == 0 and not new_series.regressed
+        assert "no baseline yet" in new_series.summary()
+        assert not other_user.regressed
+
+        assert not history.compare(15, 'chrome', 'local', 'standard_user', 'Login').regressed
+
+    def test_trend(self, history):
+        for run_label in range(1, 41):
+            history.record(run_label, 'chrome', 'local', '', 'Sort', [0.1 * run_label] * 5)
+
+        points = history.trend('chrome', 'local', '', 'Sort', runs=30)
+
+        assert [label for label, _, _ in points] == list(range(11, 41))
+        assert points[-1][1] == pytest.approx(4.0)
+        assert trend_svg("Sort", points).startswith('<svg')
+
+    def test_queries_use_the_series_index(self, history):
+        rows = [(run_label, 'chrome', 'local', user, 'Login', 1.0, 0.0)
+                for run_label in range(1, 3001) for user in ('standard_user', 'problem_user')]
+        with history._connection:
+            history._connection.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?)", rows)
+
+        plan = history._connection.execute(
+            "EXPLAIN QUERY PLAN SELECT DISTINCT run_label FROM samples WHERE step = ? AND user = ? AND browser = ? "
+            "AND run_env = ? AND run_label < ? ORDER BY run_label DESC LIMIT ?",
+            ('Login', 'standard_user', 'chrome', 'local', 3000, 10)).fetchall()
+        assert any('ix_samples_series' in row[-1] for row in plan)
+
+        samples, runs = history.baseline(3000, 'chrome', 'local', 'standard_user', 'Login')
+        assert runs == 10 and len(samples) == 10
+
+    def test_harness_records_and_compares(self, history):
+        previous = PerfHarness.history, PerfHarness.run_key, PerfHarness.comparisons
+        PerfHarness.history, PerfHarness.comparisons = history, []
+        try:
+            for run_label in range(1, 4):
+                PerfHarness.run_key = (run_label, 'chrome', 'local')
+                durations = iter([1.0] * 7 + [5.0])  # The outlier is left out of the mean, not of the history
+                stats = PerfHarness(warmup=0, iterations=8).run(
+                    "Login", lambda: None, clock=lambda action: next(durations), user='standard_user')
+
+            assert stats.outliers == [5.0]
+            assert sorted(history.samples(3, 'chrome', 'local', 'standard_user', 'Login')) == [1.0] * 7 + [5.0]
+            assert stats.comparison.baseline_runs == 2 and not stats.comparison.regressed
+            assert len(PerfHarness.comparisons) == 3
+            assert stats.name == "Login (standard_user)"
+        finally:
+            PerfHarness.history, PerfHarness.run_key, PerfHarness.comparisons = previous
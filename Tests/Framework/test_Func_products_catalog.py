@@ -0,0 +1,97 @@
+import pytest
+import allure
+from PageObjects.ProductsPage import ProductsPage
+
+CATALOG = [
+    {'id': 1, 'name': 'Sauce Labs Bolt T-Shirt', 'description': 'Bolt', 'price': '$15.99', 'image': 'bolt.jpg',
+     'button_id': 'add-to-cart-sauce-labs-bolt-t-shirt'},
+    {'id': 3, 'name': 'Test.allTheThings() T-Shirt (Red)', 'description': 'Red', 'price': '$15.99',
+     'image': 'red.jpg', 'button_id': 'add-to-cart-test.allthethings()-t-shirt-(red)'},
+    {'id': 4, 'name': 'Sauce Labs Backpack', 'description': 'Backpack', 'price': '$29.99', 'image': 'pack.jpg',
+     'button_id': 'add-to-cart-sauce-labs-backpack'},
+]
+
+
+class FakeElement:
+    def click(self):
+        pass
+
+
+class CatalogDriver:
+    """Driver stand-in on the inventory page, answering the catalog script with the products in display order."""
+
+    def __init__(self, catalog):
+        self.catalog = list(catalog)
+        self.catalog_reads = 0
+        self.scripts = []
+
+    def find_elements(self, by, value):
+        return [FakeElement()]
+
+    def find_element(self, by, value):
+        return FakeElement()
+
+    def execute_script(self, script, *args):
+        self.scripts.append(args)
+        if script == ProductsPage._CATALOG_SCRIPT:
+            self.catalog_reads += 1
+            return [dict(product) for product in self.catalog]
+        return None
+
+    def refresh(self):
+        pass
+
+
+@allure.feature("Framework")
+@allure.story("Products Catalog Snapshot")
+@allure.severity(allure.severity_level.NORMAL)
+class TestProductsCatalog:
+    """
+    Tests the single-script product snapshot of the ProductsPage and when it is read again.
+    """
+
+    @pytest.fixture(autouse=True)
+    def fresh_product_ids(self, monkeypatch):
+        """
+        Starts each test without the product ids read by an earlier test.
+        """
+        monkeypatch.setattr(ProductsPage, '_product_ids', None)
+
+    def test_products_are_read_in_one_script_call(self):
+        driver = CatalogDriver(CATALOG)
+        page = ProductsPage(driver)
+
+        assert page.get_product_info('Sauce Labs Backpack') == ('Backpack', '$29.99', 'pack.jpg')
+        assert page.get_product_price('Sauce Labs Bolt T-Shirt') == '$15.99'
+        assert page.get_product_image('Test.allTheThings() T-Shirt (Red)') == 'red.jpg'
+        assert page.get_product_details('Sauce Labs Backpack') == 'Backpack'
+        assert page.get_product_ids() == {'Sauce Labs Bolt T-Shirt': 1, 'Test.allTheThings() T-Shirt (Red)': 3,
+                                          'Sauce Labs Backpack': 4}
+
+        assert driver.catalog_reads == 1
+
+    @pytest.mark.parametrize("action", [
+        lambda page: page.sort_products_by('Price (high to low)'),
+        lambda page: page.add_product_to_cart('Sauce Labs Backpack'),
+        lambda page: page.remove_product_from_cart('Sauce Labs Backpack'),
+        lambda page: page.add_all_products_to_cart(),
+        lambda page: page.seed_cart(['Sauce Labs Backpack']),
+    ], ids=['sort', 'add', 'remove', 'add all', 'seed cart'])
+    def test_page_changes_invalidate_the_snapshot(self, action):
+        driver = CatalogDriver(CATALOG)
+        page = ProductsPage(driver)
+        assert page.get_catalog()[0]['name'] == 'Sauce Labs Bolt T-Shirt'
+
+        driver.catalog = sorted(CATALOG, key=lambda product: product['price'], reverse=True)
+        action(page)
+
+        assert page.get_catalog()[0]['name'] == 'Sauce Labs Backpack'
+        assert driver.catalog_reads == 2
+
+    def test_product_names_match_exactly(self):
+        page = ProductsPage(CatalogDriver(CATALOG))
+
+        # A substring match would have returned the first T-Shirt
+        assert page.get_product_info('T-Shirt') is None
+        assert page.get_product_info('sauce labs backpack') is None
+        assert page.get_product_details('Test.allTheThings() T-Shirt (Red)') == 'Red'
@@ -0,0 +1,108 @@
+import time
+import pytest
+import allure
+from Utils.ResourceMonitor import MB, ProcReader, ResourceMonitor, ResourceUsage, recommend_workers
+
+
+def write_process(proc, pid, parent, name, ticks=0, pages=0, io=None, pss_kb=None):
+    """Writes the stat (and io, smaps_rollup) files of a process to a fake proc filesystem."""
+    directory = proc / str(pid)
+    directory.mkdir(exist_ok=True)
+    # pid (comm) state ppid, then fields 5 to 13, utime stime cutime cstime, fields 18 to 23, rss
+    fields = ['S', str(parent)] + ['0'] * 9 + [str(ticks), '0', '0', '0'] + ['0'] * 6 + [str(pages)]
+    (directory / 'stat').write_text(f"{pid} ({name}) {' '.join(fields)}\n")
+    if io is not None:
+        (directory / 'io').write_text(f"rchar: 1\nwchar: 1\nread_bytes: {io[0]}\nwrite_bytes: {io[1]}\n")
+    if pss_kb is not None:
+        (directory / 'smaps_rollup').write_text(f"00400000-7fff0000 ---p 00000000 00:00 0    [rollup]\n"
+                                                f"Rss:             {pages * 4} kB\nPss:             {pss_kb} kB\n")
+
+
+def fake_proc(tmp_path):
+    proc = tmp_path / 'proc'
+    proc.mkdir()
+    (proc / 'meminfo').write_text("MemTotal:       16384000 kB\nMemAvailable:    8192000 kB\n")
+    write_process(proc, 100, 1, 'chromedriver', ticks=10, pages=256, io=(0, 0))  # smaps_rollup not readable
+    write_process(proc, 101, 100, 'chrome', ticks=100, pages=25600, io=(MB, 0), pss_kb=40000)
+    write_process(proc, 102, 101, 'chrome (renderer)', ticks=50, pages=12800, pss_kb=20000)  # io not readable
+    write_process(proc, 200, 1, 'python', ticks=999, pages=99999, io=(MB, MB))
+    reader = ProcReader(str(proc))
+    reader.clock_ticks, reader.page_size = 100, 4096
+    return proc, reader
+
+
+class LocalDriver:
+    """Driver stand-in whose service process has a pid."""
+
+    class service:
+        class process:
+            pid = 100
+
+            @staticmethod
+            def poll():
+                return None
+
+
+@allure.feature("Framework")
+@allure.story("Resource Monitor")
+@allure.severity(allure.severity_level.NORMAL)
+class TestResourceMonitor:
+    """
+    Tests the resource accounting on a fake proc filesystem.
+    """
+
+    def test_reads_the_driver_process_tree(self, tmp_path):
+        _, reader = fake_proc(tmp_path)
+
+        assert sorted(reader.tree(100)) == [100, 101, 102]
+        usage = reader.usage(100)
+        assert usage.processes == 3
+        assert usage.cpu_seconds == pytest.approx(1.6)
+        # PSS where smaps_rollup is readable, RSS for the driver
+        assert usage.memory == 256 * 4096 + (40000 + 20000) * 1024
+        assert (usage.read_bytes, usage.write_bytes) == (MB, 0)
+        assert reader.usage(300).processes == 0
+        assert reader.memory_available() == 8192000 * 1024
+
+    def test_measures_a_test(self, tmp_path):
+        proc, reader = fake_proc(tmp_path)
+        monitor = ResourceMonitor(interval=0.01, reader=reader)
+
+        assert monitor.start_test(LocalDriver())
+        # The renderer peaks at 400 MB during the test, then drops back
+        write_process(proc, 102, 101, 'chrome (renderer)', ticks=150, pages=102400, pss_kb=400000)
+        deadline = time.time() + 5
+        while monitor._peak_memory < 400000 * 1024 and time.time() < deadline:
+            time.sleep(0.01)
+        write_process(proc, 102, 101, 'chrome (renderer)', ticks=250, pages=12800, pss_kb=20000)
+        write_process(proc, 101, 100, 'chrome', ticks=100, pages=25600, io=(3 * MB, 2 * MB), pss_kb=40000)
+        usage = monitor.finish_test('test_sort', 'TestSort')
+        monitor.stop()
+
+        assert usage.cpu_seconds == pytest.approx(2.0)
+        assert usage.peak_memory == 256 * 4096 + (40000 + 400000) * 1024
+        assert (usage.read_bytes, usage.write_bytes) == (2 * MB, 2 * MB)
+        assert monitor.samples >= 1 and monitor.tests == [usage]
+
+        class RemoteDriver:
+            pass
+        assert not monitor.start_test(RemoteDriver())
+        assert monitor.finish_test('test_remote') is None
+
+    def test_report_and_worker_recommendation(self):
+        usages = [ResourceUsage('a', 'TestCart', 10.0, 5.0, 500 * MB, 0, MB),
+                  ResourceUsage('b', 'TestCart', 10.0, 2.0, 300 * MB, MB, 0),
+                  ResourceUsage('c', None, 5.0, 1.0, 200 * MB, 0, 0)]
+
+        # 0.5 cores and 500 MB per browser: 8 cores allow 12, 4 GB only 6
+        assert recommend_workers(usages, 8, 4096 * MB) == (6, 'memory')
+        assert recommend_workers(usages, 2, 64 * 1024 * MB) == (3, 'CPU')
+        assert recommend_workers([], 4, 0) == (4, 'CPU')
+
+        monitor = ResourceMonitor()
+        monitor.tests = usages
+        lines = monitor.report(cores=8, memory_available=4096 * MB)
+        assert lines[1].split()[:3] == ['TestCart', '2', '20.00s']
+        assert '500.0 MB' in lines[1] and lines[2].startswith('(module level)')
+        assert lines[-1] == ("8 cores, 4096 MB available: up to 6 workers (--workers 6) using 80% of them, "
+                             "limited by memory")
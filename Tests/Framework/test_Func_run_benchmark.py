@@ -0,0 +1,54 @@
+import allure
+from Utils.RunBenchmark import RunLog, pool_comparison, scaling_table, selection_key
+
+NODEIDS = ['Tests/Cart/test_cart.py::TestCart::test_add', 'Tests/Cart/test_cart.py::TestCart::test_remove']
+
+
+@allure.feature("Framework")
+@allure.story("Run Benchmarks")
+@allure.severity(allure.severity_level.NORMAL)
+class TestRunBenchmark:
+    """
+    Tests the run wall time log and the comparisons built from it.
+    """
+
+    def test_runs_are_kept_per_selection(self, tmp_path):
+        log = RunLog(str(tmp_path / 'run_benchmarks.json'), keep=3)
+        key = selection_key(NODEIDS, 'chrome', 'local')
+
+        assert key == selection_key(list(reversed(NODEIDS)), 'chrome', 'local')
+        assert key != selection_key(NODEIDS, 'firefox', 'local')
+        assert log.record(key, 2, 30.0, driver_pool='off', workers=1) == []
+        log.record(selection_key(NODEIDS[:1]), 1, 5.0, driver_pool='on', workers=1)
+        earlier = log.record(key, 2, 12.0, driver_pool='on', workers=1)
+
+        assert [(run['driver_pool'], run['wall_time']) for run in earlier] == [('off', 30.0)]
+        log.record(key, 2, 11.0, driver_pool='on', workers=1)
+        assert len(log._load()) == 3  # The oldest run was dropped
+
+    def test_pool_comparison_is_measured_against_the_other_mode(self):
+        earlier = [{'driver_pool': 'off', 'workers': 2, 'wall_time': 20.0, 'time': '2026-01-01T10:00:00'},
+                   {'driver_pool': 'off', 'workers': 1, 'wall_time': 40.0, 'time': '2026-01-01T11:00:00'},
+                   {'driver_pool': 'on', 'workers': 1, 'wall_time': 15.0, 'time': '2026-01-01T12:00:00'}]
+
+        assert pool_comparison(earlier, 10.0, 8, 'on', 1) == [
+            "Measured wall time of the same 8 tests with 1 worker(s): pool on 10.00s, pool off 40.00s "
+            "(run of 2026-01-01T11:00:00), saved 30.00s (75%)"]
+        assert "pool on 15.00s, pool off 44.00s" in pool_comparison(earlier, 44.0, 8, 'off', 1)[0]
+        assert pool_comparison(earlier, 10.0, 8, 'on', 4)[0].startswith(
+            "No run of these 8 tests with --driver_pool off and 4 worker(s) yet")
+
+    def test_scaling_table(self):
+        earlier = [{'driver_pool': 'on', 'workers': 1, 'wall_time': 80.0},
+                   {'driver_pool': 'on', 'workers': 2, 'wall_time': 50.0},  # Superseded by the next 2 workers run
+                   {'driver_pool': 'on', 'workers': 2, 'wall_time': 42.0},
+                   {'driver_pool': 'off', 'workers': 4, 'wall_time': 30.0}]
+
+        lines = scaling_table(earlier, 25.0, 4, 'on')
+
+        assert lines == ["Scaling of the same tests (driver pool on):",
+                         "    1 workers: wall time    80.00s, speedup  1.00x, efficiency 100%",
+                         "    2 workers: wall time    42.00s, speedup  1.90x, efficiency  95%",
+                         "    4 workers: wall time    25.00s, speedup  3.20x, efficiency  80%"]
+        assert scaling_table(earlier, 20.0, 4, 'off') == []
+        assert "relative to 2 workers" in scaling_table(earlier[1:3], 25.0, 4, 'on')[0]
@@ -0,0 +1,87 @@
+import time
+import pytest
+import allure
+import requests
+from Utils.StandInSite import Fault, StandInSite, parse_faults
+
+
+@allure.feature("Framework")
+@allure.story("Stand-in Site")
+@allure.severity(allure.severity_level.NORMAL)
+class TestStandInSite:
+    """
+    Tests the offline stand-in of the application under test over plain HTTP.
+    """
+
+    @pytest.fixture
+    def site(self):
+        """
+        Starts a stand-in site with a short page delay for one user.
+
+        :return: The running StandInSite.
+        """
+        stand_in = StandInSite(latency={'performance_glitch_user': {'inventory.html': 0.5, 'sort': 1.0}}).start()
+        yield stand_in
+        stand_in.stop()
+
+    def test_pages_and_assets_are_served(self, site):
+        for page in ('', 'inventory.html', 'inventory-item.html?id=4', 'cart.html', 'checkout-complete.html'):
+            response = requests.get(f"{site.url}/{page}", timeout=5)
+            assert response.status_code == 200
+            assert '<title>Swag Labs</title>' in response.text
+            assert response.headers['Cache-Control'] == 'no-store'
+
+        config = requests.get(f"{site.url}/stand-in/config.js", timeout=5).text
+        assert '"performance_glitch_user": {"inventory.html": 0.5, "sort": 1.0}' in config
+        assert requests.get(f"{site.url}/static/js/app.js", timeout=5).status_code == 200
+
+        image = requests.get(f"{site.url}/static/media/sauce-backpack-1200x1500.jpg", timeout=5)
+        assert image.headers['Content-Type'] == 'image/jpeg'
+        # Generated pictures are the same on every request
+        assert image.content == requests.get(f"{site.url}/static/media/sauce-backpack-1200x1500.jpg",
+                                             timeout=5).content
+
+        assert requests.get(f"{site.url}/static/../StandInSite.py", timeout=5).status_code == 404
+        assert requests.get(f"{site.url}/unknown.html", timeout=5).status_code == 404
+
+    def test_latency_follows_the_session_user(self, site):
+        start = time.perf_counter()
+        requests.get(f"{site.url}/inventory.html", cookies={'session-username': 'standard_user'}, timeout=5)
+        fast = time.perf_counter() - start
+
+        start = time.perf_counter()
+        requests.get(f"{site.url}/inventory.html", cookies={'session-username': 'performance_glitch_user'},
+                     timeout=5)
+        slow = time.perf_counter() - start
+
+        assert fast < 0.4
+        assert slow >= 0.5
+
+    def test_error_fault_answers_500_every_nth_request(self, site):
+        site.add_fault(Fault('cart.html', every=2))
+
+        statuses = [requests.get(f"{site.url}/cart.html", timeout=5).status_code for _ in range(4)]
+
+        assert statuses == [200, 500, 200, 500]
+        assert site.faults_injected == 2
+        assert site.requests['cart.html'] == 4
+
+        site.clear_faults()
+        assert requests.get(f"{site.url}/cart.html", timeout=5).status_code == 200
+
+    def test_timeout_fault_drops_the_request(self, site):
+        site.add_fault(Fault('inventory.html', kind='timeout', user='problem_user', hang_seconds=0.5))
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            requests.get(f"{site.url}/inventory.html", cookies={'session-username': 'problem_user'}, timeout=5)
+        # Other users are not affected
+        assert requests.get(f"{site.url}/inventory.html", timeout=5).status_code == 200
+
+    def test_parse_faults(self):
+        faults = parse_faults("inventory.html=500, /cart.html@problem_user=timeout/3")
+
+        assert [(f.path, f.kind, f.every, f.user) for f in faults] == [
+            ('inventory.html', 'error', 1, None), ('cart.html', 'timeout', 3, 'problem_user')]
+        assert parse_faults("") == []
+        with pytest.raises(ValueError):
+            parse_faults("inventory.html=404")
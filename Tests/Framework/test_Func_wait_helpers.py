@@ -0,0 +1,131 @@
+import time
+import pytest
+import allure
+from selenium.common import NoSuchElementException
+from selenium.webdriver.common.by import By
+from PageObjects.CartPage import CartPage
+from Utils.BaseClass import BaseClass
+from Utils import TestMetrics
+
+
+class FakeElement:
+    text = '1'
+
+    def __init__(self):
+        self.clicks = 0
+
+    def is_displayed(self):
+        return True
+
+    def click(self):
+        self.clicks += 1
+
+
+class FakeDriver:
+    """Answers lookups for the locators that appear after a delay, like an element rendered late."""
+
+    def __init__(self, appear_after=None):
+        self._appear_at = {locator: time.perf_counter() + delay for locator, delay in (appear_after or {}).items()}
+        self.lookups = 0
+        self.elements = {}
+
+    def find_elements(self, by, value):
+        self.lookups += 1
+        appear_at = self._appear_at.get((by, value))
+        if appear_at is None or time.perf_counter() < appear_at:
+            return []
+        return [self.elements.setdefault((by, value), FakeElement())]
+
+    def find_element(self, by, value):
+        elements = self.find_elements(by, value)
+        if not elements:
+            raise NoSuchElementException(f"{by}={value}")
+        return elements[0]
+
+
+class FakePage(BaseClass):
+    l_slow = (By.ID, "slow")
+    l_missing = (By.ID, "missing")
+    LOCATOR_TIMEOUTS = {l_slow: 1.5}
+
+    def __init__(self, driver):
+        super().__init__()
+        self._driver = driver
+
+
+@allure.feature("Framework")
+@allure.story("Explicit Wait Helpers")
+@allure.severity(allure.severity_level.NORMAL)
+class TestWaitHelpers:
+    """
+    Tests the explicit wait helpers of BaseClass against a fake driver.
+    """
+
+    @pytest.fixture(autouse=True)
+    def wait_settings(self):
+        """
+        Uses a short default timeout and collects fresh wait metrics for each test.
+        """
+        timeout, poll_interval = BaseClass.DEFAULT_TIMEOUT, BaseClass.POLL_INTERVAL
+        BaseClass.DEFAULT_TIMEOUT, BaseClass.POLL_INTERVAL = 0.5, 0.05
+        TestMetrics.start_test()
+        yield
+        BaseClass.DEFAULT_TIMEOUT, BaseClass.POLL_INTERVAL = timeout, poll_interval
+
+    def test_find_polls_until_element_appears(self):
+        driver = FakeDriver({FakePage.l_missing: 0.2})
+        page = FakePage(driver)
+
+        assert page.find(FakePage.l_missing) is not None
+        assert driver.lookups > 1
+        assert 0.2 <= TestMetrics.finish_test()['wait.seconds'] < 0.5
+
+    def test_absence_checks_do_not_wait(self):
+        page = FakePage(FakeDriver())
+
+        start = time.perf_counter()
+        assert not page.is_present(FakePage.l_missing)
+        assert not page.is_displayed(FakePage.l_missing)
+        assert page.find_all(FakePage.l_missing, timeout=0) == []
+        with pytest.raises(NoSuchElementException):
+            page.find(FakePage.l_missing, timeout=0)
+
+        assert time.perf_counter() - start < 0.1
+        assert TestMetrics.finish_test() == {'wait.instant_checks': 4}
+
+    def test_missing_element_times_out(self):
+        page = FakePage(FakeDriver())
+
+        with pytest.raises(NoSuchElementException):
+            page.find(FakePage.l_missing)
+        assert page.find_all(FakePage.l_missing) == []
+
+        metrics = TestMetrics.finish_test()
+        assert metrics['wait.timeouts'] == 2
+        assert metrics['wait.seconds'] >= 1.0
+
+    def test_locator_timeout_override(self):
+        page = FakePage(FakeDriver({FakePage.l_slow: 1.0}))
+
+        # Longer than the 0.5s default, within the locator's own 1.5s
+        assert page.timeout_for(FakePage.l_slow) == 1.5
+        assert page.timeout_for(FakePage.l_missing) == 0.5
+        assert page.find(FakePage.l_slow) is not None
+
+    def test_remove_buttons_wait_for_the_page_to_render(self):
+        # Right after a refresh: the cart list, then the badge and the buttons render late
+        driver = FakeDriver({CartPage.l_cart_list: 0.2, BaseClass.l_cart_icon_number_of_products: 0.2,
+                             CartPage.l_remove_from_cart_buttons: 0.3})
+
+        CartPage(driver).remove_all_products_from_the_cart()
+
+        assert driver.elements[CartPage.l_remove_from_cart_buttons].clicks == 1
+
+    def test_empty_cart_does_not_wait_for_remove_buttons(self):
+        driver = FakeDriver({CartPage.l_cart_list: 0})
+
+        start = time.perf_counter()
+        CartPage(driver).remove_all_products_from_the_cart()
+
+        assert time.perf_counter() - start < 0.3
+        assert CartPage.l_remove_from_cart_buttons not in driver.elements
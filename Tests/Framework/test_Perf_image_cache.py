@@ -0,0 +1,50 @@
+import time
+from io import BytesIO
+import requests
+import allure
+from PIL import Image
+from Utils.ImageCache import ImageCache
+
+
+def compare_images_uncached(image1_url, image2_url):
+    """The comparison compare_images made before the image cache, kept as the benchmark baseline."""
+    img1 = Image.open(BytesIO(requests.get(image1_url).content))
+    img2 = Image.open(BytesIO(requests.get(image2_url).content))
+    size = (256, 256)
+    return list(img1.resize(size).getdata()) == list(img2.resize(size).getdata())
+
+
+@allure.feature("Framework")
+@allure.story("Image Cache")
+@allure.severity(allure.severity_level.MINOR)
+class TestImageCacheBenchmark:
+    """
+    Benchmarks repeated product image checks with and without the image cache.
+    """
+    CHECKS = 20  # Image comparisons per run, like one check per product over a few test classes
+
+    def test_repeated_image_checks_speedup(self, image_server):
+        base_url, handler, _ = image_server
+        pairs = [(base_url + 'backpack.png', base_url + 'backpack_copy.png'),
+                 (base_url + 'backpack.png', base_url + 'bike_light.png')]
+
+        start = time.perf_counter()
+        uncached = [compare_images_uncached(*pairs[i % 2]) for i in range(self.CHECKS)]
+        uncached_time = time.perf_counter() - start
+        uncached_requests, handler.requests = handler.requests, 0
+
+        cache = ImageCache()
+        start = time.perf_counter()
+        cached = [cache.compare(*pairs[i % 2]) for i in range(self.CHECKS)]
+        cached_time = time.perf_counter() - start
+        cache.close()
+
+        report = (f"{self.CHECKS} image checks: uncached {uncached_time:.3f}s ({uncached_requests} requests), "
+                  f"cached {cached_time:.3f}s ({handler.requests} requests), "
+                  f"speedup {uncached_time / cached_time:.1f}x")
+        allure.attach(report, name="Image cache benchmark", attachment_type=allure.attachment_type.TEXT)
+
+        assert cached == uncached
+        # Each of the three images is downloaded once, instead of twice per check
+        assert uncached_requests == 2 * self.CHECKS
+        assert handler.requests == 3
@@ -0,0 +1,73 @@
+import logging
+import os
+import time
+from logging.handlers import RotatingFileHandler
+import allure
+from Utils.LogManager import LogManager
+
+LOGGER_NAME = 'logging_benchmark'  # Not the running test's logger, which writes to the real log file
+
+
+def get_logger_uncached(log_file):
+    """The logger setup BaseClass.get_logger did before the log manager, kept as the benchmark baseline."""
+    logger = logging.getLogger(LOGGER_NAME)
+    if logger.hasHandlers():
+        logger.handlers.clear()
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    file_handler = RotatingFileHandler(log_file, maxBytes=10 * 1024 * 1024, backupCount=5)
+    file_handler.setFormatter(logging.Formatter('%(asctime)s :%(levelname)s : %(name)s : %(message)s'))
+    logger.addHandler(file_handler)
+    logger.setLevel(logging.DEBUG)
+    return logger
+
+
+def open_files():
+    return len(os.listdir('/proc/self/fd')) if os.path.isdir('/proc/self/fd') else 0
+
+
+@allure.feature("Framework")
+@allure.story("Logging")
+@allure.severity(allure.severity_level.MINOR)
+class TestLoggingBenchmark:
+    """
+    Benchmarks getting a logger and writing a line, as every test does, before and after the log manager.
+    """
+    CALLS = 300  # get_logger calls, each followed by one log line
+
+    def test_get_logger_speedup(self, tmp_path, monkeypatch):
+        # Outside of a test node the log manager names the logger itself, so both setups share LOGGER_NAME
+        monkeypatch.delenv('PYTEST_CURRENT_TEST', raising=False)
+        uncached_file = str(tmp_path / 'uncached' / 'logfile.log')
+        cached_file = str(tmp_path / 'cached' / 'logfile.log')
+
+        files_before = open_files()
+        start = time.perf_counter()
+        for i in range(self.CALLS):
+            get_logger_uncached(uncached_file).info(f"line {i}")
+        uncached_time = time.perf_counter() - start
+        leaked_files = open_files() - files_before
+
+        # The baseline leaves its handlers open, close them before measuring the log manager
+        logger = logging.getLogger(LOGGER_NAME)
+        for handler in logger.handlers:
+            handler.close()
+        logger.handlers.clear()
+
+        manager = LogManager(cached_file)
+        files_before = open_files()
+        start = time.perf_counter()
+        for i in range(self.CALLS):
+            manager.get_logger(LOGGER_NAME).info(f"line {i}")
+        cached_time = time.perf_counter() - start
+        manager_files = open_files() - files_before
+        manager.shutdown()
+
+        report = (f"{self.CALLS} get_logger calls + log lines: uncached {uncached_time * 1000:.1f}ms "
+                  f"({leaked_files} file descriptors left open), cached {cached_time * 1000:.1f}ms "
+                  f"({manager_files} file descriptors), speedup {uncached_time / cached_time:.1f}x")
+        allure.attach(report, name="Logging benchmark", attachment_type=allure.attachment_type.TEXT)
+
+        with open(cached_file) as file:
+            assert len(file.readlines()) == self.CALLS
+        assert manager_files <= 1
+        assert not logger.handlers  # The manager detached its handler on shutdown
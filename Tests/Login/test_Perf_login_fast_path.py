@@ -0,0 +1,81 @@
+import time
+import pytest
+import allure
+from PageObjects.HomePage import HomePage
+from TestData.HomePageData import HomePageData
+from Utils.BaseClass import BaseClass
+
+
+@allure.feature("Login Process")
+@allure.story("Session Login Fast Path Savings")
+@allure.severity(allure.severity_level.MINOR)
+class TestLoginFastPathSavings(BaseClass):
+    """
+    Benchmarks the session cookie login fast path against the UI login for every valid user,
+    and reports the time saved per test that logs in.
+    """
+    REPETITIONS = 3  # Logins measured per user and login method
+
+    @pytest.fixture(params=HomePageData.test_login_latency)
+    def get_data(self, request):
+        """
+        Pytest fixture to parameterize test data for login tests.
+
+        :param request: The request object provided by pytest.
+        :return: Returns a dictionary containing test data for users and passwords.
+        """
+        return request.param
+
+    def _start_logged_out(self):
+        """Drops the session and returns to the login page."""
+        self.driver.delete_all_cookies()
+        self.driver.get(BaseClass.BASE_URL)
+
+    def test_login_fast_path_savings(self, get_data):
+        """
+        Measures the average UI login and session login time for each user.
+
+        The test asserts:
+        - Both login methods land on the 'Products' page
+        - The session login is faster than the UI login on average
+        """
+        if BaseClass.force_ui_login:
+            pytest.skip("The session login fast path is disabled by --ui_login")
+
+        log = self.get_logger()
+        home_page = HomePage(self.driver)
+        results = []
+
+        for user in get_data['users']:
+            timings = {'ui': [], 'session': []}
+            for _ in range(self.REPETITIONS):
+                self._start_logged_out()
+                start_time = time.perf_counter()
+                products_page = home_page.login(user, get_data['password'])
+                title = products_page.get_page_title()
+                timings['ui'].append(time.perf_counter() - start_time)
+                assert title == 'Products', f"UI login failed for user {user}"
+
+                self._start_logged_out()
+                start_time = time.perf_counter()
+                products_page = home_page.login_with_session(user)
+                title = products_page.get_page_title()
+                timings['session'].append(time.perf_counter() - start_time)
+                assert title == 'Products', f"Session login failed for user {user}"
+
+            ui_login = sum(timings['ui']) / self.REPETITIONS
+            session_login = sum(timings['session']) / self.REPETITIONS
+            results.append((user, ui_login, session_login))
+            log.info(f"Login for user {user}: UI {ui_login:.3f}s, session {session_login:.3f}s, "
+                     f"saved {ui_login - session_login:.3f}s per test")
+
+        self._start_logged_out()
+
+        report = "\n".join(f"{user}: UI {ui:.3f}s, session {session:.3f}s, saved {ui - session:.3f}s"
+                           for user, ui, session in results)
+        allure.attach(report, name="Login fast path savings per test", attachment_type=allure.attachment_type.TEXT)
+
+        total_ui = sum(ui for _, ui, _ in results)
+        total_session = sum(session for _, _, session in results)
+        assert total_session < total_ui, \
+            f"Session login ({total_session:.3f}s) was not faster than UI login ({total_ui:.3f}s)"
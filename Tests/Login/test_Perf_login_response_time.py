@@ -1,21 +1,24 @@
 import pytest
 import allure
-import time
 from PageObjects.HomePage import HomePage
 from TestData.HomePageData import HomePageData
 from Utils.BaseClass import BaseClass
+from Utils.BrowserTiming import BrowserTiming
+from Utils.PerfHarness import PerfHarness
 
 
 @allure.feature("Login Process")
 @allure.story("Login Latency Check")
 @allure.severity(allure.severity_level.NORMAL)
 @pytest.mark.xfail
+@pytest.mark.network_matrix
+@pytest.mark.cpu_sweep
 class TestLoginResponseTime(BaseClass):
     """
     This class tests the login response time for the HomePage using valid credentials.
-    It verifies that the response time does not exceed the specified threshold (3 seconds).
+    It verifies that the 90th percentile of the response time does not exceed the specified threshold (3 seconds).
     """
-    MAX_RESPONSE_TIME = 3  # Maximum acceptable response time in seconds
+    MAX_RESPONSE_TIME = 3  # Maximum acceptable p90 response time in seconds
 
     @pytest.fixture(params=HomePageData.test_login_latency)
     def get_data(self, request):
@@ -30,16 +33,19 @@ class TestLoginResponseTime(BaseClass):
 
     def test_login_response_time(self, get_data):
         """
-        Test the login process for multiple valid users and assert that the login response time
+        Test the login process for multiple valid users and assert that the p90 login response time
         does not exceed the defined maximum response time.
 
-        The test logs the response time for each user and collects failures if any user exceeds
-        the allowed response time. At the end of the test, it asserts whether any failures occurred.
+        Each user's login is repeated by the perf harness (warmup, then --perf_iterations timed logins)
+        and the statistics are logged. Failures are collected for every user whose p90 exceeds the allowed
+        response time. At the end of the test, it asserts whether any failures occurred.
 
         :param get_data: A dictionary containing test data for users and passwords.
         """
         log = self.get_logger()  # Retrieve the logger instance
         home_page = HomePage(self.driver)  # Instantiate the HomePage object
+        browser_timing = BrowserTiming(self.driver)  # Measures the login in the browser
+        harness = PerfHarness()  # Repeats each login and computes its percentiles
 
         users = get_data['users']  # Get the list of users from the test data
         failures = []  # List to store any failures encountered during the test
@@ -47,26 +53,21 @@ class TestLoginResponseTime(BaseClass):
         # Loop through each valid username provided in the test data
         for user in users:
             try:
-                # Capture the start time before performing the login
-                start_time = time.time()
-
-                # Attempt to log in using the current user's credentials
-                product_page = home_page.login(user, get_data['password'])
-
-                # Capture the end time after login attempt
-                end_time = time.time()
-
-                # Calculate the response time taken for the login process
-                login_response_time = round((end_time - start_time), 3)
-                log.info(f"Login response time for user {user}: {login_response_time} seconds")
-
-                # Check if the calculated response time exceeds the maximum allowable response time
-                if login_response_time > self.MAX_RESPONSE_TIME:
-                    failures.append(f"Login response time exceeded {self.MAX_RESPONSE_TIME} seconds for "
-                                    f"user {user}: {login_response_time} seconds.")
-
-                # Perform logout after successful login
-                product_page.reset_application_state()
+                # Log in repeatedly with the current user's credentials, each login timed by the browser from
+                # the click on the login button to the last DOM update it caused, then log out untimed
+                stats = harness.run(
+                    "Login",
+                    lambda: home_page.login(user, get_data['password']),
+                    teardown=lambda: home_page.reset_application_state(keep_session=False),
+                    clock=browser_timing.clock(f"Login {user}"),
+                    user=user,
+                )
+                log.info(stats.summary())
+                if stats.comparison is not None:
+                    log.info(stats.comparison.summary())  # Against the login times of earlier runs
+
+                # Check if the p90 response time exceeds the maximum allowable response time
+                failures.extend(stats.check(p90=self.MAX_RESPONSE_TIME))
 
             except Exception as e:
                 # Log any errors encountered during the login process
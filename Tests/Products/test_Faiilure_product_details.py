@@ -51,7 +51,7 @@ class TestCheckProductDetailsFailure(BaseClass):
         log.info(f"Starting test for product: {product_name}")
 
         # Log into the application
-        products_page = home_page.login(user='visual_user')
+        products_page = home_page.login_with_session(user='visual_user')
         log.info("Login successful, navigated to Products Page")
 
         # Add the specified product to the cart
@@ -98,3 +98,41 @@ class TestCheckProductDetailsFailure(BaseClass):
         # Reset the application state to avoid side effects on other tests
         products_page.reset_application_state()
         log.info("Application state reset successful")
+
+    @pytest.mark.xfail(reason="Expected to fail when using user 'visual_user'.")
+    def test_check_all_product_images(self):
+        """
+        Test to compare every product image seen by 'visual_user' with the one seen by 'standard_user'.
+
+        All images are compared perceptually in one batch, so compression noise is tolerated but a
+        wrong or altered picture is reported with its similarity score and a diff heatmap.
+        """
+        log = self.get_logger()
+        home_page = HomePage(self.driver)
+
+        # Reference images as shown to the standard user
+        products_page = home_page.login_with_session(user='standard_user')
+        reference_images = {product['name']: product['image'] for product in products_page.get_catalog()}
+        log.info(f"Collected {len(reference_images)} reference images")
+
+        # Images as shown to the visual user
+        products_page = home_page.login_with_session(user='visual_user')
+        visual_images = {product['name']: product['image'] for product in products_page.get_catalog()}
+
+        names = [name for name in reference_images if name in visual_images]
+        results = self.diff_images([(reference_images[name], visual_images[name]) for name in names])
+
+        for name, result in zip(names, results):
+            if not result.is_match:
+                allure.attach(result.heatmap_png(), name=f"{name} image diff",
+                              attachment_type=allure.attachment_type.PNG)
+            self.log_assumption(
+                result.is_match,
+                f"Product image of {name} matches as expected ({result.summary()})",
+                f"Expected product image of {name} to match the standard user's. {result.summary()}",
+                log
+            )
+
+        # Reset the application state to avoid side effects on other tests
+        products_page.reset_application_state()
+        log.info("Application state reset successful")
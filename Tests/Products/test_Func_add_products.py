@@ -50,7 +50,7 @@ class TestProductsPageAdd(BaseClass):
             log.info(f"Starting test with products: {product_name_from_data}")
 
             # Log into the application
-            products_page = home_page.login()
+            products_page = home_page.login_with_session()
             log.info("Login successful")
 
             # Retrieve the names of products currently displayed on the product page
@@ -47,7 +47,7 @@ class TestSingleProductPageAdd(BaseClass):
             log.info(f"Starting test with product: {product_name}")
 
             # Log into the application
-            products_page = home_page.login()
+            products_page = home_page.login_with_session()
             log.info("Login successful")
 
             # Click on the product to view its details
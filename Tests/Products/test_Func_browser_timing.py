@@ -0,0 +1,67 @@
+import pytest
+import allure
+from PageObjects.HomePage import HomePage
+from Utils.BaseClass import BaseClass
+from Utils.BrowserTiming import BrowserTiming
+from Utils.StandInSite import StandInSite
+
+
+# The expected delays are those of the stand-in site
+@pytest.mark.skipif("not config.getoption('stand_in')", reason="Needs the stand-in site's delays, run with --stand_in")
+@allure.feature("Product Sorting")
+@allure.story("Browser Timing of Delayed Responses")
+@allure.severity(allure.severity_level.NORMAL)
+class TestBrowserTimingDelayedResponse(BaseClass):
+    """
+    Checks that browser timed steps last until a delayed response is rendered, using the slow sorting and
+    product page of performance_glitch_user on the stand-in site.
+    """
+
+    SORT_DELAY = StandInSite.DEFAULT_LATENCY['performance_glitch_user']['sort']
+    PAGE_DELAY = StandInSite.DEFAULT_LATENCY['performance_glitch_user']['inventory.html']
+
+    def test_delayed_sort_is_measured_until_rendered(self):
+        """
+        Sorts the products as performance_glitch_user, whose sorting is rendered SORT_DELAY seconds after the
+        option is selected, and checks the step covers the delay and ends with the sorted page.
+        """
+        log = self.get_logger()
+        products_page = None
+
+        try:
+            products_page = HomePage(self.driver).login_with_session(user='performance_glitch_user')
+
+            with BrowserTiming(self.driver).step("Sort by Price (high to low)") as timing:
+                products_page.sort_products_by('Price (high to low)')
+            log.info(f"Sort measured {timing.duration:.3f}s, WebDriver calls took {timing.wall_time:.3f}s")
+
+            assert timing.details['triggered']
+            assert not timing.details['timed_out']
+            assert self.SORT_DELAY <= timing.duration < self.SORT_DELAY + 2
+            # The step ended after the delayed render, the products are already sorted
+            assert products_page.verify_sorting_is_correct('Price (high to low)')
+
+        finally:
+            if products_page:
+                products_page.reset_application_state(keep_session=False)
+
+    def test_navigation_is_measured_from_the_click(self):
+        """
+        Logs in through the form as performance_glitch_user, whose product page takes PAGE_DELAY seconds, and
+        checks the step is measured from the click on the login button.
+        """
+        log = self.get_logger()
+        products_page = None
+
+        try:
+            self.driver.get(self.BASE_URL)
+            with BrowserTiming(self.driver).step("Login") as timing:
+                products_page = HomePage(self.driver).login('performance_glitch_user')
+            log.info(f"Login measured {timing.duration:.3f}s, WebDriver calls took {timing.wall_time:.3f}s")
+
+            assert not timing.details['timed_out']
+            assert self.PAGE_DELAY <= timing.duration < self.PAGE_DELAY + 3
+
+        finally:
+            if products_page:
+                products_page.reset_application_state(keep_session=False)
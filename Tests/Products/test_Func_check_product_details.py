@@ -45,7 +45,7 @@ class TestCheckProductDetails(BaseClass):
             log.info(f"Starting test for product: {product_name}")
 
             # Log into the application
-            products_page = home_page.login()
+            products_page = home_page.login_with_session()
             log.info("Login successful, navigated to Products Page")
 
             # Add the specified product to the cart
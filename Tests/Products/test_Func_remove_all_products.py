@@ -28,11 +28,11 @@ class TestProductsPageRemove(BaseClass):
 
         try:
             # Log into the application
-            products_page = home_page.login()
+            products_page = home_page.login_with_session()
             log.info("Login successful")
 
             # Add all products on the page
-            products_page.add_all_products_to_cart()
+            products_page.seed_cart()
             log.info("Added all page's products to the cart")
 
             # Remove all products from the cart
@@ -46,7 +46,7 @@ class TestProductsPageRemove(BaseClass):
             log.info(f"Number of products on the cart icon is '{cart_icon_count}'")
 
             # Add all products on the page again
-            products_page.add_all_products_to_cart()
+            products_page.seed_cart()
             log.info("Added all page's products to the cart")
 
             # Navigate to the shopping cart and retrieve the products listed there
@@ -43,11 +43,11 @@ class TestSingleProductsPageRemove(BaseClass):
             log.info(f"Starting test with product: {product_name}")
 
             # Log into the application
-            products_page = home_page.login()
+            products_page = home_page.login_with_session()
             log.info("Login successful")
 
             # Add all products on the page
-            products_page.add_all_products_to_cart()
+            products_page.seed_cart()
             log.info(f"Added all page's products to the cart")
 
             # Count the current number of products in the cart
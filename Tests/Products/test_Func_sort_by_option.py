@@ -42,7 +42,7 @@ class TestProductPageSort(BaseClass):
             log.info(f"Starting test with sort option: {sort_option}")
 
             # Log into the application
-            products_page = home_page.login()
+            products_page = home_page.login_with_session()
             log.info("Login successful")
 
             # Sort products using the specified sorting option
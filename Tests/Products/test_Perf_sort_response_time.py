@@ -1,21 +1,24 @@
-import time
 import pytest
 import allure
 from PageObjects.HomePage import HomePage
 from TestData.ProductPageData import ProductPageData
 from Utils.BaseClass import BaseClass
+from Utils.BrowserTiming import BrowserTiming
+from Utils.PerfHarness import PerfHarness
 
 
 @pytest.mark.xfail
+@pytest.mark.network_matrix
+@pytest.mark.cpu_sweep
 @allure.feature("Product Sorting")
 @allure.story("Sorting Response Time Check")
 @allure.severity(allure.severity_level.CRITICAL)
 class TestProductPageSortPerformance(BaseClass):
     """
-    Tests the performance of product sorting functionality by measuring response times.
+    Tests the performance of product sorting functionality by measuring the distribution of response times.
     """
 
-    MAX_RESPONSE_TIME = 5  # Maximum allowable response time (in seconds) for sorting actions.
+    MAX_RESPONSE_TIME = 5  # Maximum allowable p90 response time (in seconds) for sorting actions.
 
     @pytest.fixture(params=ProductPageData.test_sorting_options)
     def get_data(self, request):
@@ -29,7 +32,8 @@ class TestProductPageSortPerformance(BaseClass):
 
     def test_sorting_response_time(self, get_data):
         """
-        Measures the response time for sorting products and checks it against a maximum threshold.
+        Measures the response time for sorting products over repeated runs and checks its p90 against a
+        maximum threshold.
 
         :param get_data: A dictionary containing the sorting option to be tested.
         """
@@ -41,20 +45,26 @@ class TestProductPageSortPerformance(BaseClass):
             sort_option = get_data['option_name']
             log.info(f"Starting test with sorting option: {sort_option}")
 
-            products_page = home_page.login(user='performance_glitch_user')
+            products_page = home_page.login_with_session(user='performance_glitch_user')
             log.info("Login successful")
 
-            start_time = time.time()
-            products_page.sort_products_by(sort_option)
-            end_time = time.time()
+            # Selecting the current option again changes nothing, so every iteration starts from another order
+            start_option = 'Name (Z to A)' if sort_option == 'Name (A to Z)' else 'Name (A to Z)'
 
-            sort_response_time = round((end_time - start_time), 3)
-            log.info(f"Sorting response time for option '{sort_option}': {sort_response_time} seconds")
-
-            assert sort_response_time <= self.MAX_RESPONSE_TIME, (
-                f"Sorting response time exceeded {self.MAX_RESPONSE_TIME} "
-                f"seconds for sorting option '{sort_option}': {sort_response_time} seconds."
+            # Each sort is timed by the browser, from the option selection to the last DOM update it caused
+            stats = PerfHarness().run(
+                f"Sort by {sort_option}",
+                lambda: products_page.sort_products_by(sort_option),
+                setup=lambda: products_page.sort_products_by(start_option),
+                clock=BrowserTiming(self.driver).clock(f"Sort by {sort_option}"),
+                user='performance_glitch_user',
             )
+            log.info(stats.summary())
+            if stats.comparison is not None:
+                log.info(stats.comparison.summary())  # Against the sort times of earlier runs
+
+            failures = stats.check(p90=self.MAX_RESPONSE_TIME)
+            assert not failures, "\n".join(failures)
 
         except AssertionError as ae:
             log.error(f"Assertion failed: {ae}")
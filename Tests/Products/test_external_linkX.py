@@ -9,6 +9,7 @@ from Utils.BaseClass import BaseClass
 @allure.feature("External Link")
 @allure.story("Check X Link")
 @allure.severity(allure.severity_level.TRIVIAL)
+@pytest.mark.external
 class TestLinkToX(BaseClass):
     """
     This test class verifies the functionality of the link to the external website X.
@@ -34,7 +35,7 @@ class TestLinkToX(BaseClass):
 
         try:
             # Log into the application
-            products_page = home_page.login()
+            products_page = home_page.login_with_session()
             log.info("Login successful")
 
             # Click the link to X, retrieve the title and hover text, then close the new window
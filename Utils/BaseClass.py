@@ -1,12 +1,7 @@
-import inspect
-import os
+import functools
 import time
 import logging
-from logging.handlers import RotatingFileHandler
 import pytest
-import requests
-from PIL import Image
-from io import BytesIO
 
 from pytest_assume.plugin import assume
 from selenium.webdriver.common.by import By
@@ -16,11 +11,61 @@ from selenium.webdriver.support.wait import WebDriverWait
 from selenium.common import NoSuchElementException, TimeoutException
 from selenium.webdriver import ActionChains
 
+from Utils.ImageCache import ImageCache
+from Utils.ImageDiff import ImageDiff
+from Utils.LogManager import LogManager
+from Utils import TestMetrics
+
 
 @pytest.mark.usefixtures('setup_browser')
 class BaseClass:
     """Base class for the test automation framework, providing common utility methods."""
 
+    # Application under test
+    BASE_URL = "https://www.saucedemo.com/"
+
+    # Shared log file, each parallel worker writes its own copy (merged at the end of the run)
+    LOG_FILE = 'Logs/logfile.log'
+    log_manager = LogManager(LOG_FILE)
+
+    # Set by --ui_login, makes HomePage.login_with_session go through the login form
+    force_ui_login = False
+
+    # Set by --reset_mode and --keep_session, see reset_application_state
+    reset_mode = 'storage'
+    keep_session = False
+
+    # Clears localStorage, sessionStorage and every cookie except the one named by arguments[0] (may be null),
+    # returns the value of the kept cookie
+    _CLEAR_STORAGE_SCRIPT = """
+        var keep = arguments[0];
+        var kept = null;
+        window.localStorage.clear();
+        window.sessionStorage.clear();
+        document.cookie.split(';').forEach(function (cookie) {
+            var parts = cookie.split('=');
+            var name = parts[0].trim();
+            if (!name) return;
+            if (name === keep) { kept = parts.slice(1).join('='); return; }
+            document.cookie = name + '=; expires=Thu, 01 Jan 1970 00:00:00 GMT; path=/';
+        });
+        return kept;
+    """
+
+    # Shared by compare_images, created on first use. Set by --image_cache_dir, empty keeps it in memory only
+    image_cache = None
+    image_cache_dir = 'Reports/image_cache'
+
+    # Set by --memory_monitor, samples the page's memory whenever a page object is created
+    memory_monitor = None
+
+    # Set by --method_profile, times the public methods of the page objects (only wrapped when set)
+    method_profiler = None
+
+    # Explicit waits (set by --wait_timeout and --poll_interval), the driver's implicit wait is disabled
+    DEFAULT_TIMEOUT = 4
+    POLL_INTERVAL = 0.1
+
     # Locators for common elements across pages
     l_side_menu_button = (By.ID, "react-burger-menu-btn")
     l_shop_cart = (By.CLASS_NAME, "shopping_cart_link")
@@ -34,37 +79,41 @@ class BaseClass:
     l_close_welcome_banner = (By.CSS_SELECTOR, "button[role='button']")
     l_hover_text = (By.XPATH, "(//div//span[contains(text(), 'trusted digital')])[1]")
 
+    # Per-locator timeout overrides in seconds, page objects define their own for slow elements.
+    # The X page is an external site that renders well after the load event.
+    LOCATOR_TIMEOUTS = {
+        l_close_welcome_banner: 10,
+        l_hover_link: 10,
+        l_hover_text: 10,
+    }
+
+    def __init_subclass__(cls, **kwargs):
+        """Makes the page objects report their construction to the memory monitor and, when methods are
+        profiled, wraps their public methods."""
+        super().__init_subclass__(**kwargs)
+        init = cls.__dict__.get('__init__')
+        if init is None:
+            return
+        if BaseClass.method_profiler is not None:
+            BaseClass.method_profiler.instrument(cls)
+
+        @functools.wraps(init)
+        def __init__(self, *args, **kw):
+            init(self, *args, **kw)
+            # Only once the most derived page object is fully constructed, not from its super().__init__() calls
+            if BaseClass.memory_monitor is not None and type(self).__init__ is __init__:
+                BaseClass.memory_monitor.page_constructed(self)
+
+        cls.__init__ = __init__
+
     # 1. Logging utility
     @staticmethod
     def get_logger() -> logging.Logger:
-        """Sets up and returns a logger instance.
+        """Returns the logger of the running test, created on first use and cached for the rest of the run.
 
         :return: Configured logger instance.
         """
-        logger_name = inspect.stack()[1][3]  # Set logger name to the calling method's name
-        logger = logging.getLogger(logger_name)
-
-        # Clear existing handlers to avoid duplicate logs
-        if logger.hasHandlers():
-            logger.handlers.clear()
-
-        # Ensure the Logs directory exists
-        os.makedirs('Logs', exist_ok=True)
-
-        # Define the file handler for rotating logs
-        file_handler = RotatingFileHandler(
-            'Logs/logfile.log',  # Log file location
-            maxBytes=10 * 1024 * 1024,  # 10 MB
-            backupCount=5  # Keep up to 5 backup files
-        )
-        # Define the log format
-        formatter = logging.Formatter('%(asctime)s :%(levelname)s : %(name)s : %(message)s')
-        file_handler.setFormatter(formatter)
-
-        # Add the handler to the logger
-        logger.addHandler(file_handler)
-        logger.setLevel(logging.DEBUG)
-        return logger
+        return BaseClass.log_manager.get_logger(depth=2)  # Outside of a test, named after the calling method
 
     @staticmethod
     def log_assumption(condition, success_message, failure_message, log):
@@ -77,10 +126,13 @@ class BaseClass:
         else:
             log.info(success_message)  # Log the success message directly
 
+    def _page_changed(self):
+        """Called after an action that changes the page view, page objects drop their cached page state."""
+
     # 2. Product-specific methods
     def get_page_title(self) -> str:
         """Retrieve the page title text."""
-        title = self._driver.find_element(*self.l_title).text
+        title = self.find(self.l_title).text
         return title
 
     def get_number_of_products_from_cart_icon(self) -> int:
@@ -88,21 +140,35 @@ class BaseClass:
 
         :return: The product count as an int, or 0 if none are found.
         """
-        try:
-            products_count = self._driver.find_element(*self.l_cart_icon_number_of_products)
-            if products_count.is_displayed():
-                return int(products_count.text)
-        except NoSuchElementException:
-            pass
+        # The badge is not rendered at all for an empty cart, so don't wait for it
+        badges = self.find_all(self.l_cart_icon_number_of_products, timeout=0)
+        if badges and badges[0].is_displayed():
+            return int(badges[0].text)
         return 0
 
+    def find_remove_buttons(self, page_locator, remove_locator) -> list:
+        """Returns the "Remove" buttons of a page once it is rendered.
+
+        Right after a refresh or a route change the page may not be rendered yet, when an instant lookup would
+        find no buttons and an empty cart could not be told from a page still loading. The page's always present
+        container is waited for first; the buttons are then waited for only when the cart badge counts products.
+
+        :param page_locator: Locator of an element the page always renders, e.g. its product list.
+        :param remove_locator: Locator of the "Remove" buttons.
+        :return: List of WebElements, empty when the cart is empty.
+        """
+        self.find(page_locator)
+        timeout = None if self.get_number_of_products_from_cart_icon() else 0
+        return self.find_all(remove_locator, timeout=timeout)
+
     def click_shopping_cart(self):
         """Navigates to the shopping cart by clicking the cart icon.
 
         :return: CartPage object representing the cart page.
         """
         from PageObjects.CartPage import CartPage  # Lazy import to avoid circular dependencies
-        self._driver.find_element(*self.l_shop_cart).click()
+        self.find(self.l_shop_cart).click()
+        self._page_changed()
         return CartPage(self._driver)
 
     def get_products_name(self, locator):
@@ -111,7 +177,7 @@ class BaseClass:
         :param locator: Locator for the products.
         :return: The name of a single product if there's only one, or a list of product names if there are multiple.
         """
-        products = self._driver.find_elements(*locator)
+        products = self.find_all(locator)
         products_name = [p.text for p in products]
 
         if len(products_name) == 1:
@@ -130,27 +196,53 @@ class BaseClass:
         self.verify_link_clickable(self.l_side_menu_button)
 
         # Open the sidebar by clicking the side menu button
-        self._driver.find_element(*self.l_side_menu_button).click()
+        self.find(self.l_side_menu_button).click()
 
         # Perform logout via Sidebar
         from PageObjects.SideBar import SideBar
         if not hasattr(self, '_sidebar'):  # Sidebar instance only initialized when needed
             self._sidebar = SideBar(self._driver)
         self._sidebar.log_out()
+        self._page_changed()
 
         # Redirect back to the home page
         from PageObjects.HomePage import HomePage
         return HomePage(self._driver)
 
-    def reset_application_state(self):
-        """Resets the application state through the sidebar.
+    def reset_application_state(self, mode=None, keep_session=None):
+        """Resets the application state and records how long it took in the test's metrics.
 
-        Opens the sidebar and calls the reset function from the Sidebar class.
+        The 'ui' mode opens the sidebar and calls the reset function from the Sidebar class, which also logs out.
+        The 'storage' mode clears localStorage, sessionStorage and cookies in a single script call and reloads
+        the base URL. With keep_session the session cookie survives the storage reset and the browser is left
+        on the inventory page, so the next HomePage.login_with_session for the same user needs no re-login.
+
+        :param mode: 'ui' or 'storage', defaults to the --reset_mode option.
+        :param keep_session: Keep the authenticated session (storage mode only), defaults to --keep_session.
         """
-        self._driver.find_element(*self.l_side_menu_button).click()
-        from PageObjects.SideBar import SideBar
-        self._sidebar = SideBar(self._driver)
-        self._sidebar.reset_app_and_logout()
+        mode = mode or BaseClass.reset_mode
+        keep_session = BaseClass.keep_session if keep_session is None else keep_session
+        start = time.perf_counter()
+
+        if mode == 'ui':
+            self.find(self.l_side_menu_button).click()
+            from PageObjects.SideBar import SideBar
+            self._sidebar = SideBar(self._driver)
+            self._sidebar.reset_app_and_logout()
+        elif mode == 'storage':
+            from PageObjects.HomePage import HomePage
+            kept_user = self._driver.execute_script(
+                BaseClass._CLEAR_STORAGE_SCRIPT, HomePage.SESSION_COOKIE if keep_session else None)
+            if kept_user:
+                self._driver.get(self.BASE_URL + HomePage.INVENTORY_PAGE)
+            else:
+                self._driver.get(self.BASE_URL)
+        else:
+            raise ValueError(f"Unknown reset mode: {mode}")
+
+        self._page_changed()
+        TestMetrics.record('reset.count')
+        TestMetrics.record('reset.seconds', time.perf_counter() - start)
 
     def open_and_verify_link_to_x(self):
         """
@@ -161,7 +253,7 @@ class BaseClass:
             tuple: A tuple containing the title of the newly opened window and the text from the first hover card.
         """
         # Click the link to open the new window
-        self._driver.find_element(*self.l_external_x).click()
+        self.find(self.l_external_x).click()
 
         # Get all window handles and switch to the newly opened window
         opened_windows = self._driver.window_handles
@@ -169,21 +261,21 @@ class BaseClass:
 
         # Capture the title of the new window
         expected_title = 'Sauce Labs (@saucelabs) / X'
-        WebDriverWait(self._driver, 5).until(lambda d: d.title == expected_title)
+        self.wait_until(lambda d: d.title == expected_title, timeout=5)
         title = self._driver.title
 
         # Close the welcome banner if it exists
-        self._driver.find_element(*self.l_close_welcome_banner).click()
+        self.find(self.l_close_welcome_banner).click()
 
         # Scroll down the page to make the hover element visible
         self._driver.execute_script("window.scrollBy(0,1000);")
 
         # Perform hover action on the designated element
         action = ActionChains(self._driver)
-        action.move_to_element(self._driver.find_element(*self.l_hover_link)).perform()
+        action.move_to_element(self.find(self.l_hover_link)).perform()
 
         # Retrieve the text from the first hover card
-        hover_text = self._driver.find_element(*self.l_hover_text).text
+        hover_text = self.find(self.l_hover_text).text
         print(hover_text)  # Optional: for debugging
 
         # Close the new window and switch back to the original
@@ -198,48 +290,53 @@ class BaseClass:
     def compare_images(image1_url: str, image2_url: str) -> bool:
         """Compares two images from their URLs and returns True if they are the same.
 
+        Both images are fetched concurrently through the shared ImageCache, which keeps them resized to
+        256x256 and compares the raw pixel buffers.
+
         :param image1_url: URL of the first image.
         :param image2_url: URL of the second image.
         :return: True if the images are identical, otherwise False.
         """
-        # Download and open the first image
-        response1 = requests.get(image1_url)
-        response1.raise_for_status()
-        img1 = Image.open(BytesIO(response1.content))
+        return BaseClass._shared_image_cache().compare(image1_url, image2_url)
 
-        # Download and open the second image
-        response2 = requests.get(image2_url)
-        response2.raise_for_status()
-        img2 = Image.open(BytesIO(response2.content))
+    @staticmethod
+    def diff_images(pairs, mask=None) -> list:
+        """Compares many image pairs perceptually in one pass, tolerating compression noise.
 
-        # Resize both images to a common size for comparison
-        size = (256, 256)
-        img1_resized = img1.resize(size)
-        img2_resized = img2.resize(size)
+        :param pairs: List of (reference image URL, compared image URL).
+        :param mask: Ignore mask (see Utils.ImageDiff.rect_mask) for every pair, or a list with one mask per pair.
+        :return: List of DiffResult with the similarity score, the match verdict and the diff heatmap.
+        """
+        return ImageDiff(BaseClass._shared_image_cache()).compare_batch(pairs, mask)
 
-        # Compare the pixel data
-        return list(img1_resized.getdata()) == list(img2_resized.getdata())
+    @staticmethod
+    def _shared_image_cache() -> ImageCache:
+        if BaseClass.image_cache is None:
+            BaseClass.image_cache = ImageCache(cache_dir=BaseClass.image_cache_dir or None)
+        return BaseClass.image_cache
 
-    def verify_link_clickable(self, locator) -> bool:
+    def verify_link_clickable(self, locator, timeout=10) -> bool:
         """Verifies if a link is clickable.
 
         :param locator: Locator for the link.
+        :param timeout: Seconds to wait for the link to become clickable.
         :return: True if the link is clickable, False if it times out.
         """
         try:
-            WebDriverWait(self._driver, 10).until(EC.element_to_be_clickable(locator))
+            self.wait_until(EC.element_to_be_clickable(locator), timeout)
             return True
         except TimeoutException:
             return False
 
-    def verify_element_displayed(self, locator) -> bool:
+    def verify_element_displayed(self, locator, timeout=10) -> bool:
         """Verifies if an element is displayed on the page.
 
         :param locator: Locator for the element.
+        :param timeout: Seconds to wait for the element to become visible.
         :return: True if the element is displayed, False otherwise.
         """
         try:
-            WebDriverWait(self._driver, 10).until(EC.visibility_of_element_located(locator))
+            self.wait_until(EC.visibility_of_element_located(locator), timeout)
             return True
         except TimeoutException:
             return False
@@ -251,8 +348,94 @@ class BaseClass:
         :param value: The visible text of the option to select.
         :raises NoSuchElementException: If the provided value is not found in the dropdown.
         """
-        dropdown = Select(self._driver.find_element(*locator))
+        dropdown = Select(self.find(locator))
         try:
             dropdown.select_by_visible_text(value)
         except NoSuchElementException as e:
             raise NoSuchElementException(f'Unknown value: {value}') from e
+
+    # 4. Wait helpers
+
+    def timeout_for(self, locator) -> float:
+        """Returns the wait timeout of a locator, the closest LOCATOR_TIMEOUTS override or DEFAULT_TIMEOUT.
+
+        :param locator: Locator tuple, e.g. (By.ID, 'checkout').
+        :return: Timeout in seconds.
+        """
+        for cls in type(self).__mro__:
+            overrides = cls.__dict__.get('LOCATOR_TIMEOUTS')
+            if overrides and locator in overrides:
+                return overrides[locator]
+        return BaseClass.DEFAULT_TIMEOUT
+
+    def wait_until(self, condition, timeout=None):
+        """Polls a condition every POLL_INTERVAL seconds until it returns a truthy value.
+
+        The time spent is added to the test's 'wait.seconds' metric.
+
+        :param condition: Callable taking the driver, e.g. an expected_conditions instance.
+        :param timeout: Seconds to wait, defaults to DEFAULT_TIMEOUT.
+        :return: The condition's value.
+        :raises TimeoutException: If the condition is still falsy after the timeout.
+        """
+        timeout = BaseClass.DEFAULT_TIMEOUT if timeout is None else timeout
+        start = time.perf_counter()
+        try:
+            return WebDriverWait(self._driver, timeout, poll_frequency=BaseClass.POLL_INTERVAL).until(condition)
+        except TimeoutException:
+            TestMetrics.record('wait.timeouts')
+            raise
+        finally:
+            TestMetrics.record('wait.count')
+            TestMetrics.record('wait.seconds', time.perf_counter() - start)
+
+    def find(self, locator, timeout=None):
+        """Waits for an element to be present and returns it.
+
+        :param locator: Locator for the element.
+        :param timeout: Seconds to wait, defaults to the locator's timeout (see timeout_for). 0 looks up once.
+        :return: The WebElement.
+        :raises NoSuchElementException: If the element is not present within the timeout.
+        """
+        timeout = self.timeout_for(locator) if timeout is None else timeout
+        if timeout == 0:
+            TestMetrics.record('wait.instant_checks')
+            return self._driver.find_element(*locator)
+        try:
+            return self.wait_until(EC.presence_of_element_located(locator), timeout)
+        except TimeoutException as e:
+            raise NoSuchElementException(f"Element {locator} not found within {timeout} seconds") from e
+
+    def find_all(self, locator, timeout=None) -> list:
+        """Waits for at least one element to be present and returns all matching elements.
+
+        :param locator: Locator for the elements.
+        :param timeout: Seconds to wait, defaults to the locator's timeout (see timeout_for). Use 0 for lists that
+                        may legitimately be empty.
+        :return: List of WebElements, empty if none appeared within the timeout.
+        """
+        timeout = self.timeout_for(locator) if timeout is None else timeout
+        if timeout == 0:
+            TestMetrics.record('wait.instant_checks')
+            return self._driver.find_elements(*locator)
+        try:
+            return self.wait_until(EC.presence_of_all_elements_located(locator), timeout)
+        except TimeoutException:
+            return []
+
+    def is_present(self, locator) -> bool:
+        """Checks whether an element is in the page right now, without waiting.
+
+        :param locator: Locator for the element.
+        :return: True if at least one matching element exists.
+        """
+        return bool(self.find_all(locator, timeout=0))
+
+    def is_displayed(self, locator) -> bool:
+        """Checks whether an element is in the page and visible right now, without waiting.
+
+        :param locator: Locator for the element.
+        :return: True if the first matching element is displayed, False if it is hidden or absent.
+        """
+        elements = self.find_all(locator, timeout=0)
+        return bool(elements) and elements[0].is_displayed()
@@ -0,0 +1,205 @@
+import json
+import time
+from contextlib import contextmanager
+
+import allure
+from selenium.common import JavascriptException
+
+# Watches user input events and DOM mutations, once per document. The time a step begins (its last trigger
+# event, else its start) is also kept in sessionStorage as an epoch timestamp, so a step that loads a new
+# document of the same origin is still measured from it.
+_WATCH_JS = """
+    function remember(time) {
+        try {
+            window.sessionStorage.setItem('__perfBegin', String(performance.timeOrigin + time));
+        } catch (e) {}
+    }
+    function watch(triggers) {
+        var w = window;
+        w.__perfTiming = {start: performance.now(), trigger: null, lastMutation: null, triggers: triggers};
+        if (w.__perfListeners) return;
+        w.__perfListeners = true;
+        ['click', 'change', 'submit', 'keydown', 'input'].forEach(function (type) {
+            w.addEventListener(type, function () {
+                var t = w.__perfTiming;
+                if (t && t.triggers.indexOf(type) >= 0) {
+                    t.trigger = performance.now();
+                    t.lastMutation = null;
+                    remember(t.trigger);
+                }
+            }, true);
+        });
+        new MutationObserver(function () {
+            if (w.__perfTiming) w.__perfTiming.lastMutation = performance.now();
+        }).observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+    }
+"""
+
+# Marks the start of a step. arguments[0]: step name, arguments[1]: event types that trigger the measured response
+_START_SCRIPT = _WATCH_JS + """
+    watch(arguments[1]);
+    remember(window.__perfTiming.start);
+    performance.mark(arguments[0] + ':start');
+"""
+
+# Returns the milliseconds since the step's last activity (trigger or DOM mutation), null while a new document
+# is still loading. A new document is watched from the moment it is complete.
+_QUIET_SCRIPT = _WATCH_JS + """
+    var t = window.__perfTiming;
+    if (!t) {
+        if (document.readyState !== 'complete') return null;
+        watch([]);
+        t = window.__perfTiming;
+        t.navigated = true;
+    }
+    return performance.now() - Math.max(t.start, t.trigger || 0, t.lastMutation || 0);
+"""
+
+# Navigation and paint timing of the current document, in milliseconds since its navigation start
+_NAVIGATION_JS = """
+    function navigationTiming() {
+        var entry = performance.getEntriesByType('navigation')[0];
+        if (!entry) return null;
+        var paints = {};
+        performance.getEntriesByType('paint').forEach(function (p) { paints[p.name] = p.startTime; });
+        return {
+            type: entry.type,
+            response_end: entry.responseEnd,
+            dom_content_loaded: entry.domContentLoadedEventEnd,
+            load: entry.loadEventEnd,
+            first_paint: paints['first-paint'] || null,
+            first_contentful_paint: paints['first-contentful-paint'] || null
+        };
+    }
+"""
+
+_NAVIGATION_SCRIPT = _NAVIGATION_JS + "return navigationTiming();"
+
+# Ends the step: measures from the last trigger event to the last DOM mutation it caused, as a user timing
+# measure. When the step loaded a new document, it ends with that document's load event or last mutation and
+# is measured from the trigger timestamp kept in sessionStorage (from the navigation start when it was lost).
+_END_SCRIPT = _NAVIGATION_JS + """
+    var name = arguments[0];
+    var t = window.__perfTiming;
+    window.__perfTiming = null;
+    var begin = NaN;
+    try {
+        begin = parseFloat(window.sessionStorage.getItem('__perfBegin'));
+        window.sessionStorage.removeItem('__perfBegin');
+    } catch (e) {}
+    var navigation = navigationTiming();
+    var start, end;
+    if (t && !t.navigated) {
+        start = t.trigger !== null ? t.trigger : t.start;
+        end = t.lastMutation !== null ? t.lastMutation : start;
+        performance.mark(name + ':end', {startTime: end});
+        performance.measure(name, {start: start, end: end});
+        return {same_document: true, triggered: t.trigger !== null, duration: end - start, navigation: navigation};
+    }
+    var loaded = navigation ? navigation.load || navigation.dom_content_loaded || navigation.response_end : 0;
+    end = Math.max(loaded, t && t.lastMutation !== null ? t.lastMutation : 0);
+    // Before this document's time origin when the step was triggered in the previous document
+    start = isNaN(begin) ? 0 : begin - performance.timeOrigin;
+    performance.mark(name + ':end', {startTime: end});
+    performance.measure(name, {start: Math.max(0, start), end: end});
+    return {same_document: false, from_trigger: !isNaN(begin), duration: end - start, navigation: navigation};
+"""
+
+
+class StepTiming:
+    """Timing of one measured step, filled in when the step ends."""
+
+    def __init__(self, name):
+        """
+        :param name: Step name, also used for the browser's user timing marks and measure.
+        """
+        self.name = name
+        self.duration = None  # Seconds, measured by the browser
+        self.wall_time = None  # Seconds, measured around the WebDriver calls
+        self.details = {}
+
+    def as_dict(self) -> dict:
+        return {'step': self.name, 'duration': self.duration, 'wall_time': self.wall_time, **self.details}
+
+
+class BrowserTiming:
+    """Measures actions with the browser's own clock instead of around WebDriver round trips.
+
+    A step measures from the last user input event of the action (e.g. the click on the login button) to
+    the last DOM mutation it caused, and records it as a user timing measure in the page. A WebDriver action
+    returns before a delayed response has been rendered, so the step only ends once the page has been quiet
+    (no DOM mutation) for quiet_window seconds, or after timeout seconds. When the action loads a new document,
+    the step ends with that document's load event or last mutation, still measured from the trigger event.
+    Navigation and paint entries are reported with every step and attached to Allure.
+    """
+
+    def __init__(self, driver, triggers=('click', 'change', 'submit'), quiet_window=0.5, timeout=10,
+                 poll_interval=0.05):
+        """
+        :param driver: WebDriver instance.
+        :param triggers: DOM event types that start the measured response.
+        :param quiet_window: Seconds without DOM mutation after which the response is complete.
+        :param timeout: Longest wait for the quiet window, in seconds, the step then ends as it is.
+        :param poll_interval: Seconds between two checks of the page.
+        """
+        self._driver = driver
+        self.triggers = list(triggers)
+        self.quiet_window = quiet_window
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self.steps = []
+
+    def navigation_timing(self) -> dict:
+        """Returns the navigation and paint timing of the current document, in milliseconds."""
+        return self._driver.execute_script(_NAVIGATION_SCRIPT)
+
+    def clock(self, name):
+        """Returns a clock for PerfHarness.run that measures each iteration as a browser timed step.
+
+        :param name: Step name.
+        """
+        def measure(action):
+            with self.step(name) as timing:
+                action()
+            return timing.duration
+        return measure
+
+    def wait_until_quiet(self) -> bool:
+        """Waits until the page has had no DOM mutation for quiet_window seconds.
+
+        :return: False when the timeout was reached first.
+        """
+        deadline = time.perf_counter() + self.timeout
+        while True:
+            try:
+                quiet = self._driver.execute_script(_QUIET_SCRIPT)
+            except JavascriptException:
+                quiet = None  # The document was unloaded while the script ran
+            if quiet is not None and quiet >= self.quiet_window * 1000:
+                return True
+            if time.perf_counter() >= deadline:
+                return False
+            time.sleep(self.poll_interval)
+
+    @contextmanager
+    def step(self, name):
+        """Measures the actions run inside the with block and the response they cause.
+
+        :param name: Step name.
+        :return: StepTiming, filled in when the block exits.
+        """
+        timing = StepTiming(name)
+        self._driver.execute_script(_START_SCRIPT, name, self.triggers)
+        start = time.perf_counter()
+        yield timing
+        timing.wall_time = time.perf_counter() - start
+
+        quiet = self.wait_until_quiet()
+        details = self._driver.execute_script(_END_SCRIPT, name)
+        details['timed_out'] = not quiet
+        timing.duration = details['duration'] / 1000
+        timing.details = details
+        self.steps.append(timing)
+
+        allure.attach(json.dumps(timing.as_dict(), indent=2), name=f"{name} browser timing",
+                      attachment_type=allure.attachment_type.JSON)
@@ -0,0 +1,266 @@
+import gzip
+import json
+import os
+import re
+import statistics
+import time
+
+from Utils.CommandProfiler import framework_commands
+from Utils.DevTools import supports_cdp
+from Utils.PerfHarness import PerfHarness
+
+# Trace categories recorded by chromedriver. The disabled-by-default timeline category carries the
+# RunTask events the long tasks are found from
+TRACE_CATEGORIES = ('devtools.timeline', 'disabled-by-default-devtools.timeline', 'v8', 'loading')
+
+# Trace event name -> category of its self time, the buckets of the DevTools performance summary
+EVENT_CATEGORIES = {
+    'scripting': ('EvaluateScript', 'FunctionCall', 'TimerFire', 'EventDispatch', 'FireAnimationFrame',
+                  'FireIdleCallback', 'XHRReadyStateChange', 'XHRLoad', 'RunMicrotasks', 'V8.Execute',
+                  'v8.compile', 'v8.compileModule', 'v8.evaluateModule', 'v8.run', 'v8.callFunction',
+                  'V8.CompileCode', 'V8.ParseFunction', 'MajorGC', 'MinorGC', 'BlinkGC.AtomicPhase'),
+    'layout': ('Layout', 'UpdateLayoutTree', 'RecalculateStyles', 'UpdateLayerTree', 'HitTest',
+               'InvalidateLayout', 'ScheduleStyleRecalculation', 'PrePaint'),
+    'paint': ('Paint', 'PaintImage', 'PaintSetup', 'CompositeLayers', 'RasterTask', 'Decode Image', 'Layerize',
+              'Commit', 'UpdateLayer'),
+    'loading': ('ParseHTML', 'ParseAuthorStyleSheet', 'ResourceSendRequest', 'ResourceReceiveResponse',
+                'ResourceReceivedData', 'ResourceFinish'),
+}
+_CATEGORY_OF = {name: category for category, names in EVENT_CATEGORIES.items() for name in names}
+
+LONG_TASK_MS = 50  # Tasks at least this long block the main thread noticeably (the Long Tasks API threshold)
+
+
+def enable_trace_logging(options, browser) -> bool:
+    """Makes the driver created with these options record a performance trace in its performance log.
+
+    :param options: Browser options, changed in place.
+    :param browser: Browser type ('chrome', 'firefox', 'edge').
+    :return: False for browsers without Chrome tracing (Firefox), whose options are left as they are.
+    """
+    if browser not in ('chrome', 'edge'):
+        return False
+    options.set_capability('goog:loggingPrefs' if browser == 'chrome' else 'ms:loggingPrefs', {'performance': 'ALL'})
+    options.add_experimental_option('perfLoggingPrefs', {
+        'traceCategories': ','.join(TRACE_CATEGORIES), 'enableNetwork': False, 'enablePage': False})
+    return True
+
+
+def events_from_performance_log(entries) -> list:
+    """Extracts the trace events from chromedriver's performance log entries.
+
+    :param entries: Result of driver.get_log('performance').
+    :return: Trace events in the Trace Event Format.
+    """
+    events = []
+    for entry in entries:
+        message = json.loads(entry['message'])['message']
+        if message.get('method') == 'Tracing.dataCollected':
+            events.append(message['params'])
+    return events
+
+
+def save_trace(events, path):
+    """Writes trace events as a gzipped JSON trace, which the DevTools performance panel and Perfetto open."""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with gzip.open(path, 'wt', encoding='utf-8') as file:
+        json.dump({'traceEvents': events}, file)
+
+
+def load_trace(path) -> list:
+    with gzip.open(path, 'rt', encoding='utf-8') as file:
+        return json.load(file)['traceEvents']
+
+
+class TraceSummary:
+    """Hot spots of a performance trace: long tasks, time per category and the slowest event handlers."""
+
+    def __init__(self, events, top=5):
+        """
+        :param events: Trace events, complete ('X') or begin/end ('B'/'E') pairs, timestamps in microseconds.
+        :param top: Number of long tasks and event handlers listed.
+        """
+        self.top = top
+        self.spans = self._spans(events)  # (pid, tid, ts, dur, name, args), durations in microseconds
+        self.start = min((span[2] for span in self.spans), default=0)
+        self.end = max((span[2] + span[3] for span in self.spans), default=0)
+
+    @staticmethod
+    def _spans(events):
+        spans, open_spans = [], {}
+        for event in events:
+            phase, thread = event.get('ph'), (event.get('pid'), event.get('tid'))
+            if phase == 'X' and 'dur' in event:
+                spans.append((*thread, event['ts'], event['dur'], event.get('name', ''), event.get('args', {})))
+            elif phase == 'B':
+                open_spans.setdefault(thread, []).append(event)
+            elif phase == 'E' and open_spans.get(thread):
+                begin = open_spans[thread].pop()
+                spans.append((*thread, begin['ts'], event['ts'] - begin['ts'], begin.get('name', ''),
+                              {**begin.get('args', {}), **event.get('args', {})}))
+        return sorted(spans, key=lambda span: (span[0], span[1], span[2], -span[3]))
+
+    @property
+    def duration(self) -> float:
+        """Seconds between the first and the last event."""
+        return (self.end - self.start) / 1e6
+
+    def category_times(self) -> dict:
+        """Returns the self time in seconds per category (scripting, layout, paint, loading, other)."""
+        times = dict.fromkeys(list(EVENT_CATEGORIES) + ['other'], 0.0)
+        stack, thread = [], None
+        # Self time: the span's duration minus the time of the spans nested directly in it
+        children = [0] * len(self.spans)
+        for index, (pid, tid, ts, dur, name, args) in enumerate(self.spans):
+            if (pid, tid) != thread:
+                stack, thread = [], (pid, tid)
+            while stack and ts >= self.spans[stack[-1]][2] + self.spans[stack[-1]][3]:
+                stack.pop()
+            if stack:
+                children[stack[-1]] += dur
+            stack.append(index)
+        for index, (_, _, _, dur, name, _) in enumerate(self.spans):
+            times[_CATEGORY_OF.get(name, 'other')] += max(0, dur - children[index]) / 1e6
+        return times
+
+    def long_tasks(self) -> list:
+        """Returns the longest main thread tasks of at least LONG_TASK_MS.
+
+        :return: List of (start offset in s, duration in s, description of its longest nested event).
+        """
+        tasks = sorted((span for span in self.spans
+                        if span[4] in ('RunTask', 'ThreadControllerImpl::RunTask') and span[3] >= LONG_TASK_MS * 1000),
+                       key=lambda span: -span[3])[:self.top]
+        return [((ts - self.start) / 1e6, dur / 1e6, self._main_activity(pid, tid, ts, dur))
+                for pid, tid, ts, dur, _, _ in tasks]
+
+    def _main_activity(self, pid, tid, ts, dur):
+        nested = [span for span in self.spans if span[:2] == (pid, tid) and ts <= span[2] < ts + dur
+                  and span[4] not in ('RunTask', 'ThreadControllerImpl::RunTask') and span[3] < dur]
+        if not nested:
+            return 'no traced activity'
+        _, _, _, longest, name, args = max(nested, key=lambda span: span[3])
+        return f"{name}{self._source(args)} {longest / 1000:.1f} ms"
+
+    @staticmethod
+    def _source(args):
+        data = args.get('data') or {}
+        if data.get('type'):
+            return f" ({data['type']})"
+        if data.get('url'):
+            where = f"{data['url'].rsplit('/', 1)[-1]}:{data.get('lineNumber', '?')}"
+            return f" ({data['functionName']} {where})" if data.get('functionName') else f" ({where})"
+        return ''
+
+    def slowest_handlers(self) -> list:
+        """Returns the slowest DOM event dispatches.
+
+        :return: List of (event type, start offset in s, duration in s).
+        """
+        handlers = sorted((span for span in self.spans if span[4] == 'EventDispatch'), key=lambda span: -span[3])
+        return [((args.get('data') or {}).get('type', '?'), (ts - self.start) / 1e6, dur / 1e6)
+                for _, _, ts, dur, _, args in handlers[:self.top]]
+
+    def summary(self) -> str:
+        times = ", ".join(f"{category} {seconds:.3f}s" for category, seconds in self.category_times().items())
+        lines = [f"{len(self.spans)} trace events over {self.duration:.3f}s", f"Self time by category: {times}"]
+        long_tasks = self.long_tasks()
+        lines.append(f"Long tasks (>= {LONG_TASK_MS} ms):" + ("" if long_tasks else " none"))
+        lines += [f"  +{start:.3f}s {duration * 1000:7.1f} ms  {activity}" for start, duration, activity in long_tasks]
+        handlers = self.slowest_handlers()
+        lines.append("Slowest event handlers:" + ("" if handlers else " none"))
+        lines += [f"  {kind:<12} {duration * 1000:7.1f} ms at +{start:.3f}s" for kind, start, duration in handlers]
+        return "\n".join(lines)
+
+
+class ChromeTracer:
+    """Records a performance trace around test bodies and keeps count of what tracing costs.
+
+    The driver records the trace continuously once created with enable_trace_logging. Reading the performance
+    log hands over the events recorded so far, so the log is emptied before the test body and read after it.
+    The cost is measured two ways: the time spent collecting, storing and summarizing the traces, and the
+    latency of the perf steps measured while tracing against untraced runs of the same steps in the perf history.
+    """
+
+    SAFE_OVERHEAD = 0.05  # Tracing can stay on when it slows the perf steps down by less than this
+
+    def __init__(self, trace_dir='Reports/traces', top=5):
+        """
+        :param trace_dir: Directory of the gzipped traces, one per test.
+        :param top: Number of long tasks and event handlers listed in the summaries.
+        """
+        self.trace_dir = trace_dir
+        self.top = top
+        self.traces = 0
+        self.collection_seconds = 0.0  # Emptying, reading, storing and summarizing the trace
+        self.traced_seconds = 0.0  # Test bodies run while tracing
+
+    def begin(self, driver) -> bool:
+        """Empties the driver's trace buffer, so the next trace starts with the test body.
+
+        :return: False when the driver's browser can't be traced.
+        """
+        if not supports_cdp(driver):
+            return False
+        start = time.perf_counter()
+        with framework_commands():
+            driver.get_log('performance')
+        self.collection_seconds += time.perf_counter() - start
+        return True
+
+    def end(self, driver, name, body_seconds):
+        """Reads the trace recorded since begin(), stores it and summarizes it.
+
+        :param driver: The traced WebDriver.
+        :param name: Test name, the trace file is named after it.
+        :param body_seconds: Duration of the traced test body.
+        :return: Tuple of (summary text, path of the gzipped trace).
+        """
+        start = time.perf_counter()
+        with framework_commands():
+            entries = driver.get_log('performance')
+        events = events_from_performance_log(entries)
+        path = os.path.join(self.trace_dir, re.sub(r'[^\w.-]+', '_', name).strip('_')[-150:] + '.json.gz')
+        save_trace(events, path)
+        summary = TraceSummary(events, self.top).summary()
+        self.collection_seconds += time.perf_counter() - start
+        self.traces += 1
+        self.traced_seconds += body_seconds
+        return summary, path
+
+    def overhead_report(self, measurements, history=None, run_key=None) -> list:
+        """Returns the report lines of the tracing cost.
+
+        :param measurements: PerfHarness.measurements, the traced ones are compared with the history.
+        :param history: PerfHistory holding untraced runs of the same steps, None to skip the comparison.
+        :param run_key: (run label, browser, run_env) of this run.
+        """
+        per_trace = self.collection_seconds / self.traces if self.traces else 0.0
+        share = self.collection_seconds / self.traced_seconds * 100 if self.traced_seconds else 0.0
+        lines = [f"{self.traces} traces in {self.trace_dir}: {self.collection_seconds:.2f}s collecting "
+                 f"({per_trace:.3f}s per test, {share:.1f}% of the traced test time)"]
+        if history is None or run_key is None:
+            return lines
+
+        overheads = []
+        for title, conditions, stats in measurements:
+            if 'trace' not in conditions or stats.series is None or not stats.samples:
+                continue
+            name, user = stats.series
+            untraced = PerfHarness.series_name(name, {k: v for k, v in conditions.items() if k != 'trace'})
+            baseline, runs = history.baseline(*run_key, user, untraced)
+            if not baseline:
+                continue
+            overhead = stats.p50 / statistics.median(baseline) - 1
+            overheads.append(overhead)
+            lines.append(f"  {title}: p50 {stats.p50:.3f}s traced, {statistics.median(baseline):.3f}s in "
+                         f"{runs} untraced runs ({overhead * 100:+.1f}%)")
+        if overheads:
+            median = statistics.median(overheads)
+            verdict = "safe to leave on" if median < self.SAFE_OVERHEAD else "keep it opt-in"
+            lines.append(f"Median tracing overhead on perf steps {median * 100:+.1f}% "
+                         f"(limit {self.SAFE_OVERHEAD * 100:.0f}%): {verdict}")
+        else:
+            lines.append("No untraced perf history of the traced steps yet, run them once without --chrome_trace "
+                         "to measure the tracing overhead")
+        return lines
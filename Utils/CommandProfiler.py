@@ -0,0 +1,210 @@
+import os
+import sys
+import threading
+import time
+from contextlib import contextmanager
+
+from Utils.BaseClass import BaseClass
+
+# Frames of these files are helpers, not callers worth attributing a command to
+_HELPER_FILES = {os.path.normcase(os.path.abspath(sys.modules[BaseClass.__module__].__file__)),
+                 os.path.normcase(os.path.abspath(__file__))}
+
+TEST_CODE = '(test code)'
+
+# Depth of the framework_commands blocks the current thread is in
+_framework = threading.local()
+
+
+@contextmanager
+def framework_commands():
+    """Marks the WebDriver commands sent from the with block (and this thread) as the framework's own.
+
+    The memory monitor and the tracer talk to the browser in the middle of a test body; their commands are not
+    the test's round trips, so the command profiler leaves them out of the counts and the budgets.
+    """
+    _framework.depth = getattr(_framework, 'depth', 0) + 1
+    try:
+        yield
+    finally:
+        _framework.depth -= 1
+
+
+def is_page_object(obj) -> bool:
+    """Tells page objects (BaseClass subclasses defining __init__) from test classes, which never define one."""
+    return isinstance(obj, BaseClass) and any('__init__' in vars(cls) for cls in type(obj).__mro__[:-1])
+
+
+def calling_method(frame) -> str:
+    """Returns 'Class.method' of the innermost page object method on the stack, TEST_CODE when there is none.
+
+    :param frame: Frame the search starts from, going outwards.
+    """
+    while frame is not None:
+        code = frame.f_code
+        if os.path.normcase(code.co_filename) not in _HELPER_FILES and is_page_object(frame.f_locals.get('self')):
+            return getattr(code, 'co_qualname', f"{type(frame.f_locals['self']).__name__}.{code.co_name}")
+        frame = frame.f_back
+    return TEST_CODE
+
+
+class CommandCounts:
+    """Count and total latency of WebDriver commands, by command name or by calling method."""
+
+    def __init__(self):
+        self.counts = {}
+        self.seconds = {}
+
+    def add(self, key, seconds, count=1):
+        self.counts[key] = self.counts.get(key, 0) + count
+        self.seconds[key] = self.seconds.get(key, 0.0) + seconds
+
+    def merge(self, other):
+        for key, count in other.counts.items():
+            self.add(key, other.seconds[key], count)
+
+    @property
+    def total(self) -> int:
+        return sum(self.counts.values())
+
+    @property
+    def total_seconds(self) -> float:
+        return sum(self.seconds.values())
+
+    def rows(self, limit=None) -> list:
+        """Returns table lines, the keys with the most commands first."""
+        ranked = sorted(self.counts, key=lambda key: (-self.counts[key], key))[:limit]
+        return [f"  {key:<48} {self.counts[key]:>6} {self.seconds[key]:>8.3f}s "
+                f"{self.seconds[key] / self.counts[key] * 1000:>8.1f} ms" for key in ranked]
+
+
+class RoundTrips:
+    """WebDriver commands sent during one test, by command and by calling page object method."""
+
+    def __init__(self, name, budget=None):
+        """
+        :param name: Test name.
+        :param budget: Largest number of round trips the test may make, None for no limit.
+        """
+        self.name = name
+        self.budget = budget
+        self.by_command = CommandCounts()
+        self.by_caller = CommandCounts()
+
+    @property
+    def over_budget(self) -> bool:
+        return self.budget is not None and self.by_command.total > self.budget
+
+    def report(self) -> str:
+        header = f"  {'':<48} {'count':>6} {'time':>9} {'mean':>11}"
+        budget = f" (budget {self.budget})" if self.budget is not None else ""
+        lines = [f"{self.by_command.total} WebDriver round trips{budget}, {self.by_command.total_seconds:.3f}s",
+                 "By command:", header] + self.by_command.rows()
+        lines += ["By caller:", header] + self.by_caller.rows()
+        return "\n".join(lines)
+
+
+class CommandProfiler:
+    """Counts the WebDriver commands of every test and times their round trips.
+
+    Each driver's command executor is wrapped (RemoteConnection.execute, the same for local and Remote drivers),
+    so every HTTP round trip to the driver is seen, whichever thread sends it. The command is attributed to the
+    innermost page object method on the calling stack, to '(test code)' for commands sent from tests directly.
+    Commands sent outside of a test body, or by the framework itself (see framework_commands), are not counted.
+    """
+
+    def __init__(self, max_round_trips=None, fail_over_budget=False):
+        """
+        :param max_round_trips: Default round trip budget of a test, None for no limit.
+        :param fail_over_budget: Fail the tests going over their budget instead of only reporting them.
+        """
+        self.max_round_trips = max_round_trips
+        self.fail_over_budget = fail_over_budget
+        self.current = None  # RoundTrips of the running test
+        self.tests = 0
+        self.by_command = CommandCounts()  # Whole run
+        self.by_caller = CommandCounts()
+        self.over_budget = []  # (test name, round trips, budget)
+        self.framework_commands = 0  # Sent during test bodies by the framework, not counted
+        self._lock = threading.Lock()
+
+    def attach(self, driver):
+        """Starts profiling the commands of a driver, once per driver.
+
+        :param driver: WebDriver, local or Remote.
+        """
+        executor = driver.command_executor
+        if getattr(executor, '_command_profiler', None) is self:
+            return
+        execute = executor.execute
+
+        def profiled_execute(command, params=None):
+            start = time.perf_counter()
+            try:
+                return execute(command, params)
+            finally:
+                self.record(command, time.perf_counter() - start, sys._getframe(1))
+
+        executor.execute = profiled_execute
+        executor._command_profiler = self
+
+    def record(self, command, seconds, frame=None):
+        """Adds a command to the running test, ignored when no test is running.
+
+        :param command: WebDriver command name, e.g. 'findElement'.
+        :param seconds: Round trip time.
+        :param frame: Frame the command was sent from, for the attribution to a page object method.
+        """
+        if self.current is None:
+            return
+        if getattr(_framework, 'depth', 0):
+            with self._lock:
+                self.framework_commands += 1
+            return
+        caller = calling_method(frame)
+        with self._lock:
+            test = self.current
+            if test is not None:
+                test.by_command.add(command, seconds)
+                test.by_caller.add(caller, seconds)
+
+    def start_test(self, name, budget=None):
+        """
+        :param name: Test name.
+        :param budget: Round trip budget of the test, defaults to max_round_trips.
+        """
+        with self._lock:
+            self.current = RoundTrips(name, self.max_round_trips if budget is None else budget)
+
+    def finish_test(self):
+        """Stops counting and adds the test to the run totals.
+
+        :return: The RoundTrips of the test, None when none was running.
+        """
+        with self._lock:
+            test, self.current = self.current, None
+        if test is None:
+            return None
+        self.tests += 1
+        self.by_command.merge(test.by_command)
+        self.by_caller.merge(test.by_caller)
+        if test.over_budget:
+            self.over_budget.append((test.name, test.by_command.total, test.budget))
+        return test
+
+    def report(self, limit=10) -> list:
+        """Returns the end-of-run report lines.
+
+        :param limit: Number of commands and callers listed.
+        """
+        total = self.by_command.total
+        lines = [f"{total} WebDriver round trips in {self.tests} tests ({total / max(1, self.tests):.1f} per test), "
+                 f"{self.by_command.total_seconds:.2f}s"
+                 + (f" ({self.framework_commands} framework commands not counted)" if self.framework_commands else "")]
+        header = f"  {'':<48} {'count':>6} {'time':>9} {'mean':>11}"
+        lines += ["Top commands:", header] + self.by_command.rows(limit)
+        lines += ["Top callers:", header] + self.by_caller.rows(limit)
+        if self.over_budget:
+            lines.append(f"{len(self.over_budget)} tests over their round trip budget:")
+            lines += [f"  {name}: {trips} > {budget}" for name, trips, budget in self.over_budget]
+        return lines
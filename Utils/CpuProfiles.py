@@ -0,0 +1,58 @@
+import re
+
+from Utils.DevTools import execute_cdp
+
+# Named CPU profiles: how many times slower than the runner's CPU the browser's main thread runs
+CPU_PROFILES = {'1x': 1, '4x': 4, '6x': 6}
+
+
+def get_cpu_profile(name) -> int:
+    """Returns the slowdown of a CPU profile, e.g. 4 for '4x' (any '<N>x' is accepted).
+
+    :param name: Profile name, see CPU_PROFILES.
+    :raises ValueError: If the name is not '<N>x' with N >= 1.
+    """
+    match = re.fullmatch(r'(\d+(?:\.\d+)?)x', name.strip().lower())
+    if not match or float(match.group(1)) < 1:
+        raise ValueError(f"Unknown CPU profile '{name}', expected '<slowdown>x' like {', '.join(CPU_PROFILES)}")
+    rate = float(match.group(1))
+    return int(rate) if rate.is_integer() else rate
+
+
+def apply_cpu_profile(driver, rate):
+    """Slows the browser's CPU down by `rate` until another rate is applied.
+
+    :param driver: WebDriver of a Chromium browser.
+    :param rate: Slowdown factor, 1 lifts the throttling.
+    :raises DevToolsUnsupported: If the browser doesn't speak CDP.
+    """
+    execute_cdp(driver, 'Emulation.setCPUThrottlingRate', {'rate': rate})
+
+
+def cpu_comparison_table(measurements) -> list:
+    """Returns the latency of each perf step under every CPU profile it ran with, one line per step.
+
+    Steps measured under a single profile are left out. Runs without CPU emulation count as '1x'.
+
+    :param measurements: (step title, conditions, PerfStats) tuples, see PerfHarness.measurements.
+    :return: Report lines: p50/p90 per profile and the p90 slowdown against the fastest profile.
+    """
+    steps = {}
+    for title, conditions, stats in measurements:
+        others = ', '.join(f"{kind} {value}" for kind, value in conditions.items() if kind != 'cpu')
+        key = f"{title} [{others}]" if others else title
+        steps.setdefault(key, {})[conditions.get('cpu', '1x')] = stats
+
+    lines = []
+    for key, by_profile in steps.items():
+        if len(by_profile) < 2:
+            continue
+        profiles = sorted(by_profile, key=get_cpu_profile)
+        baseline = by_profile[profiles[0]].p90
+        cells = []
+        for profile in profiles:
+            stats = by_profile[profile]
+            slowdown = f" ({stats.p90 / baseline:.1f}x)" if baseline and profile != profiles[0] else ""
+            cells.append(f"{profile}: p50 {stats.p50:.3f}s p90 {stats.p90:.3f}s{slowdown}")
+        lines.append(f"{key}: " + " | ".join(cells))
+    return lines
@@ -0,0 +1,30 @@
+# Browsers whose driver speaks the Chrome DevTools Protocol (capabilities' browserName, lowercased)
+CHROMIUM_BROWSERS = ('chrome', 'chrome-headless-shell', 'msedge', 'microsoftedge')
+
+
+class DevToolsUnsupported(RuntimeError):
+    """Raised when a DevTools command is sent to a browser without the Chrome DevTools Protocol (e.g. Firefox)."""
+
+
+def browser_name(driver) -> str:
+    return (driver.capabilities.get('browserName') or '').lower()
+
+
+def supports_cdp(driver) -> bool:
+    """Returns True when the driver's browser accepts Chrome DevTools Protocol commands (Chrome, Edge)."""
+    return browser_name(driver) in CHROMIUM_BROWSERS
+
+
+def execute_cdp(driver, command, params=None) -> dict:
+    """Sends a Chrome DevTools Protocol command through the driver, locally or through a grid.
+
+    :param driver: WebDriver of a Chromium browser.
+    :param command: CDP method, e.g. 'Network.emulateNetworkConditions'.
+    :param params: Parameters of the method.
+    :return: The command's result.
+    :raises DevToolsUnsupported: If the browser doesn't speak CDP.
+    """
+    if not supports_cdp(driver):
+        raise DevToolsUnsupported(f"{command} needs a Chromium browser (Chrome or Edge), "
+                                  f"not {browser_name(driver) or 'an unknown browser'}")
+    return driver.execute_cdp_cmd(command, params or {})
@@ -0,0 +1,280 @@
+import logging
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class DriverPool:
+    """Keeps warm WebDriver instances alive for the whole session and leases them to tests.
+
+    A leased driver is handed back through :meth:`release`, which cleans it (extra windows closed,
+    cookies, localStorage and sessionStorage cleared, back on the base URL) so the next lease starts
+    from the same state a freshly launched browser would.
+
+    With prewarming, spare drivers are launched in background threads ahead of demand, so a lease finds a
+    browser already sitting on the base URL. With background teardown, resets and quits run in background
+    threads instead of blocking the test that comes next.
+    """
+
+    # Teardown delay the per-class fixture used before quitting a browser
+    LEGACY_TEARDOWN_SLEEP = 4
+
+    def __init__(self, driver_factory, base_url, size=1, reuse=True, driver_finalizer=None, prewarm=0,
+                 background_teardown=False):
+        """
+        :param driver_factory: Callable returning a new, fully configured WebDriver instance.
+        :param base_url: URL every leased driver is sitting on.
+        :param size: Maximum number of drivers alive at the same time (leased, idle and launching).
+        :param reuse: When False, reproduces the per-class behavior (new browser per lease, sleep and quit
+                      on release). Used as the baseline for the pool benchmark.
+        :param driver_finalizer: Callable that quits a driver, defaults to driver.quit(). Lets the owner of the
+                                 driver's resources (e.g. a grid slot) release them.
+        :param prewarm: Number of spare drivers kept launched ahead of the next lease.
+        :param background_teardown: When True, release() resets or quits the driver in a background thread.
+        """
+        self._driver_factory = driver_factory
+        self._driver_finalizer = driver_finalizer or (lambda driver: driver.quit())
+        self.base_url = base_url
+        self.size = max(1, int(size))
+        self.reuse = reuse
+        self.prewarm_count = max(0, int(prewarm))
+        self.background_teardown = background_teardown
+
+        self._idle = []
+        self._all = []
+        self._launching = 0
+        self._leased = 0
+        self._background_launches = {}  # id(driver) -> startup seconds, until its first lease
+        self._threads = []
+        self._closing = False
+        self._condition = threading.Condition()
+
+        # Benchmark counters (seconds)
+        self.stats = {
+            'leases': 0,
+            'drivers_created': 0,
+            'startup_time': 0.0,
+            'reset_time': 0.0,
+            'quit_time': 0.0,
+            'wait_time': 0.0,
+            'background_launches': 0,
+            'startup_hidden': 0.0,
+            'teardown_hidden': 0.0,
+        }
+
+    def lease(self, timeout=None):
+        """Returns a clean driver on the base URL, creating one if the pool is not full yet.
+
+        Waits for a driver that is already being launched in the background rather than starting another one.
+
+        :param timeout: Seconds to wait for a free driver when all of them are leased (None waits forever).
+        :return: WebDriver instance.
+        :raises TimeoutError: If no driver became free within the timeout.
+        """
+        start = time.perf_counter()
+        with self._condition:
+            while not self._idle and (self._launching or len(self._all) >= self.size):
+                if not self._condition.wait(timeout):
+                    raise TimeoutError(f"No WebDriver became available within {timeout} seconds")
+            waited = time.perf_counter() - start
+            self.stats['wait_time'] += waited
+            self.stats['leases'] += 1
+            self._leased += 1
+            if self._idle:
+                driver = self._idle.pop()
+                startup = self._background_launches.pop(id(driver), None)
+                if startup is not None:
+                    self.stats['startup_hidden'] += max(0.0, startup - waited)
+            else:
+                driver = None
+                # Reserve the slot before launching so concurrent leases don't overfill the pool
+                self._all.append(None)
+
+        if driver is None:
+            try:
+                driver, _ = self._launch()
+            except Exception:
+                with self._condition:
+                    self._all.remove(None)
+                    self._leased -= 1
+                    self._condition.notify_all()
+                raise
+            with self._condition:
+                self._all[self._all.index(None)] = driver
+
+        self.prewarm()
+        return driver
+
+    def release(self, driver):
+        """Returns a leased driver to the pool after resetting it.
+
+        Drivers that can't be reset (crashed browser, lost session) are quit and dropped, the slot is
+        refilled lazily by the next lease (or right away when prewarming).
+
+        :param driver: The WebDriver instance obtained from :meth:`lease`.
+        """
+        with self._condition:
+            self._leased -= 1
+        if self.background_teardown:
+            self._start_thread(self._teardown, driver, True)
+        else:
+            self._teardown(driver)
+
+    def prewarm(self, count=None):
+        """Starts launching drivers in background threads until `count` spare drivers are idle or launching.
+
+        :param count: Number of spare drivers to keep ready, defaults to the pool's prewarm setting.
+        """
+        count = self.prewarm_count if count is None else count
+        with self._condition:
+            if self._closing:
+                return
+            missing = count - len(self._idle) - self._launching
+            missing = min(missing, self.size - len(self._all))
+            for _ in range(max(0, missing)):
+                self._all.append(None)
+                self._launching += 1
+                self._start_thread(self._background_launch)
+
+    def reset_driver(self, driver):
+        """Brings a driver back to the state of a freshly launched browser on the base URL.
+
+        :param driver: WebDriver instance to clean.
+        """
+        # Close windows opened by the test (e.g. external links) and go back to the main one
+        handles = driver.window_handles
+        for handle in handles[1:]:
+            driver.switch_to.window(handle)
+            driver.close()
+        driver.switch_to.window(handles[0])
+
+        # Storage is per origin, so clear it while sitting on the application
+        driver.get(self.base_url)
+        driver.delete_all_cookies()
+        driver.execute_script("window.localStorage.clear(); window.sessionStorage.clear();")
+        driver.get(self.base_url)
+
+    def shutdown(self):
+        """Waits for background launches and teardowns, then quits every driver owned by the pool."""
+        with self._condition:
+            self._closing = True
+            threads = list(self._threads)
+        for thread in threads:
+            thread.join()
+        with self._condition:
+            drivers = [d for d in self._all if d is not None]
+            self._idle.clear()
+        for driver in drivers:
+            self._discard(driver)
+
+    def _teardown(self, driver, in_background=False):
+        start = time.perf_counter()
+        if not self.reuse:
+            time.sleep(self.LEGACY_TEARDOWN_SLEEP)
+            self._discard(driver)
+        else:
+            reset_start = time.perf_counter()
+            try:
+                self.reset_driver(driver)
+            except Exception as e:
+                logger.warning(f"Dropping WebDriver that failed to reset: {e}")
+                self._discard(driver)
+            else:
+                with self._condition:
+                    self._idle.append(driver)
+                    self._condition.notify_all()
+            finally:
+                with self._condition:
+                    self.stats['reset_time'] += time.perf_counter() - reset_start
+
+        if in_background:
+            with self._condition:
+                self.stats['teardown_hidden'] += time.perf_counter() - start
+        self.prewarm()
+
+    def _background_launch(self):
+        try:
+            driver, startup = self._launch()
+        except Exception as e:
+            logger.warning(f"Background WebDriver launch failed: {e}")
+            with self._condition:
+                self._all.remove(None)
+                self._launching -= 1
+                self._condition.notify_all()
+            return
+
+        with self._condition:
+            self._all[self._all.index(None)] = driver
+            self._launching -= 1
+            self._idle.append(driver)
+            self._background_launches[id(driver)] = startup
+            self.stats['background_launches'] += 1
+            self._condition.notify_all()
+
+    def _start_thread(self, target, *args):
+        thread = threading.Thread(target=target, args=args, daemon=True)
+        with self._condition:
+            self._threads = [t for t in self._threads if t.is_alive()]
+            self._threads.append(thread)
+        thread.start()
+
+    def _launch(self):
+        start = time.perf_counter()
+        driver = self._driver_factory()
+        driver.get(self.base_url)
+        startup = time.perf_counter() - start
+        with self._condition:
+            self.stats['startup_time'] += startup
+            self.stats['drivers_created'] += 1
+        return driver, startup
+
+    def _discard(self, driver):
+        start = time.perf_counter()
+        try:
+            self._driver_finalizer(driver)
+        except Exception as e:
+            logger.warning(f"WebDriver quit failed: {e}")
+        with self._condition:
+            self.stats['quit_time'] += time.perf_counter() - start
+            if driver in self._all:
+                self._all.remove(driver)
+            self._condition.notify_all()
+
+    def benchmark_summary(self):
+        """Compares the driver lifecycle wall time of this session with an estimate of per-class browser launches.
+
+        The per-class figure is an estimate, not a measurement: it charges every lease one startup, one quit and
+        the fixed teardown sleep, using the averages measured in this session. The measured comparison comes from
+        running the same tests with --driver_pool off, see RunBenchmark.pool_comparison.
+
+        :return: List of report lines.
+        """
+        s = self.stats
+        created = max(1, s['drivers_created'])
+        avg_startup = s['startup_time'] / created
+        avg_quit = s['quit_time'] / created if s['quit_time'] else 0.0
+
+        if self.reuse:
+            actual = s['startup_time'] + s['reset_time'] + s['quit_time']
+            per_class = s['leases'] * (avg_startup + avg_quit + self.LEGACY_TEARDOWN_SLEEP)
+        else:
+            actual = s['startup_time'] + s['quit_time'] + s['leases'] * self.LEGACY_TEARDOWN_SLEEP
+            per_class = actual
+
+        lines = [
+            f"Driver pool ({'reuse' if self.reuse else 'per-lease launch'}, size {self.size}): "
+            f"{s['leases']} leases served by {s['drivers_created']} browser(s)",
+            f"  startup {s['startup_time']:.2f}s (avg {avg_startup:.2f}s), reset {s['reset_time']:.2f}s, "
+            f"quit {s['quit_time']:.2f}s, waiting for a free driver {s['wait_time']:.2f}s",
+            f"  driver lifecycle wall time {actual:.2f}s vs an estimated {per_class:.2f}s with a browser per lease",
+        ]
+        if self.reuse and per_class:
+            lines.append(f"  estimated saving {per_class - actual:.2f}s ({(1 - actual / per_class) * 100:.0f}%)")
+        if self.prewarm_count or self.background_teardown:
+            lines.append(
+                f"  prewarm: {s['background_launches']} background launches, {s['startup_hidden']:.2f}s of "
+                f"{s['startup_time']:.2f}s startup hidden from tests, {s['teardown_hidden']:.2f}s of teardown "
+                f"moved off the test path"
+            )
+        return lines
@@ -0,0 +1,192 @@
+import logging
+import threading
+import time
+
+from selenium import webdriver
+
+from Utils.Parallel import worker_id
+
+logger = logging.getLogger(__name__)
+
+
+class GridEndpoint:
+    """A Selenium Grid (or standalone) Remote endpoint with a fixed number of session slots."""
+
+    def __init__(self, url, capacity=1):
+        """
+        :param url: Remote command executor URL, e.g. 'http://localhost:4444'.
+        :param capacity: Number of browser sessions the endpoint can run at the same time.
+        """
+        self.url = url.rstrip('/')
+        self.capacity = max(1, int(capacity))
+        self.active = 0
+        self.peak = 0
+        self.sessions = 0
+        self.failures = 0
+        self.busy_time = 0.0
+
+    @property
+    def load(self) -> float:
+        """Share of the endpoint's slots currently in use."""
+        return self.active / self.capacity
+
+    def has_free_slot(self) -> bool:
+        return self.active < self.capacity
+
+
+class GridScheduler:
+    """Spreads Remote WebDriver sessions over several grid endpoints.
+
+    New sessions go to the least-loaded endpoint that has a free slot. When every slot is busy the
+    caller waits until a session is quit. If session creation fails on an endpoint, the next least-loaded
+    endpoint is tried before giving up.
+
+    Slots are accounted per process. In a parallel run every worker starts its search from a different
+    endpoint, so workers spread over the grid instead of all picking the first one.
+    """
+
+    def __init__(self, endpoints, acquire_timeout=None, session_factory=None):
+        """
+        :param endpoints: List of GridEndpoint instances.
+        :param acquire_timeout: Seconds to wait for a free slot (None waits forever).
+        :param session_factory: Callable (url, options) -> WebDriver. Defaults to webdriver.Remote.
+        """
+        if not endpoints:
+            raise ValueError("At least one grid endpoint is required")
+        self.endpoints = list(endpoints)
+        self.acquire_timeout = acquire_timeout
+        self._session_factory = session_factory or (
+            lambda url, options: webdriver.Remote(command_executor=url, options=options)
+        )
+
+        self._condition = threading.Condition()
+        self._leases = {}  # id(driver) -> (endpoint, start time)
+        self._started = time.perf_counter()
+        self.queue_time = 0.0
+        self.queued_requests = 0
+
+        # Rotate the tie-break order per xdist worker ('gw3' -> 3)
+        worker = worker_id()
+        offset = int(worker[2:]) if worker.startswith('gw') else 0
+        offset %= len(self.endpoints)
+        self._order = self.endpoints[offset:] + self.endpoints[:offset]
+
+    @classmethod
+    def from_option(cls, value, **kwargs):
+        """Builds a scheduler from the --grid_endpoints option value.
+
+        :param value: Comma separated endpoints, each optionally followed by '=<slots>',
+                      e.g. 'http://node1:4444=4,http://node2:4444=2'.
+        :return: GridScheduler instance.
+        """
+        endpoints = []
+        for item in value.split(','):
+            item = item.strip()
+            if not item:
+                continue
+            url, _, capacity = item.partition('=')
+            endpoints.append(GridEndpoint(url, int(capacity) if capacity else 1))
+        return cls(endpoints, **kwargs)
+
+    def create_driver(self, options):
+        """Starts a Remote session on the least-loaded endpoint, queueing while all slots are busy.
+
+        :param options: Browser options passed to webdriver.Remote.
+        :return: WebDriver instance.
+        :raises TimeoutError: If no slot became free within acquire_timeout.
+        :raises Exception: The last session creation error when every endpoint failed.
+        """
+        tried = set()
+        last_error = None
+        while len(tried) < len(self.endpoints):
+            endpoint = self._reserve_slot(tried)
+            if endpoint is None:
+                break
+            tried.add(endpoint.url)
+            try:
+                driver = self._session_factory(endpoint.url, options)
+            except Exception as e:
+                last_error = e
+                logger.warning(f"Session creation failed on {endpoint.url}, trying another endpoint: {e}")
+                with self._condition:
+                    endpoint.failures += 1
+                    endpoint.active -= 1
+                    self._condition.notify_all()
+                continue
+
+            with self._condition:
+                endpoint.sessions += 1
+                self._leases[id(driver)] = (endpoint, time.perf_counter())
+            logger.info(f"Session created on {endpoint.url} ({endpoint.active}/{endpoint.capacity} slots busy)")
+            return driver
+
+        raise last_error or RuntimeError("No grid endpoint could create a session")
+
+    def quit_driver(self, driver):
+        """Quits a driver created by this scheduler and frees its endpoint slot.
+
+        :param driver: WebDriver instance returned by create_driver.
+        """
+        try:
+            driver.quit()
+        finally:
+            with self._condition:
+                lease = self._leases.pop(id(driver), None)
+                if lease is not None:
+                    endpoint, started = lease
+                    endpoint.active -= 1
+                    endpoint.busy_time += time.perf_counter() - started
+                    self._condition.notify_all()
+
+    def _reserve_slot(self, tried):
+        """Waits for a free slot on an endpoint that was not tried yet and reserves it."""
+        start = time.perf_counter()
+        queued = False
+        with self._condition:
+            while True:
+                candidates = [e for e in self._order if e.url not in tried]
+                if not candidates:
+                    return None
+                free = [e for e in candidates if e.has_free_slot()]
+                if free:
+                    # min() keeps the first of equally loaded endpoints, so ties follow the rotated order
+                    endpoint = min(free, key=lambda e: e.load)
+                    endpoint.active += 1
+                    endpoint.peak = max(endpoint.peak, endpoint.active)
+                    if queued:
+                        self.queue_time += time.perf_counter() - start
+                    return endpoint
+
+                if not queued:
+                    queued = True
+                    self.queued_requests += 1
+                remaining = None
+                if self.acquire_timeout is not None:
+                    remaining = self.acquire_timeout - (time.perf_counter() - start)
+                    if remaining <= 0:
+                        raise TimeoutError(f"No grid slot became free within {self.acquire_timeout} seconds")
+                self._condition.wait(remaining)
+
+    def utilization_report(self):
+        """Returns per-endpoint utilization lines for the end-of-run summary.
+
+        Utilization is the session time spent on an endpoint divided by its slot capacity over the
+        scheduler's lifetime. Sessions still open are counted up to now.
+        """
+        now = time.perf_counter()
+        elapsed = max(now - self._started, 1e-9)
+        open_time = {}
+        with self._condition:
+            for endpoint, started in self._leases.values():
+                open_time[endpoint.url] = open_time.get(endpoint.url, 0.0) + now - started
+
+        lines = []
+        for endpoint in self.endpoints:
+            busy = endpoint.busy_time + open_time.get(endpoint.url, 0.0)
+            utilization = busy / (endpoint.capacity * elapsed) * 100
+            lines.append(
+                f"{endpoint.url}: {endpoint.sessions} sessions, {endpoint.failures} failed, "
+                f"peak {endpoint.peak}/{endpoint.capacity} slots, utilization {utilization:.0f}%"
+            )
+        lines.append(f"{self.queued_requests} requests queued for a free slot, {self.queue_time:.2f}s waiting")
+        return lines
@@ -0,0 +1,262 @@
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+
+import requests
+from PIL import Image
+from requests.adapters import HTTPAdapter
+
+
+class CachedImage:
+    """A downloaded image, decoded and resized to the comparison size."""
+
+    __slots__ = ('content_hash', 'mode', 'pixels', 'size')
+
+    def __init__(self, content_hash, mode, pixels, size):
+        """
+        :param content_hash: SHA-256 of the downloaded bytes.
+        :param mode: PIL mode of the decoded image (e.g. 'RGB', 'RGBA').
+        :param pixels: Raw pixel buffer of the resized image.
+        :param size: (width, height) of the resized image.
+        """
+        self.content_hash = content_hash
+        self.mode = mode
+        self.pixels = pixels
+        self.size = size
+
+    def same_as(self, other) -> bool:
+        """Returns True if both images have the same pixels at the comparison size."""
+        if self.content_hash == other.content_hash:
+            return True
+        return self.mode == other.mode and self.pixels == other.pixels
+
+    def to_image(self) -> Image.Image:
+        """Rebuilds the resized image as a PIL image."""
+        return Image.frombytes(self.mode, self.size, self.pixels)
+
+
+class ImageCache:
+    """Fetches images over a pooled HTTP session and keeps them decoded and resized for comparisons.
+
+    Images are cached in two levels, both least recently used first out:
+    - in memory, URL -> CachedImage. A URL seen earlier in the session costs no request at all.
+    - on disk, URL -> content hash, ETag and Last-Modified, plus one raw pixel file per content hash.
+      A URL seen in an earlier run is revalidated with a conditional request and decoded again only
+      when its content changed.
+    """
+
+    def __init__(self, cache_dir=None, memory_entries=128, disk_entries=512, size=(256, 256), pool_size=8,
+                 timeout=10):
+        """
+        :param cache_dir: Directory of the disk cache, None keeps the cache in memory only.
+        :param memory_entries: Maximum number of images kept in memory.
+        :param disk_entries: Maximum number of URL entries, and of pixel files, kept on disk.
+        :param size: Size images are resized to before being compared.
+        :param pool_size: Number of pooled connections and concurrent downloads.
+        :param timeout: Seconds to wait for a server response.
+        """
+        self.cache_dir = cache_dir
+        self.memory_entries = memory_entries
+        self.disk_entries = disk_entries
+        self.size = tuple(size)
+        self.timeout = timeout
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+        self._session.mount('http://', adapter)
+        self._session.mount('https://', adapter)
+        self._executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix='image-fetch')
+
+        self.stats = {'memory_hits': 0, 'disk_hits': 0, 'downloads': 0, 'fetch_time': 0.0}
+
+        if cache_dir:
+            os.makedirs(cache_dir, exist_ok=True)
+
+    def get(self, url) -> CachedImage:
+        """Returns the image at a URL, from the cache when possible.
+
+        :param url: Image URL.
+        :return: CachedImage instance.
+        :raises requests.HTTPError: If the server answers with an error status.
+        """
+        with self._lock:
+            image = self._memory.get(url)
+            if image is not None:
+                self._memory.move_to_end(url)
+                self.stats['memory_hits'] += 1
+                return image
+
+        start = time.perf_counter()
+        image = self._fetch(url)
+        with self._lock:
+            self.stats['fetch_time'] += time.perf_counter() - start
+            self._memory[url] = image
+            self._memory.move_to_end(url)
+            while len(self._memory) > self.memory_entries:
+                self._memory.popitem(last=False)
+        return image
+
+    def get_many(self, urls) -> list:
+        """Returns the images at several URLs, downloading the missing ones concurrently.
+
+        :param urls: Image URLs.
+        :return: List of CachedImage instances, in the order of the URLs.
+        """
+        return list(self._executor.map(self.get, urls))
+
+    def compare(self, url1, url2) -> bool:
+        """Returns True if the images at both URLs have the same pixels at the comparison size.
+
+        :param url1: URL of the first image.
+        :param url2: URL of the second image.
+        """
+        image1, image2 = self.get_many([url1, url2])
+        return image1.same_as(image2)
+
+    def clear_memory(self):
+        """Drops the in-memory level, the disk cache is kept."""
+        with self._lock:
+            self._memory.clear()
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        self._session.close()
+
+    def _fetch(self, url) -> CachedImage:
+        entry = self._read_entry(url)
+        headers = {}
+        if entry:
+            if entry.get('etag'):
+                headers['If-None-Match'] = entry['etag']
+            if entry.get('last_modified'):
+                headers['If-Modified-Since'] = entry['last_modified']
+
+        response = self._session.get(url, headers=headers, timeout=self.timeout)
+        if response.status_code == 304 and entry:
+            pixels = self._read_pixels(entry['hash'])
+            if pixels is not None:
+                with self._lock:
+                    self.stats['disk_hits'] += 1
+                return CachedImage(entry['hash'], entry['mode'], pixels, self.size)
+            # The pixel file was evicted, download the image again
+            response = self._session.get(url, timeout=self.timeout)
+        response.raise_for_status()
+
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        with Image.open(BytesIO(response.content)) as img:
+            resized = img.resize(self.size)
+        image = CachedImage(content_hash, resized.mode, resized.tobytes(), self.size)
+        with self._lock:
+            self.stats['downloads'] += 1
+
+        self._write_entry(url, image, response.headers)
+        return image
+
+    def _entry_path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha256(url.encode()).hexdigest() + '.json')
+
+    def _pixels_path(self, content_hash):
+        width, height = self.size
+        return os.path.join(self.cache_dir, f"{content_hash}_{width}x{height}.raw")
+
+    def _read_entry(self, url):
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._entry_path(url), encoding='utf-8') as f:
+                entry = json.load(f)
+            os.utime(self._entry_path(url))  # Mark as recently used for the disk eviction
+            return entry
+        except (OSError, ValueError):
+            return None
+
+    def _read_pixels(self, content_hash):
+        path = self._pixels_path(content_hash)
+        try:
+            with open(path, 'rb') as f:
+                pixels = f.read()
+        except OSError:
+            return None
+        os.utime(path)  # Mark as recently used for the disk eviction
+        return pixels
+
+    def _write_entry(self, url, image, headers):
+        if not self.cache_dir:
+            return
+        pixels_path = self._pixels_path(image.content_hash)
+        if not os.path.exists(pixels_path):
+            self._write_atomic(pixels_path, image.pixels)
+        entry = {
+            'url': url,
+            'hash': image.content_hash,
+            'mode': image.mode,
+            'etag': headers.get('ETag'),
+            'last_modified': headers.get('Last-Modified'),
+        }
+        self._write_atomic(self._entry_path(url), json.dumps(entry).encode('utf-8'))
+        self._evict_disk()
+
+    @staticmethod
+    def _write_atomic(path, data):
+        # Parallel workers share the cache directory, readers never see a partial file
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+    def _evict_disk(self):
+        """Keeps at most disk_entries URL entries and pixel files, least recently used first out.
+
+        URL entries and pixel files are evicted in pairs: an entry goes together with its pixel file, which
+        several URLs with the same content may share and is only removed with the last of them. Pixel files
+        no entry points to any more (their URL's content changed) go first.
+        """
+        try:
+            names = os.listdir(self.cache_dir)
+        except OSError:
+            return
+        entry_names = [name for name in names if name.endswith('.json')]
+        pixel_names = {name for name in names if name.endswith('.raw')}
+        if len(entry_names) <= self.disk_entries and len(pixel_names) <= self.disk_entries:
+            return
+
+        entries = []  # (last use, entry path, pixel file name)
+        for name in entry_names:
+            path = os.path.join(self.cache_dir, name)
+            try:
+                with open(path, encoding='utf-8') as f:
+                    pixels = os.path.basename(self._pixels_path(json.load(f)['hash']))
+                entries.append((os.path.getmtime(path), path, pixels))
+            except (OSError, ValueError, KeyError):
+                continue  # Removed by another worker, or being replaced
+        entries.sort()
+        users = {}
+        for _, _, pixels in entries:
+            users[pixels] = users.get(pixels, 0) + 1
+
+        for pixels in pixel_names - set(users):
+            self._remove(os.path.join(self.cache_dir, pixels))
+        kept_entries, kept_pixels = len(entries), len(pixel_names & set(users))
+        for _, path, pixels in entries:
+            if kept_entries <= self.disk_entries and kept_pixels <= self.disk_entries:
+                break
+            self._remove(path)
+            kept_entries -= 1
+            users[pixels] -= 1
+            if not users[pixels]:
+                self._remove(os.path.join(self.cache_dir, pixels))
+                kept_pixels -= 1
+
+    @staticmethod
+    def _remove(path):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
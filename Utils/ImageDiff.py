@@ -0,0 +1,197 @@
+from io import BytesIO
+
+import numpy as np
+from PIL import Image
+
+# ITU-R BT.601 luma weights, used for the perceptual hashes
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def rect_mask(size, boxes):
+    """Builds an ignore mask from rectangles given as fractions of the image size.
+
+    :param size: (width, height) of the compared images.
+    :param boxes: Iterable of (left, top, right, bottom) fractions, e.g. (0, 0, 1, 0.1) for the top 10%.
+    :return: Boolean array of shape (height, width), True where pixels are ignored.
+    """
+    width, height = size
+    mask = np.zeros((height, width), dtype=bool)
+    for left, top, right, bottom in boxes:
+        mask[int(top * height):int(np.ceil(bottom * height)), int(left * width):int(np.ceil(right * width))] = True
+    return mask
+
+
+def block_mean(batch, rows, cols):
+    """Downscales a batch of grayscale images by averaging blocks of pixels.
+
+    :param batch: Array of shape (N, H, W).
+    :param rows: Output height.
+    :param cols: Output width.
+    :return: Array of shape (N, rows, cols).
+    """
+    _, height, width = batch.shape
+    row_edges = np.linspace(0, height, rows + 1).astype(int)
+    col_edges = np.linspace(0, width, cols + 1).astype(int)
+    sums = np.add.reduceat(np.add.reduceat(batch, row_edges[:-1], axis=1), col_edges[:-1], axis=2)
+    counts = np.outer(np.diff(row_edges), np.diff(col_edges))
+    return sums / counts
+
+
+def _dct_matrix(n):
+    k = np.arange(n)[:, None]
+    matrix = np.sqrt(2 / n) * np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n))
+    matrix[0] /= np.sqrt(2)
+    return matrix
+
+
+_DCT_32 = _dct_matrix(32)
+
+
+def average_hash(gray):
+    """aHash: 8x8 thumbnail pixels above the thumbnail mean.
+
+    :param gray: Array of shape (N, H, W).
+    :return: Boolean array of shape (N, 64).
+    """
+    small = block_mean(gray, 8, 8).reshape(len(gray), -1)
+    return small > small.mean(axis=1, keepdims=True)
+
+
+def difference_hash(gray):
+    """dHash: whether each pixel of a 8x9 thumbnail is brighter than its right neighbour.
+
+    :param gray: Array of shape (N, H, W).
+    :return: Boolean array of shape (N, 64).
+    """
+    small = block_mean(gray, 8, 9)
+    return (small[:, :, :-1] > small[:, :, 1:]).reshape(len(gray), -1)
+
+
+def perceptual_hash(gray):
+    """pHash: low frequency DCT coefficients of a 32x32 thumbnail above their median.
+
+    :param gray: Array of shape (N, H, W).
+    :return: Boolean array of shape (N, 64).
+    """
+    small = block_mean(gray, 32, 32)
+    coefficients = (_DCT_32 @ small @ _DCT_32.T)[:, :8, :8].reshape(len(gray), -1)
+    # The DC coefficient only carries the average brightness, leave it out of the median
+    return coefficients > np.median(coefficients[:, 1:], axis=1, keepdims=True)
+
+
+class DiffResult:
+    """Outcome of one image pair comparison."""
+
+    def __init__(self, url1, url2, similarity, tile_mae, hash_distances, is_match, diff):
+        """
+        :param url1: URL of the reference image.
+        :param url2: URL of the compared image.
+        :param similarity: 1 minus the mean absolute error over the unmasked pixels, 1.0 for identical images.
+        :param tile_mae: Array of shape (rows, cols), mean absolute error per tile (NaN for fully masked tiles).
+        :param hash_distances: Dict of 'ahash', 'dhash', 'phash' -> Hamming distance out of 64 bits.
+        :param is_match: True if the images are considered the same.
+        :param diff: Array of shape (H, W), per-pixel absolute error in [0, 1].
+        """
+        self.url1 = url1
+        self.url2 = url2
+        self.similarity = similarity
+        self.tile_mae = tile_mae
+        self.hash_distances = hash_distances
+        self.is_match = is_match
+        self._diff = diff
+
+    def summary(self) -> str:
+        hashes = ", ".join(f"{name} {distance}" for name, distance in self.hash_distances.items())
+        return (f"similarity {self.similarity:.3f}, worst tile MAE {np.nanmax(self.tile_mae):.3f}, "
+                f"hash distances: {hashes} -> {'match' if self.is_match else 'DIFFERENT'}")
+
+    def heatmap_png(self) -> bytes:
+        """Renders the per-pixel error as a black to red heatmap with the tile grid scores, as PNG bytes."""
+        height, width = self._diff.shape
+        rows, cols = self.tile_mae.shape
+        tiles = np.nan_to_num(self.tile_mae).repeat(height // rows, axis=0).repeat(width // cols, axis=1)
+        tiles = np.pad(tiles, ((0, height - tiles.shape[0]), (0, width - tiles.shape[1])))
+        heat = np.zeros((height, width, 3), dtype=np.uint8)
+        heat[..., 0] = np.clip(self._diff * 255 * 4, 0, 255)
+        heat[..., 1] = np.clip(tiles * 255 * 4, 0, 255) // 2
+        buffer = BytesIO()
+        Image.fromarray(heat).save(buffer, format='PNG')
+        return buffer.getvalue()
+
+
+class ImageDiff:
+    """Perceptual comparison of image pairs, vectorized with NumPy over the whole batch.
+
+    Each pair gets perceptual hash distances (aHash, dHash, pHash), a mean absolute error per tile and a
+    similarity score. A pair matches when no tile differs more than tile_threshold and the pHash distance
+    stays within hash_threshold, which tolerates compression noise but not a different picture or a
+    changed region. Ignore masks leave out regions that legitimately differ.
+    """
+
+    def __init__(self, image_cache, tile_size=16, tile_threshold=0.1, hash_threshold=10):
+        """
+        :param image_cache: ImageCache used to fetch and resize the images.
+        :param tile_size: Tile edge in pixels (of the image cache's comparison size).
+        :param tile_threshold: Highest tolerated mean absolute error of a tile, in [0, 1].
+        :param hash_threshold: Highest tolerated pHash Hamming distance, out of 64 bits.
+        """
+        self.image_cache = image_cache
+        self.tile_size = tile_size
+        self.tile_threshold = tile_threshold
+        self.hash_threshold = hash_threshold
+
+    def compare(self, url1, url2, mask=None) -> DiffResult:
+        """Compares one pair of images, see compare_batch."""
+        return self.compare_batch([(url1, url2)], mask)[0]
+
+    def compare_batch(self, pairs, mask=None) -> list:
+        """Compares many image pairs in one vectorized pass.
+
+        :param pairs: List of (reference URL, compared URL).
+        :param mask: Ignore mask (see rect_mask) applied to every pair, or a list with one mask (or None) per pair.
+        :return: List of DiffResult, in the order of the pairs.
+        """
+        if not pairs:
+            return []
+        images = self.image_cache.get_many([url for pair in pairs for url in pair])
+        rgb = np.stack([np.asarray(image.to_image().convert('RGB'), dtype=np.float32) / 255 for image in images])
+        reference, compared = rgb[0::2], rgb[1::2]
+        count, height, width, _ = reference.shape
+
+        keep = ~self._masks(mask, count, (width, height))
+        diff = np.abs(reference - compared).mean(axis=3) * keep
+
+        # Mean absolute error per tile, over the unmasked pixels only
+        rows, cols = height // self.tile_size, width // self.tile_size
+        shape = (count, rows, self.tile_size, cols, self.tile_size)
+        tile_error = diff[:, :rows * self.tile_size, :cols * self.tile_size].reshape(shape).sum(axis=(2, 4))
+        tile_pixels = keep[:, :rows * self.tile_size, :cols * self.tile_size].reshape(shape).sum(axis=(2, 4))
+        with np.errstate(invalid='ignore', divide='ignore'):
+            tile_mae = tile_error / tile_pixels
+            similarity = 1 - diff.sum(axis=(1, 2)) / keep.sum(axis=(1, 2))
+
+        # Masked regions are flattened to mid gray in both images so they don't move the hashes
+        gray_reference = np.where(keep, reference @ _LUMA, 0.5)
+        gray_compared = np.where(keep, compared @ _LUMA, 0.5)
+        distances = {}
+        for name, hash_function in (('ahash', average_hash), ('dhash', difference_hash),
+                                    ('phash', perceptual_hash)):
+            distances[name] = (hash_function(gray_reference) != hash_function(gray_compared)).sum(axis=1)
+
+        worst_tile = np.nanmax(np.where(np.isnan(tile_mae), -np.inf, tile_mae).reshape(count, -1), axis=1)
+        matches = (worst_tile <= self.tile_threshold) & (distances['phash'] <= self.hash_threshold)
+
+        return [
+            DiffResult(url1, url2, float(np.nan_to_num(similarity[i], nan=1.0)), tile_mae[i],
+                       {name: int(values[i]) for name, values in distances.items()}, bool(matches[i]), diff[i])
+            for i, (url1, url2) in enumerate(pairs)
+        ]
+
+    @staticmethod
+    def _masks(mask, count, size):
+        width, height = size
+        if mask is None or isinstance(mask, np.ndarray):
+            masks = [mask] * count
+        else:
+            masks = list(mask)
+        return np.stack([np.zeros((height, width), dtype=bool) if m is None else m for m in masks])
@@ -0,0 +1,297 @@
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from Utils.PerfHarness import percentile
+
+logger = logging.getLogger(__name__)
+
+
+class Stage:
+    """One stage of a load profile: the number of virtual users moves linearly to `users` over `duration`."""
+
+    def __init__(self, duration, users):
+        """
+        :param duration: Stage length in seconds.
+        :param users: Virtual users running at the end of the stage.
+        """
+        self.duration = duration
+        self.users = users
+
+    def __repr__(self):
+        return f"Stage({self.duration}s -> {self.users} users)"
+
+
+def parse_stages(text) -> list:
+    """Parses a load profile such as '30s:5,2m:5,30s:0' (ramp-up, steady state, ramp-down).
+
+    :param text: Comma separated '<duration>:<users>' stages, durations in s (default) or m.
+    :return: List of Stage.
+    :raises ValueError: If a stage can't be parsed.
+    """
+    stages = []
+    for part in text.split(','):
+        match = re.fullmatch(r'\s*(\d+(?:\.\d+)?)\s*(s|m)?\s*:\s*(\d+)\s*', part)
+        if not match:
+            raise ValueError(f"Invalid load stage '{part}', expected '<duration>:<users>' like '30s:5'")
+        duration = float(match.group(1)) * (60 if match.group(2) == 'm' else 1)
+        stages.append(Stage(duration, int(match.group(3))))
+    return stages
+
+
+def target_users(stages, elapsed) -> int:
+    """Returns the number of virtual users the profile asks for after `elapsed` seconds (0 once it is over)."""
+    previous = 0
+    for stage in stages:
+        if elapsed < stage.duration:
+            return round(previous + (stage.users - previous) * elapsed / stage.duration)
+        elapsed -= stage.duration
+        previous = stage.users
+    return 0
+
+
+class ThinkTime:
+    """Pause of a virtual user between two steps, like a shopper reading the page."""
+
+    MODELS = ('constant', 'uniform', 'exponential')
+
+    def __init__(self, mean=2.0, model='exponential', seed=None):
+        """
+        :param mean: Average pause in seconds, 0 disables thinking.
+        :param model: constant: always the mean, uniform: between half and 1.5 times the mean,
+                      exponential: mostly short pauses with a few long ones (capped at 5 times the mean).
+        :param seed: Seed of the random pauses, for reproducible runs.
+        """
+        if model not in self.MODELS:
+            raise ValueError(f"Unknown think time model: {model}")
+        self.mean = mean
+        self.model = model
+        self._random = random.Random(seed)
+
+    def sample(self) -> float:
+        if self.mean <= 0 or self.model == 'constant':
+            return max(0.0, self.mean)
+        if self.model == 'uniform':
+            return self._random.uniform(self.mean / 2, self.mean * 1.5)
+        return min(self._random.expovariate(1 / self.mean), self.mean * 5)
+
+
+class LoadStats:
+    """Thread-safe latencies of the steps run by the virtual users."""
+
+    def __init__(self):
+        self.latencies = {}  # Step name -> latencies in seconds, in completion order
+        self.user_latencies = {}  # (step name, login name) -> latencies in seconds, in completion order
+        self.errors = {}  # Step name -> failed runs
+        self.iterations = 0
+        self.failed_iterations = 0
+        self.peak_users = 0
+        self.duration = 0.0
+        self._window = deque()  # (completion time, step name, latency, ok) of the latest steps
+        self._lock = threading.Lock()
+
+    def record(self, step, latency, ok=True, user=None):
+        now = time.perf_counter()
+        with self._lock:
+            if ok:
+                self.latencies.setdefault(step, []).append(latency)
+                self.user_latencies.setdefault((step, user), []).append(latency)
+            else:
+                self.errors[step] = self.errors.get(step, 0) + 1
+            self._window.append((now, step, latency, ok))
+
+    def iteration_done(self, ok=True):
+        with self._lock:
+            self.iterations += 1
+            self.failed_iterations += 0 if ok else 1
+            self._window.append((time.perf_counter(), None, 0.0, ok))
+
+    def window_report(self, seconds, elapsed, users) -> str:
+        """Returns one live report line over the steps completed in the last `seconds`."""
+        now = time.perf_counter()
+        with self._lock:
+            while self._window and self._window[0][0] < now - seconds:
+                self._window.popleft()
+            entries = list(self._window)
+        flows = sum(1 for _, step, _, _ in entries if step is None)
+        steps = [entry for entry in entries if entry[1] is not None]
+        latencies = sorted(latency for _, _, latency, ok in steps if ok)
+        errors = sum(1 for _, _, _, ok in steps if not ok)
+        span = min(seconds, elapsed) or seconds
+        line = (f"{elapsed:6.1f}s {users:3d} users | {flows / span:5.2f} flows/s {len(steps) / span:6.2f} steps/s | "
+                f"{errors} errors")
+        if latencies:
+            line += (f" | step latency p50 {percentile(latencies, 0.5):.3f}s p90 {percentile(latencies, 0.9):.3f}s "
+                     f"p99 {percentile(latencies, 0.99):.3f}s")
+        return line
+
+    def summary_lines(self) -> list:
+        """Returns the per-step throughput and latency table of the whole run."""
+        duration = self.duration or 1e-9
+        lines = [f"{self.iterations} flows in {self.duration:.1f}s ({self.iterations / duration:.2f}/s), "
+                 f"{self.failed_iterations} failed, peak {self.peak_users} virtual users"]
+        for step in list(dict.fromkeys(list(self.latencies) + list(self.errors))):
+            latencies = sorted(self.latencies.get(step, []))
+            count, errors = len(latencies), self.errors.get(step, 0)
+            line = f"  {step}: {count} ok, {errors} errors, {count / duration:.2f}/s"
+            if latencies:
+                line += (f", p50 {percentile(latencies, 0.5):.3f}s p90 {percentile(latencies, 0.9):.3f}s "
+                         f"p99 {percentile(latencies, 0.99):.3f}s max {latencies[-1]:.3f}s")
+            lines.append(line)
+        return lines
+
+    def step_percentile(self, step, fraction, user=None) -> float:
+        """Returns a percentile of a step's latencies, of every virtual user or of those logged in as `user`."""
+        with self._lock:
+            latencies = self.latencies.get(step, []) if user is None else self.user_latencies.get((step, user), [])
+            return percentile(sorted(latencies), fraction)
+
+    def error_rate(self) -> float:
+        return self.failed_iterations / self.iterations if self.iterations else 0.0
+
+
+class VirtualUser:
+    """State of one simulated shopper, handed to the flow on every iteration."""
+
+    def __init__(self, number, user, driver, runner):
+        """
+        :param number: Virtual user number, from 1.
+        :param user: Login name the virtual user shops as.
+        :param driver: WebDriver leased for the virtual user's whole life.
+        :param runner: LoadRunner running the virtual user.
+        """
+        self.number = number
+        self.user = user
+        self.driver = driver
+        self.iteration = 0
+        self._runner = runner
+        self._stop = threading.Event()
+
+    @contextmanager
+    def step(self, name):
+        """Times the actions run inside the with block as one step of the flow."""
+        start = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            self._runner.stats.record(name, time.perf_counter() - start, ok=False, user=self.user)
+            raise
+        self._runner.stats.record(name, time.perf_counter() - start, user=self.user)
+
+    def think(self):
+        """Pauses like a shopper between two steps, cut short when the virtual user is stopped."""
+        self._stop.wait(self._runner.think_time.sample())
+
+    @property
+    def stopping(self) -> bool:
+        return self._stop.is_set()
+
+    def stop(self):
+        """Lets the virtual user finish its current flow, then end."""
+        self._stop.set()
+
+
+class LoadRunner:
+    """Runs a scripted flow with many concurrent virtual users, following a staged load profile.
+
+    Every virtual user leases its own browser from a DriverPool and repeats the flow (built from the page
+    objects, with vu.step() around the timed steps and vu.think() between them) until the profile lowers
+    the number of users, in which case the newest users end after their current flow. Throughput and step
+    latency percentiles over the last report interval are reported live.
+    """
+
+    TICK = 0.1  # Seconds between two checks of the load profile
+
+    def __init__(self, driver_pool, flow, stages, think_time=None, users=('standard_user',), report_interval=5,
+                 on_report=None):
+        """
+        :param driver_pool: DriverPool with at least as many drivers as the profile's peak number of users.
+        :param flow: Callable taking a VirtualUser and running one iteration of the scripted flow.
+        :param stages: List of Stage, see parse_stages.
+        :param think_time: ThinkTime between steps, defaults to no pause.
+        :param users: Login names, assigned to the virtual users in turn.
+        :param report_interval: Seconds between two live reports.
+        :param on_report: Callable receiving each live report line, defaults to the module logger.
+        """
+        self.driver_pool = driver_pool
+        self.flow = flow
+        self.stages = stages
+        self.think_time = think_time or ThinkTime(0, 'constant')
+        self.users = list(users)
+        self.report_interval = report_interval
+        self.on_report = on_report or logger.info
+        self.stats = LoadStats()
+        self.reports = []
+
+    def run(self) -> LoadStats:
+        """Runs the whole load profile and returns its statistics."""
+        peak = max((stage.users for stage in self.stages), default=0)
+        total = sum(stage.duration for stage in self.stages)
+        self.stats = LoadStats()
+        active = []  # (VirtualUser, Future), oldest first
+        started = 0
+        start = time.perf_counter()
+        next_report = start + self.report_interval
+
+        with ThreadPoolExecutor(max_workers=max(peak, 1), thread_name_prefix='vu') as executor:
+            while True:
+                elapsed = time.perf_counter() - start
+                if elapsed >= total:
+                    break
+                active = [(vu, future) for vu, future in active if not future.done()]
+                running = [vu for vu, _ in active if not vu.stopping]
+                target = target_users(self.stages, elapsed)
+                for _ in range(target - len(running)):
+                    started += 1
+                    vu = VirtualUser(started, self.users[(started - 1) % len(self.users)], None, self)
+                    active.append((vu, executor.submit(self._virtual_user, vu)))
+                # Ramp-down stops the newest users first
+                for vu in list(reversed(running))[:max(0, len(running) - target)]:
+                    vu.stop()
+                self.stats.peak_users = max(self.stats.peak_users, len(active))
+
+                if time.perf_counter() >= next_report:
+                    self._report(elapsed, len(active))
+                    next_report += self.report_interval
+                time.sleep(self.TICK)
+
+            for vu, _ in active:
+                vu.stop()
+        self.stats.duration = time.perf_counter() - start
+        self._report(self.stats.duration, 0)
+        return self.stats
+
+    def _report(self, elapsed, users):
+        line = self.stats.window_report(self.report_interval, elapsed, users)
+        self.reports.append(line)
+        self.on_report(line)
+
+    def _virtual_user(self, vu):
+        try:
+            vu.driver = self.driver_pool.lease()
+        except Exception as e:
+            logger.error(f"Virtual user {vu.number} could not get a browser: {e}")
+            self.stats.record('lease', 0.0, ok=False)
+            return
+        try:
+            while not vu.stopping:
+                vu.iteration += 1
+                try:
+                    self.flow(vu)
+                    self.stats.iteration_done()
+                except Exception as e:
+                    logger.warning(f"Virtual user {vu.number} ({vu.user}) flow {vu.iteration} failed: {e}")
+                    self.stats.iteration_done(ok=False)
+                    # The page is in an unknown state, start the next flow from the base URL
+                    try:
+                        self.driver_pool.reset_driver(vu.driver)
+                    except Exception as reset_error:
+                        logger.error(f"Virtual user {vu.number} lost its browser: {reset_error}")
+                        break
+        finally:
+            self.driver_pool.release(vu.driver)
@@ -0,0 +1,224 @@
+import json
+import logging
+import os
+import queue
+import sys
+import threading
+from collections import deque
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
+
+from Utils.Parallel import worker_file_path, worker_id
+
+TEXT_FORMAT = '%(asctime)s :%(levelname)s : %(name)s : %(message)s'
+
+
+class JsonFormatter(logging.Formatter):
+    """Formats records as one JSON object per line, starting with the timestamp so worker logs can be merged."""
+
+    def format(self, record):
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'test': getattr(record, 'test_node', None),
+            'worker': worker_id(),
+            'message': record.getMessage(),
+        }
+        return json.dumps(entry)
+
+
+class _TestQueueHandler(QueueHandler):
+    """Queue handler that tags records with the running test before they leave the test's thread."""
+
+    def prepare(self, record):
+        node = os.environ.get('PYTEST_CURRENT_TEST')
+        record.test_node = node.rsplit(' (', 1)[0] if node else None
+        return super().prepare(record)
+
+
+class _CaptureHandler(logging.Handler):
+    """Keeps the records of the running test in a bounded ring instead of writing them."""
+
+    def __init__(self, size):
+        super().__init__()
+        self.records = deque(maxlen=size)
+        self.total = 0
+        self.dropped_bytes = 0
+
+    def emit(self, record):
+        node = os.environ.get('PYTEST_CURRENT_TEST')
+        record.test_node = node.rsplit(' (', 1)[0] if node else None
+        # Freeze the message now, the arguments may change before the test ends
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.exc_info = None
+        if len(self.records) == self.records.maxlen:
+            self.dropped_bytes += len(self.format(self.records[0])) + 1
+        self.records.append(record)
+        self.total += 1
+
+    def reset(self):
+        self.records.clear()
+        self.total = 0
+        self.dropped_bytes = 0
+
+
+class LogManager:
+    """Hands out cached loggers that write to the log file through a background thread.
+
+    One logger is created per test node (taken from PYTEST_CURRENT_TEST, no stack inspection) and reused for
+    the rest of the run. All loggers share a single QueueHandler, the file is written by a QueueListener
+    thread that owns the only RotatingFileHandler of the process. In a parallel run every worker writes its
+    own file (see Utils.Parallel.worker_file_path), which the controller merges at the end of the run.
+
+    In capture mode the records of each test are kept in a bounded in-memory ring instead. They are written
+    to the log file only when the test fails (see end_test), a passing test leaves a single summary line.
+    """
+
+    def __init__(self, log_file, json_format=False, max_bytes=10 * 1024 * 1024, backup_count=5):
+        """
+        :param log_file: Path of the shared log file.
+        :param json_format: Write one JSON object per line instead of text lines.
+        :param max_bytes: Size at which the log file is rotated.
+        :param backup_count: Number of rotated files kept.
+        """
+        self.log_file = log_file
+        self.json_format = json_format
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+
+        self.capture_size = 0
+
+        self._loggers = {}
+        self._lock = threading.Lock()
+        self._queue_handler = None
+        self._capture_handler = None
+        self._listener = None
+
+        self.capture_stats = {'tests': 0, 'flushed_tests': 0, 'records': 0, 'dropped_records': 0,
+                              'saved_bytes': 0}
+
+    def configure(self, json_format=None, capture_size=None):
+        """Changes the line format or the capture mode, restarting the background writer if it is running.
+
+        :param json_format: Write one JSON object per line instead of text lines.
+        :param capture_size: Records kept per test in capture mode, 0 writes every record right away.
+        """
+        if json_format is not None:
+            self.json_format = json_format
+        if capture_size is not None:
+            self.capture_size = max(0, int(capture_size))
+        if self._listener is not None:
+            self.shutdown()
+            self._start()
+
+    def get_logger(self, name=None, depth=1) -> logging.Logger:
+        """Returns the logger of the running test, creating it on first use.
+
+        :param name: Logger name used outside of a test, defaults to the calling function's name.
+        :param depth: Frames between the caller to name the logger after and this method.
+        :return: Configured logger instance.
+        """
+        node = os.environ.get('PYTEST_CURRENT_TEST')
+        key = node.rsplit(' (', 1)[0] if node else name or sys._getframe(depth).f_code.co_name
+        logger = self._loggers.get(key)
+        if logger is not None:
+            return logger
+
+        with self._lock:
+            if self._listener is None:
+                self._start()
+            # 'path/test_file.py::TestClass::test_name[params]' -> 'test_name[params]'
+            logger = logging.getLogger(key.rsplit('::', 1)[-1])
+            handler = self._capture_handler or self._queue_handler
+            if handler not in logger.handlers:
+                logger.addHandler(handler)
+            logger.setLevel(logging.DEBUG)
+            self._loggers[key] = logger
+        return logger
+
+    def shutdown(self):
+        """Writes the queued records, closes the log file and detaches the cached loggers."""
+        with self._lock:
+            if self._listener is None:
+                return
+            self._listener.stop()
+            for handler in self._listener.handlers:
+                handler.close()
+            for logger in self._loggers.values():
+                logger.removeHandler(self._capture_handler or self._queue_handler)
+            self._loggers.clear()
+            self._listener = None
+            self._queue_handler = None
+            self._capture_handler = None
+
+    def begin_test(self):
+        """Starts capturing the records of a new test (capture mode only)."""
+        if self._capture_handler is not None:
+            self._capture_handler.reset()
+
+    def end_test(self, keep) -> str:
+        """Ends the capture of the running test.
+
+        A kept capture is written to the log file and returned for the test report. Otherwise the records are
+        dropped and one summary line is written instead, the size of the dropped lines counts as saved I/O.
+
+        :param keep: True when the test failed or was expected to fail.
+        :return: The captured lines when kept, otherwise None (also outside of capture mode).
+        """
+        handler = self._capture_handler
+        if handler is None or not handler.total:
+            return None
+        records = list(handler.records)
+        dropped, dropped_bytes = handler.total - len(records), handler.dropped_bytes
+        handler.reset()
+
+        formatter = handler.formatter
+        lines = [formatter.format(record) for record in records]
+        stats = self.capture_stats
+        stats['tests'] += 1
+        stats['records'] += len(records)
+        stats['dropped_records'] += dropped
+
+        if keep:
+            stats['flushed_tests'] += 1
+            for record in records:
+                self._queue_handler.handle(record)
+            header = f"{dropped} earlier records dropped by the capture buffer\n" if dropped else ""
+            return header + "\n".join(lines)
+
+        captured_bytes = sum(len(line) + 1 for line in lines) + dropped_bytes
+        summary = logging.LogRecord(records[-1].name, logging.INFO, __file__, 0,
+                                    f"Passed, {len(records) + dropped} log records captured and not written "
+                                    f"({captured_bytes} bytes)", None, None)
+        self._queue_handler.handle(summary)
+        stats['saved_bytes'] += captured_bytes - len(formatter.format(summary)) - 1
+        return None
+
+    def capture_report(self):
+        """Returns the capture mode lines for the end-of-run summary."""
+        stats = self.capture_stats
+        return [
+            f"{stats['tests']} tests captured (buffer of {self.capture_size} records), "
+            f"{stats['flushed_tests']} written out on failure or xfail, "
+            f"{stats['records']} records kept in memory, {stats['dropped_records']} dropped by the buffer",
+            f"{stats['saved_bytes'] / 1024:.1f} KB of log I/O saved",
+        ]
+
+    def _start(self):
+        log_path = worker_file_path(self.log_file)
+        os.makedirs(os.path.dirname(log_path) or '.', exist_ok=True)
+        file_handler = RotatingFileHandler(log_path, maxBytes=self.max_bytes, backupCount=self.backup_count,
+                                           encoding='utf-8')
+        file_handler.setFormatter(JsonFormatter() if self.json_format else logging.Formatter(TEXT_FORMAT))
+
+        records = queue.SimpleQueue()
+        self._queue_handler = _TestQueueHandler(records)
+        self._capture_handler = None
+        if self.capture_size:
+            self._capture_handler = _CaptureHandler(self.capture_size)
+            self._capture_handler.setFormatter(file_handler.formatter)
+        self._listener = QueueListener(records, file_handler, respect_handler_level=True)
+        self._listener.start()
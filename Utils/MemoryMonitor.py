@@ -0,0 +1,144 @@
+import logging
+
+from Utils.CommandProfiler import framework_commands
+from Utils.DevTools import execute_cdp, supports_cdp
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Performance.getMetrics name -> MemorySample attribute
+METRICS = {'JSHeapUsedSize': 'heap_used', 'JSHeapTotalSize': 'heap_total', 'Nodes': 'nodes',
+           'JSEventListeners': 'listeners', 'Documents': 'documents'}
+
+
+class MemorySample:
+    """Memory of the page at one point of a test, from the DevTools Performance.getMetrics command."""
+
+    def __init__(self, label, metrics):
+        """
+        :param label: Where the sample was taken, e.g. 'ProductsPage' or 'test end'.
+        :param metrics: Performance.getMetrics values by metric name.
+        """
+        self.label = label
+        for name, attribute in METRICS.items():
+            setattr(self, attribute, int(metrics.get(name, 0)))
+
+    def row(self) -> str:
+        return (f"{self.label:<24} {self.heap_used / MB:9.2f} MB {self.heap_total / MB:9.2f} MB "
+                f"{self.nodes:7d} {self.listeners:9d} {self.documents:9d}")
+
+
+def monotonic_growth(values, runs):
+    """Returns how much the last `runs` values grew when each is higher than the one before, else None.
+
+    :param values: Values in the order they were measured.
+    :param runs: Number of consecutive values that must all grow.
+    """
+    tail = values[-runs:]
+    if runs < 2 or len(tail) < runs or any(b <= a for a, b in zip(tail, tail[1:])):
+        return None
+    return tail[-1] - tail[0]
+
+
+class MemoryMonitor:
+    """Samples the page's JS heap, DOM nodes and event listeners while tests run on reused drivers.
+
+    Samples are taken whenever a page object is constructed (BaseClass subclasses call page_constructed) and
+    at the end of every test, after a garbage collection. A test is flagged when its heap grew by more than
+    the budget from its first to its last sample. Leaks across tests are found from the end-of-test samples
+    of each driver session: the heap, node or listener count growing at every one of the last `leak_runs`
+    tests. Only Chromium browsers are sampled, others are skipped.
+    """
+
+    def __init__(self, budget_mb=10.0, leak_runs=5):
+        """
+        :param budget_mb: Largest heap growth within one test, in MB, before the test is flagged.
+        :param leak_runs: Number of consecutive tests a metric must grow in to be reported as a leak.
+        """
+        self.budget_mb = budget_mb
+        self.leak_runs = leak_runs
+        self.samples = []  # Samples of the running test
+        self.test_name = None
+        self.over_budget = []  # (test name, heap delta in MB)
+        self.leaks = {}  # (driver session, metric) -> report line, latest one wins
+        self.tests = 0
+        self.heap_delta_mb = 0.0  # Of the last finished test
+        self._enabled_sessions = set()
+        self._session_ends = {}  # Driver session id -> end-of-test samples, oldest first
+
+    def start_test(self, name):
+        self.samples = []
+        self.test_name = name
+
+    def page_constructed(self, page):
+        """Samples the page when a page object is created, called from BaseClass."""
+        driver = getattr(page, '_driver', None)
+        if self.test_name is not None and driver is not None:
+            self.sample(driver, type(page).__name__)
+
+    def sample(self, driver, label, collect_garbage=False):
+        """Samples the memory of the driver's current page.
+
+        :param driver: WebDriver of the test.
+        :param label: Where the sample is taken.
+        :param collect_garbage: Run a full garbage collection first, so the heap holds only live objects.
+        :return: The MemorySample, None for browsers without DevTools or when the page can't be read.
+        """
+        if not supports_cdp(driver):
+            return None
+        try:
+            with framework_commands():
+                if driver.session_id not in self._enabled_sessions:
+                    execute_cdp(driver, 'Performance.enable')
+                    self._enabled_sessions.add(driver.session_id)
+                if collect_garbage:
+                    execute_cdp(driver, 'HeapProfiler.collectGarbage')
+                metrics = execute_cdp(driver, 'Performance.getMetrics')['metrics']
+        except Exception as e:
+            logger.debug(f"Could not sample the memory at {label}: {e}")
+            return None
+        sample = MemorySample(label, {metric['name']: metric['value'] for metric in metrics})
+        self.samples.append(sample)
+        return sample
+
+    def finish_test(self, driver):
+        """Takes the end-of-test sample and checks the budget and the growth across the driver's tests.
+
+        :param driver: WebDriver of the test, None when the test had none.
+        :return: Report text of the test's samples, None when nothing was sampled.
+        """
+        name, self.test_name = self.test_name, None
+        end = self.sample(driver, 'test end (after GC)', collect_garbage=True) if driver is not None else None
+        if end is None:
+            return None
+        self.tests += 1
+
+        delta_mb = self.heap_delta_mb = (end.heap_used - self.samples[0].heap_used) / MB
+        lines = [f"{'sample':<24} {'heap used':>12} {'heap total':>12} {'nodes':>7} {'listeners':>9} "
+                 f"{'documents':>9}"] + [sample.row() for sample in self.samples]
+        lines.append(f"Heap delta {delta_mb:+.2f} MB (budget {self.budget_mb:g} MB)")
+        if delta_mb > self.budget_mb:
+            self.over_budget.append((name, delta_mb))
+            lines.append("Over budget")
+            logger.warning(f"{name}: heap grew by {delta_mb:.2f} MB, over the {self.budget_mb:g} MB budget")
+
+        ends = self._session_ends.setdefault(driver.session_id, [])
+        ends.append(end)
+        for attribute in ('heap_used', 'nodes', 'listeners'):
+            growth = monotonic_growth([getattr(sample, attribute) for sample in ends], self.leak_runs)
+            if growth is not None:
+                amount = f"{growth / MB:.2f} MB" if attribute == 'heap_used' else str(growth)
+                line = (f"{attribute} grew at each of the last {self.leak_runs} tests on driver "
+                        f"{driver.session_id[:8]} (+{amount}), latest {name}")
+                self.leaks[(driver.session_id, attribute)] = line
+                lines.append(f"Possible leak: {line}")
+        return "\n".join(lines)
+
+    def report(self) -> list:
+        """Returns the end-of-run report lines."""
+        lines = [f"{self.tests} tests sampled, {len(self.over_budget)} over the {self.budget_mb:g} MB heap budget, "
+                 f"{len(self.leaks)} possible leaks"]
+        lines += [f"  over budget: {name} {delta:+.2f} MB" for name, delta in self.over_budget]
+        lines += [f"  possible leak: {line}" for line in self.leaks.values()]
+        return lines
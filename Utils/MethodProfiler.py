@@ -0,0 +1,135 @@
+import functools
+import inspect
+import threading
+import time
+
+import allure
+
+from Utils.BaseClass import BaseClass
+
+# BaseClass's wait primitives, timed as part of the page object methods calling them instead of on their own
+WAIT_PRIMITIVES = frozenset({'timeout_for', 'wait_until', 'find', 'find_all', 'is_present', 'is_displayed'})
+
+
+class MethodStats:
+    """Calls, latency and exceptions of one page object method."""
+
+    def __init__(self):
+        self.durations = []
+        self.errors = {}  # Exception class name -> count
+
+    @property
+    def calls(self) -> int:
+        return len(self.durations)
+
+    @property
+    def total(self) -> float:
+        return sum(self.durations)
+
+    def percentile(self, share) -> float:
+        ordered = sorted(self.durations)
+        return ordered[min(len(ordered) - 1, int(share * len(ordered)))] if ordered else 0.0
+
+
+class MethodProfiler:
+    """Times every public method of the page objects and reports the hot paths of the suite.
+
+    Page objects are the BaseClass subclasses defining their own __init__ (test classes never do). Their public
+    methods, and the public ones they inherit from BaseClass (navigation, reset, verify helpers; not the wait
+    primitives), are replaced by wrappers only once a profiler exists, so nothing is wrapped when profiling is off.
+    Each call is timed, counted per method together with the exceptions it raised, and shown as an allure step.
+    Calls from page object methods to other public ones are nested steps, and their time counts in both.
+    """
+
+    def __init__(self, allure_steps=True, top=15):
+        """
+        :param allure_steps: Show every call as an allure step (the step holds its duration).
+        :param top: Number of methods listed by hot_paths.
+        """
+        self.allure_steps = allure_steps
+        self.top = top
+        self.stats = {}  # 'Class.method' -> MethodStats
+        self._lock = threading.Lock()
+
+    def instrument(self, cls):
+        """Wraps the public methods defined by the class itself and those it inherits from BaseClass.
+
+        Methods inherited from another page object are wrapped on that class. BaseClass is never wrapped itself,
+        its methods are wrapped again on every page object, so their calls are attributed to the page object
+        (e.g. 'ProductsPage.click_shopping_cart').
+
+        :param cls: Page object class.
+        """
+        for name, function in list(vars(cls).items()):
+            if self._is_public(name, function):
+                setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", function))
+        for name, function in vars(BaseClass).items():
+            if not self._is_public(name, function) or name in WAIT_PRIMITIVES or name in vars(cls):
+                continue
+            # Not overridden by a page object between the class and BaseClass
+            if inspect.unwrap(getattr(cls, name)) is function:
+                setattr(cls, name, self._wrap(f"{cls.__name__}.{name}", function))
+
+    @staticmethod
+    def _is_public(name, function) -> bool:
+        return not name.startswith('_') and inspect.isfunction(function) and not hasattr(function, '__profiled__')
+
+    def instrument_subclasses(self, base):
+        """Wraps the page objects already defined, those defined later are wrapped by BaseClass.__init_subclass__.
+
+        :param base: BaseClass.
+        """
+        for cls in base.__subclasses__():
+            if '__init__' in vars(cls):
+                self.instrument(cls)
+            self.instrument_subclasses(cls)
+
+    def _wrap(self, title, function):
+        @functools.wraps(function)
+        def profiled(*args, **kwargs):
+            start = time.perf_counter()
+            error = None
+            try:
+                if self.allure_steps:
+                    with allure.step(title):
+                        return function(*args, **kwargs)
+                return function(*args, **kwargs)
+            except BaseException as e:
+                error = type(e).__name__
+                raise
+            finally:
+                self.record(title, time.perf_counter() - start, error)
+
+        profiled.__profiled__ = True
+        return profiled
+
+    def record(self, title, seconds, error=None):
+        """Adds a call to the statistics of a method.
+
+        :param title: 'Class.method'.
+        :param seconds: Duration of the call.
+        :param error: Name of the exception class the call raised, None when it returned.
+        """
+        with self._lock:
+            stats = self.stats.setdefault(title, MethodStats())
+            stats.durations.append(seconds)
+            if error is not None:
+                stats.errors[error] = stats.errors.get(error, 0) + 1
+
+    def hot_paths(self, limit=None) -> list:
+        """Returns the report lines of the methods that took the most time over the run, slowest first.
+
+        :param limit: Number of methods listed, defaults to `top`.
+        """
+        limit = limit or self.top
+        with self._lock:
+            ranked = sorted(self.stats.items(), key=lambda item: item[1].total, reverse=True)
+        lines = [f"{'method':<48} {'calls':>6} {'total':>9} {'mean':>8} {'p90':>8} {'max':>8}  errors"]
+        for title, stats in ranked[:limit]:
+            errors = ', '.join(f"{name} x{count}" for name, count in sorted(stats.errors.items()))
+            lines.append(f"{title:<48} {stats.calls:>6} {stats.total:>8.2f}s {stats.total / stats.calls:>7.3f}s "
+                         f"{stats.percentile(0.9):>7.3f}s {max(stats.durations):>7.3f}s  {errors or '-'}")
+        calls = sum(stats.calls for _, stats in ranked)
+        lines.append(f"{calls} calls of {len(ranked)} page object methods"
+                     + (f", {len(ranked) - limit} more not listed" if len(ranked) > limit else ""))
+        return lines
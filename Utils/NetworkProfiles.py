@@ -0,0 +1,77 @@
+import re
+
+from Utils.DevTools import execute_cdp
+
+
+class NetworkProfile:
+    """Network conditions emulated in the browser through the DevTools Protocol."""
+
+    def __init__(self, name, latency=0, download=-1, upload=-1, offline=False):
+        """
+        :param name: Profile name, recorded with the results.
+        :param latency: Added round trip time in milliseconds.
+        :param download: Download throughput in kbit/s, -1 for no limit.
+        :param upload: Upload throughput in kbit/s, -1 for no limit.
+        :param offline: When True, every request fails as if the network was down.
+        """
+        self.name = name
+        self.latency = latency
+        self.download = download
+        self.upload = upload
+        self.offline = offline
+
+    @property
+    def emulated(self) -> bool:
+        """False for the 'none' profile, which leaves the runner's network as it is."""
+        return self.offline or self.latency > 0 or self.download >= 0 or self.upload >= 0
+
+    def conditions(self) -> dict:
+        """Returns the parameters of Network.emulateNetworkConditions (throughputs in bytes/s)."""
+        return {
+            'offline': self.offline,
+            'latency': self.latency,
+            'downloadThroughput': self.download * 1000 / 8 if self.download >= 0 else -1,
+            'uploadThroughput': self.upload * 1000 / 8 if self.upload >= 0 else -1,
+        }
+
+    def __repr__(self):
+        if self.offline:
+            return f"NetworkProfile({self.name}: offline)"
+        return f"NetworkProfile({self.name}: {self.latency}ms, down {self.download}kbps, up {self.upload}kbps)"
+
+
+# Named profiles, throughputs in kbit/s (the usual WebPageTest connectivity presets)
+NETWORK_PROFILES = {
+    'none': NetworkProfile('none'),
+    'offline': NetworkProfile('offline', offline=True),
+    '3g': NetworkProfile('3g', latency=300, download=1600, upload=768),
+    '4g': NetworkProfile('4g', latency=150, download=9000, upload=9000),
+    'lan': NetworkProfile('lan', latency=2, download=100000, upload=100000),
+}
+
+
+def get_network_profile(name) -> NetworkProfile:
+    """Returns a named profile, or a custom one for 'custom:<latency ms>:<download kbps>[:<upload kbps>]'.
+
+    :param name: Profile name, see NETWORK_PROFILES.
+    :raises ValueError: If the name is neither a known nor a valid custom profile.
+    """
+    if name.lower() in NETWORK_PROFILES:
+        return NETWORK_PROFILES[name.lower()]
+    match = re.fullmatch(r'custom:(\d+):(\d+)(?::(\d+))?', name)
+    if not match:
+        raise ValueError(f"Unknown network profile '{name}', expected one of {', '.join(NETWORK_PROFILES)} "
+                         f"or 'custom:<latency ms>:<download kbps>[:<upload kbps>]'")
+    latency, download, upload = match.groups()
+    return NetworkProfile(name, int(latency), int(download), int(upload or download))
+
+
+def apply_network_profile(driver, profile):
+    """Emulates the profile's network conditions in the driver's browser until another profile is applied.
+
+    :param driver: WebDriver of a Chromium browser.
+    :param profile: NetworkProfile, NETWORK_PROFILES['none'] lifts the emulation.
+    :raises DevToolsUnsupported: If the browser doesn't speak CDP.
+    """
+    execute_cdp(driver, 'Network.enable')
+    execute_cdp(driver, 'Network.emulateNetworkConditions', profile.conditions())
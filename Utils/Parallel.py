@@ -0,0 +1,128 @@
+import glob
+import os
+import re
+import time
+
+# Timestamp prefix written by the log formatters ('%(asctime)s :...' or '{"time": "<asctime>", ...')
+_LOG_TIMESTAMP = re.compile(r'^(?:\{"time": ")?(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2},\d{3})[ "]')
+
+
+def worker_id() -> str:
+    """Returns the pytest-xdist worker id of the current process ('gw0', 'gw1', ...) or 'master'."""
+    return os.environ.get("PYTEST_XDIST_WORKER", "master")
+
+
+def is_xdist_worker(config) -> bool:
+    """Returns True when running inside a pytest-xdist worker process.
+
+    :param config: The pytest configuration object.
+    """
+    return hasattr(config, "workerinput")
+
+
+def worker_file_path(path) -> str:
+    """Returns the per-worker variant of a shared output file ('Logs/logfile.log' -> 'Logs/logfile_gw0.log').
+
+    Outside of a parallel run the path is returned unchanged.
+
+    :param path: Path of the shared file.
+    """
+    worker = worker_id()
+    if worker == "master":
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}_{worker}{ext}"
+
+
+class FileLock:
+    """Cross-process lock based on exclusive creation of a lock file.
+
+    Works the same on Windows and Linux and needs no third-party package. A lock file older than
+    `stale_after` seconds is considered left over by a killed process and is removed.
+    """
+
+    def __init__(self, path, timeout=30, stale_after=60, poll_interval=0.05):
+        """
+        :param path: Path of the lock file.
+        :param timeout: Seconds to wait for the lock before raising TimeoutError.
+        :param stale_after: Age in seconds after which an existing lock file is broken.
+        :param poll_interval: Seconds between acquisition attempts.
+        """
+        self.path = path
+        self.timeout = timeout
+        self.stale_after = stale_after
+        self.poll_interval = poll_interval
+        self._fd = None
+
+    def acquire(self):
+        deadline = time.monotonic() + self.timeout
+        while True:
+            try:
+                self._fd = os.open(self.path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+                os.write(self._fd, str(os.getpid()).encode())
+                return
+            except FileExistsError:
+                self._break_if_stale()
+                if time.monotonic() > deadline:
+                    raise TimeoutError(f"Could not acquire lock {self.path} within {self.timeout} seconds")
+                time.sleep(self.poll_interval)
+
+    def release(self):
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+            try:
+                os.remove(self.path)
+            except FileNotFoundError:
+                pass
+
+    def _break_if_stale(self):
+        try:
+            if time.time() - os.path.getmtime(self.path) > self.stale_after:
+                os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.release()
+
+
+def merge_worker_logs(log_path):
+    """Merges the per-worker log files of a parallel run into the shared log file.
+
+    Records are ordered by their timestamp. Lines without a timestamp (tracebacks, multi-line messages)
+    stay attached to the record they belong to. The worker files are removed after merging.
+
+    :param log_path: Path of the shared log file (e.g. 'Logs/logfile.log').
+    :return: Number of merged worker files.
+    """
+    root, ext = os.path.splitext(log_path)
+    # Include rotated backups ('logfile_gw0.log.1'), their records are ordered by timestamp below
+    worker_files = sorted(glob.glob(f"{root}_gw*{ext}*"))
+    if not worker_files:
+        return 0
+
+    records = []
+    for path in worker_files:
+        with open(path, "r", encoding="utf-8", errors="replace") as file:
+            for line in file:
+                timestamp = _LOG_TIMESTAMP.match(line)
+                if timestamp or not records:
+                    records.append([timestamp.group(1) if timestamp else "", line])
+                else:
+                    records[-1][1] += line
+
+    # Stable sort keeps the order of records that share a timestamp
+    records.sort(key=lambda record: record[0])
+
+    os.makedirs(os.path.dirname(log_path) or ".", exist_ok=True)
+    with open(log_path, "a", encoding="utf-8") as file:
+        file.writelines(record[1] for record in records)
+
+    for path in worker_files:
+        os.remove(path)
+    return len(worker_files)
@@ -0,0 +1,267 @@
+import math
+import random
+import statistics
+import time
+from html import escape
+
+import allure
+
+from Utils.PerfHistory import trend_svg
+
+
+def percentile(sorted_values, fraction):
+    """Linear interpolation percentile of an already sorted list.
+
+    :param sorted_values: Sorted samples.
+    :param fraction: Percentile as a fraction, e.g. 0.9 for p90.
+    """
+    if not sorted_values:
+        return math.nan
+    position = (len(sorted_values) - 1) * fraction
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+
+class PerfStats:
+    """Statistics of the samples of one measured action, in seconds.
+
+    Outliers are only left out of the mean, the standard deviation and the mean's interval. The percentiles
+    (and check) use every timed sample, so slow iterations still count against a p90 or p99 budget.
+    """
+
+    PERCENTILES = {'p50': 0.5, 'p90': 0.9, 'p99': 0.99}
+
+    def __init__(self, name, samples, outliers, confidence=0.95, resamples=2000):
+        """
+        :param name: Name of the measured action.
+        :param samples: Samples kept after outlier rejection, in seconds.
+        :param outliers: Samples rejected as outliers, in seconds, still part of the percentiles.
+        :param confidence: Confidence level of the intervals.
+        :param resamples: Bootstrap resamples used for the confidence intervals.
+        """
+        self.name = name
+        self.samples = sorted(samples)
+        self.outliers = sorted(outliers)
+        self.all_samples = sorted(self.samples + self.outliers)
+        self.confidence = confidence
+        self.comparison = None  # Comparison with the perf history, set by PerfHarness.run
+        self.series = None  # (action name without conditions, user), set by PerfHarness.run
+
+        self.mean = statistics.fmean(self.samples) if self.samples else math.nan
+        self.stdev = statistics.stdev(self.samples) if len(self.samples) > 1 else 0.0
+        for key, fraction in self.PERCENTILES.items():
+            setattr(self, key, percentile(self.all_samples, fraction))
+
+        # Percentile bootstrap, seeded so a report can be reproduced from its samples
+        rng = random.Random(len(self.samples))
+        means, p90s = [], []
+        for _ in range(resamples if len(self.samples) > 1 else 0):
+            means.append(statistics.fmean(rng.choices(self.samples, k=len(self.samples))))
+        for _ in range(resamples if len(self.all_samples) > 1 else 0):
+            p90s.append(percentile(sorted(rng.choices(self.all_samples, k=len(self.all_samples))), 0.9))
+        tail = (1 - confidence) / 2
+        self.mean_ci = self._interval(means, tail, self.mean)
+        self.p90_ci = self._interval(p90s, tail, self.p90)
+
+    @staticmethod
+    def _interval(values, tail, default):
+        if not values:
+            return default, default
+        values.sort()
+        return percentile(values, tail), percentile(values, 1 - tail)
+
+    def check(self, **limits):
+        """Compares percentiles (of every sample) or the mean (without the outliers) with limits in seconds.
+
+        :param limits: Statistic name -> highest allowed value, e.g. p90=3, p99=5.
+        :return: List of failure messages, empty when every limit is met.
+        """
+        failures = []
+        for key, limit in limits.items():
+            value = getattr(self, key)
+            if value > limit:
+                failures.append(f"{self.name}: {key} {value:.3f}s exceeds {limit}s")
+        return failures
+
+    def summary(self) -> str:
+        level = f"{self.confidence * 100:.0f}%"
+        return (f"{self.name}: n={len(self.all_samples)} ({len(self.outliers)} outliers left out of the mean), "
+                f"mean {self.mean:.3f}s [{level} CI {self.mean_ci[0]:.3f}-{self.mean_ci[1]:.3f}], "
+                f"stdev {self.stdev:.3f}s, p50 {self.p50:.3f}s, "
+                f"p90 {self.p90:.3f}s [{level} CI {self.p90_ci[0]:.3f}-{self.p90_ci[1]:.3f}], p99 {self.p99:.3f}s")
+
+    def to_svg(self, width=640, height=240, bins=20) -> str:
+        """Renders the sample distribution as an SVG histogram with the mean and percentiles marked."""
+        values = self.samples + self.outliers
+        if not values:
+            return f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}"/>'
+        low, high = min(values), max(values)
+        span = (high - low) or 1e-9
+        margin, plot_width, plot_height = 40, width - 60, height - 70
+
+        def x_of(value):
+            return margin + (value - low) / span * plot_width
+
+        counts, outlier_counts = [0] * bins, [0] * bins
+        for value in self.samples:
+            counts[min(int((value - low) / span * bins), bins - 1)] += 1
+        for value in self.outliers:
+            outlier_counts[min(int((value - low) / span * bins), bins - 1)] += 1
+        top = max(c + o for c, o in zip(counts, outlier_counts))
+
+        bar_width = plot_width / bins
+        parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" '
+                 f'font-family="sans-serif" font-size="11">',
+                 f'<text x="{margin}" y="16" font-size="13">{escape(self.name)}</text>']
+        for i, (count, outlier_count) in enumerate(zip(counts, outlier_counts)):
+            x = margin + i * bar_width
+            kept_height = count / top * plot_height
+            outlier_height = outlier_count / top * plot_height
+            base = 30 + plot_height
+            parts.append(f'<rect x="{x:.1f}" y="{base - kept_height:.1f}" width="{bar_width - 1:.1f}" '
+                         f'height="{kept_height:.1f}" fill="#4a90d9"/>')
+            if outlier_count:
+                parts.append(f'<rect x="{x:.1f}" y="{base - kept_height - outlier_height:.1f}" '
+                             f'width="{bar_width - 1:.1f}" height="{outlier_height:.1f}" fill="#d9534f"/>')
+        markers = (('mean', '#333'), ('p50', '#2e7d32'), ('p90', '#ef6c00'), ('p99', '#c62828'))
+        for row, (key, color) in enumerate(markers):
+            x = x_of(getattr(self, key))
+            parts.append(f'<line x1="{x:.1f}" y1="26" x2="{x:.1f}" y2="{30 + plot_height}" stroke="{color}" '
+                         f'stroke-dasharray="4,3"/>')
+            parts.append(f'<text x="{x + 2:.1f}" y="{38 + row * 12}" fill="{color}">{key}</text>')
+        axis_y = 30 + plot_height
+        parts.append(f'<line x1="{margin}" y1="{axis_y}" x2="{margin + plot_width}" y2="{axis_y}" stroke="#999"/>')
+        parts.append(f'<text x="{margin}" y="{axis_y + 16}">{low:.3f}s</text>')
+        parts.append(f'<text x="{margin + plot_width}" y="{axis_y + 16}" text-anchor="end">{high:.3f}s</text>')
+        parts.append(f'<text x="{margin}" y="{axis_y + 32}" fill="#666">kept samples in blue, outliers (left out '
+                     f'of the mean) in red</text>')
+        parts.append('</svg>')
+        return "".join(parts)
+
+
+class PerfHarness:
+    """Repeats an action to measure it statistically instead of trusting a single sample.
+
+    Every run starts with untimed warmup iterations, then times each iteration with perf_counter_ns (or a
+    custom clock, e.g. BrowserTiming.clock). Samples outside Tukey's fences (outlier_k interquartile ranges
+    beyond the quartiles) are left out of the mean and its interval, the percentiles use every sample. The
+    statistics and a distribution chart are attached to Allure.
+
+    When a PerfHistory store is set, every run's samples are stored and compared with the rolling baseline
+    of earlier runs, and the step's trend is attached as well.
+    """
+
+    # Set by --perf_warmup and --perf_iterations
+    default_warmup = 1
+    default_iterations = 10
+
+    # Set by conftest from --perf_history: the PerfHistory store and the (run label, browser, run_env) key
+    history = None
+    run_key = None
+    comparisons = []
+
+    # Emulated conditions of the running test, e.g. {'network': '3g'}, set by conftest. They are part of the
+    # step name, so each combination of conditions has its own series in the perf history
+    conditions = {}
+    # (step title without conditions, conditions, PerfStats) of every run in this process
+    measurements = []
+
+    def __init__(self, warmup=None, iterations=None, outlier_k=1.5, confidence=0.95):
+        """
+        :param warmup: Untimed iterations run first, defaults to --perf_warmup.
+        :param iterations: Timed iterations, defaults to --perf_iterations.
+        :param outlier_k: Width of Tukey's fences in interquartile ranges, 0 keeps every sample.
+        :param confidence: Confidence level of the intervals.
+        """
+        self.warmup = PerfHarness.default_warmup if warmup is None else warmup
+        self.iterations = PerfHarness.default_iterations if iterations is None else iterations
+        self.outlier_k = outlier_k
+        self.confidence = confidence
+        self.results = []
+
+    def run(self, name, action, setup=None, teardown=None, clock=None, user=None) -> PerfStats:
+        """Measures an action, e.g. ``lambda: home_page.login(user, password)``.
+
+        :param name: Name of the measured action in the report and in the perf history, followed by the
+                     active emulated conditions if any.
+        :param action: Callable to measure.
+        :param setup: Untimed callable run before every iteration.
+        :param teardown: Untimed callable run after every iteration.
+        :param clock: Callable taking the action, running it and returning its duration in seconds.
+                      Defaults to perf_counter_ns around the action.
+        :param user: User the action runs as, stored with the samples in the perf history.
+        :return: PerfStats of the timed iterations, with the history comparison (or None) in ``comparison``.
+        """
+        clock = clock or self._wall_clock
+        samples = []
+        for iteration in range(self.warmup + self.iterations):
+            if setup:
+                setup()
+            duration = clock(action)
+            if teardown:
+                teardown()
+            if iteration >= self.warmup:
+                samples.append(duration)
+
+        kept, outliers = self.reject_outliers(samples)
+        plain_title = f"{name} ({user})" if user else name
+        step = self.series_name(name, PerfHarness.conditions)
+        title = f"{step} ({user})" if user else step
+        stats = PerfStats(title, kept, outliers, self.confidence)
+        stats.series = (name, user)
+        stats.comparison = self._compare_with_history(step, user, samples)  # Raw samples, outliers too
+        self.results.append(stats)
+        PerfHarness.measurements.append((plain_title, dict(PerfHarness.conditions), stats))
+
+        summary = stats.summary()
+        if stats.comparison is not None:
+            summary += "\n" + stats.comparison.summary()
+        allure.attach(summary, name=f"{title} statistics", attachment_type=allure.attachment_type.TEXT)
+        allure.attach(stats.to_svg(), name=f"{title} distribution", attachment_type=allure.attachment_type.SVG)
+        return stats
+
+    @staticmethod
+    def series_name(name, conditions) -> str:
+        """Returns the step name an action is stored under in the perf history, e.g. 'Login [network 3g]'.
+
+        :param name: Name of the measured action.
+        :param conditions: Emulated conditions, see PerfHarness.conditions.
+        """
+        if not conditions:
+            return name
+        return f"{name} [{', '.join(f'{kind} {value}' for kind, value in conditions.items())}]"
+
+    def _compare_with_history(self, name, user, samples):
+        history, run_key = PerfHarness.history, PerfHarness.run_key
+        if history is None or run_key is None:
+            return None
+        run_label, browser, run_env = run_key
+        history.record(run_label, browser, run_env, user, name, samples)
+        comparison = history.compare(run_label, browser, run_env, user, name)
+        PerfHarness.comparisons.append(comparison)
+
+        title = f"{name} ({user})" if user else name
+        allure.attach(trend_svg(f"{title} on {browser}/{run_env}", history.trend(browser, run_env, user, name)),
+                      name=f"{title} trend", attachment_type=allure.attachment_type.SVG)
+        return comparison
+
+    def reject_outliers(self, samples):
+        """Splits samples into kept ones and outliers outside Tukey's fences.
+
+        :param samples: Samples in seconds.
+        :return: Tuple of (kept samples, outliers).
+        """
+        if self.outlier_k <= 0 or len(samples) < 4:
+            return list(samples), []
+        ordered = sorted(samples)
+        q1, q3 = percentile(ordered, 0.25), percentile(ordered, 0.75)
+        low, high = q1 - self.outlier_k * (q3 - q1), q3 + self.outlier_k * (q3 - q1)
+        kept = [s for s in samples if low <= s <= high]
+        return kept, [s for s in samples if not low <= s <= high]
+
+    @staticmethod
+    def _wall_clock(action):
+        start = time.perf_counter_ns()
+        action()
+        return (time.perf_counter_ns() - start) / 1e9
@@ -0,0 +1,270 @@
+import argparse
+import math
+import os
+import sqlite3
+import statistics
+import time
+from html import escape
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS samples (
+    run_label INTEGER NOT NULL,
+    browser TEXT NOT NULL,
+    run_env TEXT NOT NULL,
+    user TEXT NOT NULL,
+    step TEXT NOT NULL,
+    value REAL NOT NULL,
+    recorded_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_samples_series ON samples (step, user, browser, run_env, run_label);
+CREATE INDEX IF NOT EXISTS ix_samples_run ON samples (run_label);
+"""
+
+
+def mann_whitney_u(sample, baseline):
+    """One-sided Mann-Whitney U test that the sample tends to be larger (slower) than the baseline.
+
+    Uses the normal approximation with tie and continuity correction, which holds from about 8 values per
+    group. No assumption is made on the shape of the distributions.
+
+    :param sample: Values of the current run.
+    :param baseline: Values of the baseline runs.
+    :return: Tuple of (U statistic of the sample, p-value).
+    """
+    n1, n2 = len(sample), len(baseline)
+    if not n1 or not n2:
+        return math.nan, 1.0
+    combined = sorted([(value, 0) for value in sample] + [(value, 1) for value in baseline])
+    n = n1 + n2
+
+    # Average ranks over ties, and the tie term of the variance
+    sample_rank_sum, tie_term, i = 0.0, 0.0, 0
+    while i < n:
+        j = i
+        while j + 1 < n and combined[j + 1][0] == combined[i][0]:
+            j += 1
+        rank = (i + j) / 2 + 1
+        sample_rank_sum += rank * sum(1 for k in range(i, j + 1) if combined[k][1] == 0)
+        ties = j - i + 1
+        tie_term += ties ** 3 - ties
+        i = j + 1
+
+    u = sample_rank_sum - n1 * (n1 + 1) / 2
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term / (n * (n - 1))))
+    if sigma == 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2 - 0.5) / sigma
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+class Comparison:
+    """Outcome of comparing one step of the current run with its rolling baseline."""
+
+    def __init__(self, step, user, browser, run_env, current, baseline, baseline_runs, p_value, regressed):
+        """
+        :param step: Step name.
+        :param user: User the step ran as, '' when not user specific.
+        :param browser: Browser of the run.
+        :param run_env: Environment of the run.
+        :param current: Samples of the current run, in seconds.
+        :param baseline: Samples of the baseline runs, in seconds.
+        :param baseline_runs: Number of earlier runs in the baseline.
+        :param p_value: One-sided Mann-Whitney p-value that the current run is slower.
+        :param regressed: True if the slowdown is significant and large enough to matter.
+        """
+        self.step = step
+        self.user = user
+        self.browser = browser
+        self.run_env = run_env
+        self.current_median = statistics.median(current) if current else math.nan
+        self.baseline_median = statistics.median(baseline) if baseline else math.nan
+        self.baseline_runs = baseline_runs
+        self.p_value = p_value
+        self.regressed = regressed
+
+    @property
+    def change(self) -> float:
+        """Relative change of the median against the baseline, e.g. 0.25 for 25% slower."""
+        if not self.baseline_median or math.isnan(self.baseline_median):
+            return math.nan
+        return self.current_median / self.baseline_median - 1
+
+    def summary(self) -> str:
+        name = f"{self.step} ({self.user})" if self.user else self.step
+        if not self.baseline_runs:
+            return f"{name} [{self.browser}/{self.run_env}]: median {self.current_median:.3f}s, no baseline yet"
+        verdict = "REGRESSION" if self.regressed else "ok"
+        return (f"{name} [{self.browser}/{self.run_env}]: median {self.current_median:.3f}s vs "
+                f"{self.baseline_median:.3f}s over {self.baseline_runs} runs ({self.change * 100:+.1f}%), "
+                f"p={self.p_value:.4f} -> {verdict}")
+
+
+class PerfHistory:
+    """SQLite store of every perf sample, keyed by run label, browser, run_env, user and step.
+
+    Each run is compared with a rolling baseline made of the samples of the previous baseline_runs runs of
+    the same step, user, browser and environment. A step regressed when a one-sided Mann-Whitney test finds
+    it slower at significance alpha and its median grew by at least min_change. The samples are indexed
+    by series and run label, so a baseline query stays fast with thousands of runs in the store.
+    """
+
+    def __init__(self, db_path, baseline_runs=10, alpha=0.01, min_change=0.05):
+        """
+        :param db_path: Path of the SQLite database, created when missing.
+        :param baseline_runs: Number of earlier runs the baseline is made of.
+        :param alpha: Significance level of the regression test.
+        :param min_change: Smallest relative median slowdown reported as a regression.
+        """
+        self.db_path = db_path
+        self.baseline_runs = baseline_runs
+        self.alpha = alpha
+        self.min_change = min_change
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        # Parallel workers write to the same database, WAL lets them read while another one writes
+        self._connection = sqlite3.connect(db_path, timeout=30, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.executescript(_SCHEMA)
+
+    def record(self, run_label, browser, run_env, user, step, values):
+        """Stores the samples of one step.
+
+        :param run_label: Label of the run, see get_next_run_label.
+        :param browser: Browser of the run.
+        :param run_env: Environment of the run.
+        :param user: User the step ran as, '' when not user specific.
+        :param step: Step name.
+        :param values: Samples in seconds.
+        """
+        now = time.time()
+        with self._connection:
+            self._connection.executemany(
+                "INSERT INTO samples VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [(run_label, browser, run_env, user or '', step, value, now) for value in values])
+
+    def samples(self, run_label, browser, run_env, user, step) -> list:
+        """Returns the samples of one step in one run."""
+        rows = self._connection.execute(
+            "SELECT value FROM samples WHERE step = ? AND user = ? AND browser = ? AND run_env = ? "
+            "AND run_label = ?", (step, user or '', browser, run_env, run_label))
+        return [value for value, in rows]
+
+    def baseline(self, run_label, browser, run_env, user, step):
+        """Returns the samples of the baseline runs before a run.
+
+        :return: Tuple of (samples, number of runs they come from).
+        """
+        key = (step, user or '', browser, run_env)
+        labels = [label for label, in self._connection.execute(
+            "SELECT DISTINCT run_label FROM samples WHERE step = ? AND user = ? AND browser = ? AND run_env = ? "
+            "AND run_label < ? ORDER BY run_label DESC LIMIT ?", key + (run_label, self.baseline_runs))]
+        if not labels:
+            return [], 0
+        rows = self._connection.execute(
+            "SELECT value FROM samples WHERE step = ? AND user = ? AND browser = ? AND run_env = ? "
+            "AND run_label BETWEEN ? AND ?", key + (min(labels), max(labels)))
+        return [value for value, in rows], len(labels)
+
+    def trend(self, browser, run_env, user, step, runs=30) -> list:
+        """Returns the median and p90 of the latest runs of one step, oldest first.
+
+        :return: List of (run label, median, p90).
+        """
+        rows = self._connection.execute(
+            "SELECT run_label, value FROM samples WHERE step = ? AND user = ? AND browser = ? AND run_env = ? "
+            "AND run_label >= (SELECT MIN(run_label) FROM (SELECT DISTINCT run_label FROM samples "
+            "WHERE step = ? AND user = ? AND browser = ? AND run_env = ? ORDER BY run_label DESC LIMIT ?)) "
+            "ORDER BY run_label, value", (step, user or '', browser, run_env) * 2 + (runs,))
+        by_run = {}
+        for label, value in rows:
+            by_run.setdefault(label, []).append(value)
+        return [(label, statistics.median(values), values[min(len(values) - 1, int(len(values) * 0.9))])
+                for label, values in by_run.items()]
+
+    def compare(self, run_label, browser, run_env, user, step) -> Comparison:
+        """Compares one step of a run with its rolling baseline."""
+        current = self.samples(run_label, browser, run_env, user, step)
+        baseline, runs = self.baseline(run_label, browser, run_env, user, step)
+        p_value = mann_whitney_u(current, baseline)[1] if runs else 1.0
+        comparison = Comparison(step, user or '', browser, run_env, current, baseline, runs, p_value, False)
+        comparison.regressed = bool(runs) and p_value < self.alpha and comparison.change >= self.min_change
+        return comparison
+
+    def compare_run(self, run_label) -> list:
+        """Compares every step recorded in a run with its rolling baseline.
+
+        :return: List of Comparison, regressions first.
+        """
+        keys = self._connection.execute(
+            "SELECT DISTINCT step, user, browser, run_env FROM samples WHERE run_label = ?", (run_label,)).fetchall()
+        comparisons = [self.compare(run_label, browser, run_env, user, step) for step, user, browser, run_env in keys]
+        return sorted(comparisons, key=lambda c: (not c.regressed, c.step, c.user))
+
+    def latest_run_label(self):
+        return self._connection.execute("SELECT MAX(run_label) FROM samples").fetchone()[0]
+
+    def close(self):
+        self._connection.close()
+
+
+def trend_svg(title, points, width=640, height=220) -> str:
+    """Renders the median and p90 of the latest runs of a step as an SVG line chart.
+
+    :param title: Chart title.
+    :param points: List of (run label, median, p90), see PerfHistory.trend.
+    """
+    if not points:
+        return f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}"/>'
+    margin, plot_width, plot_height = 50, width - 70, height - 60
+    top = max(p90 for _, _, p90 in points) or 1e-9
+    step = plot_width / max(len(points) - 1, 1)
+
+    def polyline(index, color):
+        coordinates = " ".join(f"{margin + i * step:.1f},{30 + plot_height - point[index] / top * plot_height:.1f}"
+                               for i, point in enumerate(points))
+        return f'<polyline points="{coordinates}" fill="none" stroke="{color}" stroke-width="2"/>'
+
+    axis_y = 30 + plot_height
+    return "".join([
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" font-family="sans-serif" '
+        f'font-size="11">',
+        f'<text x="{margin}" y="16" font-size="13">{escape(title)}</text>',
+        f'<line x1="{margin}" y1="{axis_y}" x2="{margin + plot_width}" y2="{axis_y}" stroke="#999"/>',
+        polyline(2, '#ef6c00'),
+        polyline(1, '#4a90d9'),
+        f'<text x="{margin - 4}" y="34" text-anchor="end">{top:.2f}s</text>',
+        f'<text x="{margin}" y="{axis_y + 16}">run {points[0][0]}</text>',
+        f'<text x="{margin + plot_width}" y="{axis_y + 16}" text-anchor="end">run {points[-1][0]}</text>',
+        f'<text x="{margin}" y="{axis_y + 30}" fill="#666">median in blue, p90 in orange</text>',
+        '</svg>',
+    ])
+
+
+def main(argv=None):
+    """Prints the regression summary of a run: python -m Utils.PerfHistory [--run N]"""
+    parser = argparse.ArgumentParser(description="Compare a run's perf samples with their rolling baseline")
+    parser.add_argument("--db", default="Reports/perf_history.db", help="Path of the perf history database")
+    parser.add_argument("--run", type=int, default=None, help="Run label to check, defaults to the latest run")
+    parser.add_argument("--baseline_runs", type=int, default=10, help="Number of earlier runs in the baseline")
+    parser.add_argument("--alpha", type=float, default=0.01, help="Significance level of the regression test")
+    args = parser.parse_args(argv)
+
+    if not os.path.exists(args.db):
+        parser.error(f"{args.db} does not exist, run the perf tests first")
+    history = PerfHistory(args.db, baseline_runs=args.baseline_runs, alpha=args.alpha)
+    try:
+        run_label = args.run if args.run is not None else history.latest_run_label()
+        if run_label is None:
+            print(f"No perf samples in {args.db} yet")
+            return 0
+        comparisons = history.compare_run(run_label)
+        print(f"Run #{run_label}: {len(comparisons)} steps, "
+              f"{sum(c.regressed for c in comparisons)} regressions")
+        for comparison in comparisons:
+            print("  " + comparison.summary())
+    finally:
+        history.close()
+    return 1 if any(c.regressed for c in comparisons) else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,299 @@
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+MB = 1024 * 1024
+
+# Share of the runner's cores and available memory the recommended worker count may use
+HEADROOM = 0.8
+
+
+class TreeUsage:
+    """Resources of a process and all its descendants at one point in time, read from /proc."""
+
+    def __init__(self, cpu_seconds=0.0, memory=0, read_bytes=0, write_bytes=0, processes=0):
+        """
+        :param cpu_seconds: User and system CPU time of the live processes and the children they reaped.
+        :param memory: Summed proportional set size (PSS) in bytes, each shared page split between the
+                       processes sharing it. RSS for processes whose smaps_rollup can't be read.
+        :param read_bytes: Bytes the live processes read from storage.
+        :param write_bytes: Bytes the live processes wrote to storage.
+        :param processes: Number of live processes in the tree.
+        """
+        self.cpu_seconds = cpu_seconds
+        self.memory = memory
+        self.read_bytes = read_bytes
+        self.write_bytes = write_bytes
+        self.processes = processes
+
+
+class ProcReader:
+    """Reads process trees from the proc filesystem (Linux only)."""
+
+    def __init__(self, proc_root='/proc'):
+        """
+        :param proc_root: Mount point of the proc filesystem.
+        """
+        self.proc_root = proc_root
+        self.clock_ticks = os.sysconf('SC_CLK_TCK') if hasattr(os, 'sysconf') else 100
+        self.page_size = os.sysconf('SC_PAGE_SIZE') if hasattr(os, 'sysconf') else 4096
+
+    @property
+    def available(self) -> bool:
+        return os.path.isfile(os.path.join(self.proc_root, 'meminfo'))
+
+    def _read(self, pid, name):
+        with open(os.path.join(self.proc_root, str(pid), name)) as file:
+            return file.read()
+
+    def stat(self, pid):
+        """Returns the fields of /proc/<pid>/stat after the command name, the state being the first one."""
+        content = self._read(pid, 'stat')
+        # The command name is in parentheses and may itself hold spaces and parentheses
+        return content[content.rindex(')') + 2:].split()
+
+    def memory(self, pid, fields) -> int:
+        """Returns the proportional set size of a process in bytes, its resident set size when Pss isn't readable.
+
+        The browser's processes share most of their pages (code, fonts, shared memory), RSS counts them once
+        per process and overstates the tree's memory several times over.
+
+        :param pid: Process id.
+        :param fields: Fields of the process's stat, see stat.
+        """
+        try:
+            for line in self._read(pid, 'smaps_rollup').splitlines():
+                if line.startswith('Pss:'):
+                    return int(line.split()[1]) * 1024
+        except (OSError, ValueError):
+            pass  # Kernels before 4.14, or processes of other users
+        return int(fields[21]) * self.page_size
+
+    def children(self):
+        """Returns parent pid -> child pids of every process currently alive."""
+        children = {}
+        for entry in os.listdir(self.proc_root):
+            if not entry.isdigit():
+                continue
+            try:
+                parent = int(self.stat(entry)[1])
+            except (OSError, ValueError, IndexError):
+                continue  # Exited while listing
+            children.setdefault(parent, []).append(int(entry))
+        return children
+
+    def tree(self, root_pid) -> list:
+        """Returns the pids of the process and all its live descendants, empty when the process is gone."""
+        if not os.path.exists(os.path.join(self.proc_root, str(root_pid))):
+            return []
+        children = self.children()
+        pids, pending = [], [root_pid]
+        while pending:
+            pid = pending.pop()
+            pids.append(pid)
+            pending.extend(children.get(pid, []))
+        return pids
+
+    def usage(self, root_pid) -> TreeUsage:
+        """Returns the summed resources of the process tree, all zero when the process is gone."""
+        usage = TreeUsage()
+        for pid in self.tree(root_pid):
+            try:
+                fields = self.stat(pid)
+            except (OSError, ValueError):
+                continue
+            # utime, stime, cutime and cstime are fields 14 to 17 of stat, rss (in pages) is field 24
+            usage.cpu_seconds += sum(int(value) for value in fields[11:15]) / self.clock_ticks
+            usage.memory += self.memory(pid, fields)
+            usage.processes += 1
+            try:
+                io = dict(line.split(': ') for line in self._read(pid, 'io').splitlines() if ': ' in line)
+                usage.read_bytes += int(io.get('read_bytes', 0))
+                usage.write_bytes += int(io.get('write_bytes', 0))
+            except (OSError, ValueError):
+                pass  # Not readable for processes of other users
+        return usage
+
+    def memory_available(self) -> int:
+        """Returns MemAvailable of /proc/meminfo in bytes, 0 when it can't be read."""
+        try:
+            with open(os.path.join(self.proc_root, 'meminfo')) as file:
+                for line in file:
+                    if line.startswith('MemAvailable:'):
+                        return int(line.split()[1]) * 1024
+        except (OSError, ValueError):
+            pass
+        return 0
+
+
+class ResourceUsage:
+    """Resources the browser used during one test."""
+
+    def __init__(self, name, class_name, seconds, cpu_seconds, peak_memory, read_bytes, write_bytes):
+        self.name = name
+        self.class_name = class_name
+        self.seconds = seconds
+        self.cpu_seconds = cpu_seconds
+        self.peak_memory = peak_memory  # Peak PSS of the tree in bytes
+        self.read_bytes = read_bytes
+        self.write_bytes = write_bytes
+
+    @property
+    def cores(self) -> float:
+        """Average number of cores busy during the test."""
+        return self.cpu_seconds / self.seconds if self.seconds > 0 else 0.0
+
+    def summary(self) -> str:
+        return (f"{self.seconds:.2f}s wall, {self.cpu_seconds:.2f}s CPU ({self.cores:.2f} cores), "
+                f"peak PSS {self.peak_memory / MB:.1f} MB, I/O read {self.read_bytes / MB:.1f} MB "
+                f"write {self.write_bytes / MB:.1f} MB")
+
+
+def recommend_workers(usages, cores, memory_available, headroom=HEADROOM) -> tuple:
+    """Returns how many workers (one browser each) the runner can hold, and what limits it.
+
+    Each worker is assumed to need the highest peak PSS and the highest core usage seen in a single test.
+
+    :param usages: ResourceUsage of the measured tests.
+    :param cores: Number of cores of the runner.
+    :param memory_available: Memory available for new processes, in bytes.
+    :param headroom: Share of the cores and memory the workers may use.
+    :return: (worker count, 'CPU' or 'memory'), the count is at least 1.
+    """
+    peak_memory = max((usage.peak_memory for usage in usages), default=0)
+    peak_cores = max((usage.cores for usage in usages), default=0.0)
+    by_cpu = int(cores * headroom / peak_cores) if peak_cores else cores
+    by_memory = int(memory_available * headroom / peak_memory) if peak_memory and memory_available else by_cpu
+    return (max(1, by_cpu), 'CPU') if by_cpu <= by_memory else (max(1, by_memory), 'memory')
+
+
+class ResourceMonitor:
+    """Measures the CPU, memory and I/O of the driver process and the browser it started, test by test.
+
+    The driver service process of a local driver (chromedriver, geckodriver, msedgedriver) is the root of the
+    tree; the browser and its renderer, GPU and utility processes are its descendants. A background thread
+    samples the tree every `interval` seconds while a test runs, for the peak PSS; CPU time and I/O are the
+    difference between the start and the end of the test. Remote drivers have no local process and are skipped.
+    """
+
+    def __init__(self, interval=0.5, reader=None):
+        """
+        :param interval: Seconds between two samples of the running test's process tree.
+        :param reader: ProcReader to read the processes with, defaults to the one of /proc.
+        """
+        self.interval = interval
+        self.reader = reader or ProcReader()
+        self.tests = []  # ResourceUsage of every measured test
+        self.samples = 0
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stopped = False
+        self._thread = None
+        self._root_pid = None
+        self._start = None  # (perf_counter, TreeUsage) of the running test
+        self._peak_memory = 0
+
+    @staticmethod
+    def driver_pid(driver):
+        """Returns the pid of the driver service process, None for Remote drivers and finished services."""
+        process = getattr(getattr(driver, 'service', None), 'process', None)
+        if process is None or process.poll() is not None:
+            return None
+        return process.pid
+
+    def start_test(self, driver) -> bool:
+        """Starts measuring the driver's process tree.
+
+        :param driver: WebDriver of the test.
+        :return: False when the driver has no local process or /proc isn't available.
+        """
+        pid = self.driver_pid(driver) if driver is not None else None
+        if pid is None or not self.reader.available:
+            return False
+        usage = self.reader.usage(pid)
+        with self._lock:
+            self._root_pid = pid
+            self._start = (time.perf_counter(), usage)
+            self._peak_memory = usage.memory
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._sample_loop, name='resource-monitor', daemon=True)
+            self._thread.start()
+        self._wake.set()
+        return True
+
+    def _sample_loop(self):
+        while not self._stopped:
+            self._wake.wait(self.interval)
+            self._wake.clear()
+            with self._lock:
+                pid = self._root_pid
+            if pid is None:
+                continue
+            try:
+                memory = self.reader.usage(pid).memory
+            except Exception as e:
+                logger.debug(f"Could not sample process {pid}: {e}")
+                continue
+            with self._lock:
+                if self._root_pid == pid:
+                    self._peak_memory = max(self._peak_memory, memory)
+                    self.samples += 1
+
+    def finish_test(self, name, class_name=None):
+        """Stops measuring and records the test's usage.
+
+        :param name: Test name.
+        :param class_name: Name of the test class, None for module level tests.
+        :return: The ResourceUsage, None when the test wasn't measured.
+        """
+        with self._lock:
+            pid, start, self._root_pid, self._start = self._root_pid, self._start, None, None
+        if pid is None:
+            return None
+        end = self.reader.usage(pid)
+        with self._lock:
+            peak_memory = max(self._peak_memory, end.memory)
+        begin_time, begin = start
+        # Processes that exit and are reaped outside of the tree take their counters with them
+        usage = ResourceUsage(name, class_name, time.perf_counter() - begin_time,
+                              max(0.0, end.cpu_seconds - begin.cpu_seconds), peak_memory,
+                              max(0, end.read_bytes - begin.read_bytes), max(0, end.write_bytes - begin.write_bytes))
+        self.tests.append(usage)
+        return usage
+
+    def stop(self):
+        self._stopped = True
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=self.interval + 1)
+
+    def report(self, cores=None, memory_available=None) -> list:
+        """Returns the end-of-run report lines: usage per test class and the recommended worker count.
+
+        :param cores: Number of cores of the runner, defaults to os.cpu_count().
+        :param memory_available: Available memory in bytes, defaults to MemAvailable of /proc/meminfo.
+        """
+        classes = {}
+        for usage in self.tests:
+            classes.setdefault(usage.class_name or '(module level)', []).append(usage)
+        lines = [f"{'class':<36} {'tests':>5} {'wall':>8} {'CPU':>8} {'cores':>6} {'peak PSS':>10} "
+                 f"{'I/O read':>10} {'I/O write':>10}"]
+        for class_name, usages in classes.items():
+            seconds = sum(usage.seconds for usage in usages)
+            cpu_seconds = sum(usage.cpu_seconds for usage in usages)
+            lines.append(
+                f"{class_name:<36} {len(usages):>5} {seconds:>7.2f}s {cpu_seconds:>7.2f}s "
+                f"{cpu_seconds / seconds if seconds else 0.0:>6.2f} "
+                f"{max(usage.peak_memory for usage in usages) / MB:>7.1f} MB "
+                f"{sum(usage.read_bytes for usage in usages) / MB:>7.1f} MB "
+                f"{sum(usage.write_bytes for usage in usages) / MB:>7.1f} MB")
+
+        cores = cores or os.cpu_count() or 1
+        memory_available = self.reader.memory_available() if memory_available is None else memory_available
+        workers, limit = recommend_workers(self.tests, cores, memory_available)
+        lines.append(f"{cores} cores, {memory_available / MB:.0f} MB available: up to {workers} workers "
+                     f"(--workers {workers}) using {HEADROOM:.0%} of them, limited by {limit}")
+        return lines
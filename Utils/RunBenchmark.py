@@ -0,0 +1,139 @@
+import hashlib
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+from Utils.Parallel import FileLock
+
+
+def selection_key(nodeids, *settings) -> str:
+    """Returns a short key identifying a selection of tests, so runs of the same tests can be compared.
+
+    :param nodeids: Node ids of the tests the run reported.
+    :param settings: Other settings the compared runs must share (browser, environment...).
+    """
+    content = "\n".join(sorted(set(nodeids)) + [str(setting) for setting in settings])
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+class RunLog:
+    """Measured wall times of whole runs, kept across sessions in a JSON file.
+
+    Each run is stored with the key of its test selection and the settings being compared (driver pool mode,
+    worker count), so a run can be compared with the latest run of the same tests under other settings.
+    """
+
+    def __init__(self, path='Reports/run_benchmarks.json', keep=200):
+        """
+        :param path: Path of the JSON file.
+        :param keep: Number of runs kept, the oldest are dropped.
+        """
+        self.path = path
+        self.keep = keep
+
+    def _load(self) -> list:
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return []
+
+    def record(self, selection, tests, wall_time, **settings) -> list:
+        """Adds a run and returns the earlier runs of the same selection, oldest first.
+
+        :param selection: Key of the test selection, see selection_key.
+        :param tests: Number of tests run.
+        :param wall_time: Wall time of the run in seconds.
+        :param settings: Compared settings of the run, e.g. driver_pool='on', workers=4.
+        """
+        os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+        with FileLock(self.path + '.lock'):
+            runs = self._load()
+            earlier = [run for run in runs if run['selection'] == selection]
+            runs.append(dict(settings, selection=selection, tests=tests, wall_time=round(wall_time, 3),
+                             time=datetime.now().isoformat(timespec='seconds')))
+            temp_file = self.path + '.tmp'
+            with open(temp_file, 'w') as file:
+                json.dump(runs[-self.keep:], file, indent=1)
+            os.replace(temp_file, self.path)
+        return earlier
+
+
+def latest(runs, **settings):
+    """Returns the latest run with the given settings, None when there is none.
+
+    :param runs: Runs of one selection, oldest first.
+    """
+    matching = [run for run in runs if all(run.get(name) == value for name, value in settings.items())]
+    return matching[-1] if matching else None
+
+
+def pool_comparison(earlier, wall_time, tests, driver_pool, workers) -> list:
+    """Returns the measured comparison of this run with the latest run of the same tests in the other pool mode.
+
+    :param earlier: Earlier runs of the selection, see RunLog.record.
+    :param wall_time: Wall time of this run.
+    :param tests: Number of tests of this run.
+    :param driver_pool: Pool mode of this run, 'on' or 'off'.
+    :param workers: Worker count of this run, the compared run must have the same.
+    """
+    other_mode = 'off' if driver_pool == 'on' else 'on'
+    other = latest(earlier, driver_pool=other_mode, workers=workers)
+    if other is None:
+        return [f"No run of these {tests} tests with --driver_pool {other_mode} and {workers} worker(s) yet: "
+                f"run the same selection with it to measure the saving (the driver pool figures are estimates)"]
+    on, off = (wall_time, other['wall_time']) if driver_pool == 'on' else (other['wall_time'], wall_time)
+    return [f"Measured wall time of the same {tests} tests with {workers} worker(s): pool on {on:.2f}s, "
+            f"pool off {off:.2f}s (run of {other['time']}), saved {off - on:.2f}s "
+            f"({(1 - on / off) * 100 if off else 0:.0f}%)"]
+
+
+def scaling_table(earlier, wall_time, workers, driver_pool) -> list:
+    """Returns the wall time, speedup and efficiency of the same tests at every worker count measured so far.
+
+    The latest run of each worker count is used, this run for its own count. The speedup is relative to one
+    worker, or to the smallest worker count measured (assumed to scale linearly) when there is no serial run.
+
+    :param earlier: Earlier runs of the selection, see RunLog.record.
+    :param wall_time: Wall time of this run.
+    :param workers: Worker count of this run.
+    :param driver_pool: Pool mode of this run, only runs with the same mode are compared.
+    :return: Report lines, empty when a single worker count was measured.
+    """
+    by_workers = {run['workers']: run['wall_time'] for run in earlier if run.get('driver_pool') == driver_pool}
+    by_workers[workers] = wall_time
+    if len(by_workers) < 2:
+        return []
+    base = min(by_workers)
+    serial_time = by_workers[base] * base
+    lines = [f"Scaling of the same tests (driver pool {driver_pool})"
+             + ("" if base == 1 else f", relative to {base} workers scaling linearly") + ":"]
+    for count in sorted(by_workers):
+        speedup = serial_time / by_workers[count] if by_workers[count] else 0.0
+        lines.append(f"  {count:>3} workers: wall time {by_workers[count]:8.2f}s, speedup {speedup:5.2f}x, "
+                     f"efficiency {speedup / count * 100:3.0f}%")
+    return lines
+
+
+def run_scaling(worker_counts, pytest_args) -> int:
+    """Runs the same pytest selection once per worker count, the last run prints the scaling table.
+
+    :param worker_counts: Worker counts in the order they are run, 1 runs serially.
+    :param pytest_args: Arguments handed to every pytest run (test paths, -k, options...).
+    :return: Highest exit code of the runs.
+    """
+    exit_code = 0
+    for count in worker_counts:
+        workers = ['--workers', str(count)] if count > 1 else []
+        print(f"Scaling run with {count} worker(s): pytest {' '.join(pytest_args + workers)}", flush=True)
+        exit_code = max(exit_code, subprocess.call([sys.executable, '-m', 'pytest'] + pytest_args + workers))
+    return exit_code
+
+
+if __name__ == '__main__':
+    # python -m Utils.RunBenchmark 1,2,4,8 Tests/Products --browser_type chrome
+    if len(sys.argv) < 2:
+        sys.exit("Usage: python -m Utils.RunBenchmark <worker counts, e.g. 1,2,4,8> [pytest arguments]")
+    sys.exit(run_scaling(sorted(int(count) for count in sys.argv[1].split(',')), sys.argv[2:]))
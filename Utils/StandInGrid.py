@@ -0,0 +1,108 @@
+import json
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class StandInGridEndpoint:
+    """Local stand-in for a Selenium Grid endpoint speaking the W3C session protocol.
+
+    Answers `POST /session` with a new session id, `DELETE /session/<id>` by closing it, and any other
+    session command with a null value. No browser is started, which makes it suitable for exercising the
+    grid scheduler offline.
+    """
+
+    def __init__(self, capacity=1, fail_sessions=False, host='127.0.0.1', port=0):
+        """
+        :param capacity: Maximum number of open sessions, extra requests get 'session not created'.
+        :param fail_sessions: When True, every session request fails (simulates a broken node).
+        :param host: Interface to listen on.
+        :param port: Port to listen on, 0 picks a free one.
+        """
+        self.capacity = capacity
+        self.fail_sessions = fail_sessions
+        self.sessions = set()
+        self.peak_sessions = 0
+        self.session_requests = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def _new_session(self, capabilities):
+        with self._lock:
+            self.session_requests += 1
+            if self.fail_sessions or len(self.sessions) >= self.capacity:
+                return 500, {"value": {"error": "session not created",
+                                       "message": "Could not start a new session", "stacktrace": ""}}
+            session_id = uuid.uuid4().hex
+            self.sessions.add(session_id)
+            self.peak_sessions = max(self.peak_sessions, len(self.sessions))
+        browser = capabilities.get("alwaysMatch", {}).get("browserName", "chrome")
+        return 200, {"value": {"sessionId": session_id, "capabilities": {"browserName": browser}}}
+
+    def _delete_session(self, session_id):
+        with self._lock:
+            self.sessions.discard(session_id)
+        return 200, {"value": None}
+
+    def _make_handler(self):
+        endpoint = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _reply(self, status, body):
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def _read_json(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                return json.loads(self.rfile.read(length) or b"{}")
+
+            def do_POST(self):
+                body = self._read_json()
+                if self.path.rstrip('/') == "/session":
+                    self._reply(*endpoint._new_session(body.get("capabilities", {})))
+                else:
+                    self._reply(200, {"value": None})
+
+            def do_GET(self):
+                if self.path.rstrip('/') == "/status":
+                    self._reply(200, {"value": {"ready": True, "message": "Stand-in grid ready"}})
+                else:
+                    self._reply(200, {"value": None})
+
+            def do_DELETE(self):
+                parts = self.path.strip('/').split('/')
+                if len(parts) == 2 and parts[0] == "session":
+                    self._reply(*endpoint._delete_session(parts[1]))
+                else:
+                    self._reply(200, {"value": None})
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
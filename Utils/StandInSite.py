@@ -0,0 +1,241 @@
+import io
+import json
+import os
+import re
+import threading
+import zlib
+from http.cookies import SimpleCookie
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit
+
+from PIL import Image, ImageDraw
+
+SITE_DIR = os.path.join(os.path.dirname(os.path.realpath(__file__)), 'stand_in_site')
+
+# Routes of the single page app, all served by index.html
+PAGES = ('', 'index.html', 'inventory.html', 'inventory-item.html', 'cart.html', 'checkout-step-one.html',
+         'checkout-step-two.html', 'checkout-complete.html')
+
+# Product pictures referenced by the app, generated on first request
+MEDIA = ('sauce-backpack-1200x1500.jpg', 'bike-light-1200x1500.jpg', 'bolt-shirt-1200x1500.jpg',
+         'sauce-pullover-1200x1500.jpg', 'red-onesie-1200x1500.jpg', 'red-tatt-1200x1500.jpg', 'sl-404.jpg')
+
+CONTENT_TYPES = {'.html': 'text/html; charset=utf-8', '.js': 'application/javascript; charset=utf-8',
+                 '.css': 'text/css; charset=utf-8', '.jpg': 'image/jpeg'}
+
+
+class Fault:
+    """A failure injected into the responses of one page or file of the stand-in site."""
+
+    KINDS = ('error', 'timeout')
+
+    def __init__(self, path, kind='error', every=1, user=None, hang_seconds=30):
+        """
+        :param path: Request path without the leading slash and query, e.g. 'inventory.html'.
+        :param kind: error: answer 500, timeout: hold the connection for `hang_seconds`, then drop it unanswered.
+        :param every: Fail every Nth matching request, 1 fails them all.
+        :param user: Only fail requests of this logged in user, None fails everyone's.
+        :param hang_seconds: How long a timeout fault holds the connection.
+        """
+        if kind not in self.KINDS:
+            raise ValueError(f"Unknown fault kind: {kind}")
+        self.path = path.lstrip('/')
+        self.kind = kind
+        self.every = max(1, every)
+        self.user = user
+        self.hang_seconds = hang_seconds
+        self.matched = 0
+
+    def applies(self, path, user) -> bool:
+        """Counts a request and returns True when this fault must be injected into it."""
+        if path != self.path or (self.user is not None and user != self.user):
+            return False
+        self.matched += 1
+        return self.matched % self.every == 0
+
+    def __repr__(self):
+        user = f"@{self.user}" if self.user else ""
+        return f"Fault({self.path}{user}={self.kind}/{self.every})"
+
+
+def parse_faults(text) -> list:
+    """Parses fault specs such as 'inventory.html=500,cart.html@problem_user=timeout/3'.
+
+    :param text: Comma separated '<path>[@<user>]=<500|timeout>[/<every>]' specs.
+    :return: List of Fault.
+    :raises ValueError: If a spec can't be parsed.
+    """
+    faults = []
+    for part in filter(None, (part.strip() for part in text.split(','))):
+        match = re.fullmatch(r'/?([^=@\s]+)(?:@(\w+))?\s*=\s*(500|timeout)(?:/(\d+))?', part)
+        if not match:
+            raise ValueError(f"Invalid fault '{part}', expected '<path>[@<user>]=<500|timeout>[/<every>]'")
+        path, user, kind, every = match.groups()
+        faults.append(Fault(path, 'error' if kind == '500' else 'timeout', int(every or 1), user))
+    return faults
+
+
+def product_image(name, size=(240, 300)) -> bytes:
+    """Returns a JPEG standing in for a product picture, the same bytes for the same name on every run.
+
+    :param name: Media file name, its checksum picks the colors.
+    :param size: Width and height in pixels.
+    """
+    seed = zlib.crc32(name.encode())
+    background = (seed & 0xff, (seed >> 8) & 0xff, (seed >> 16) & 0xff)
+    image = Image.new('RGB', size, (200, 200, 200) if name == 'sl-404.jpg' else background)
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((size[0] // 6, size[1] // 6, size[0] * 5 // 6, size[1] * 5 // 6),
+                   outline=tuple(255 - c for c in background), width=6)
+    draw.text((10, 10), name.split('-1200')[0], fill=(0, 0, 0))
+    buffer = io.BytesIO()
+    image.save(buffer, format='JPEG', quality=85)
+    return buffer.getvalue()
+
+
+class StandInSite:
+    """Local stand-in for https://www.saucedemo.com/ so the suite can run offline.
+
+    Serves a static copy of the Swag Labs pages the page objects use (login, inventory, item, cart,
+    checkout steps, complete), with the same element ids, classes and texts. On top of it:
+    - latency: per-user delays in seconds, keyed by page ('inventory.html', applied by the server to the
+      page request, by the app when it moves to the page with history.pushState) or by app action ('login',
+      'sort', applied in the browser). The logged in user is read from the session cookie, so every delay is
+      deterministic.
+    - faults: Fault instances answering 500 or hanging up on selected requests. In-app navigation requests no
+      page, so page faults only hit pages loaded from the server (driver.get, reloads).
+    Each pytest process starts its own site on a free port, so parallel workers never share state.
+    """
+
+    # performance_glitch_user's slow product page and sorting, below the default --wait_timeout
+    DEFAULT_LATENCY = {'performance_glitch_user': {'inventory.html': 3.0, 'sort': 1.0}}
+
+    def __init__(self, latency=None, faults=None, host='127.0.0.1', port=0):
+        """
+        :param latency: {user: {page or action: seconds}}, defaults to DEFAULT_LATENCY.
+        :param faults: List of Fault, see parse_faults.
+        :param host: Interface to listen on.
+        :param port: Port to listen on, 0 picks a free one.
+        """
+        if latency is None:
+            latency = {user: dict(delays) for user, delays in self.DEFAULT_LATENCY.items()}
+        self.latency = latency
+        self.faults = list(faults or [])
+        self.requests = {}  # Path -> number of requests
+        self.faults_injected = 0
+        self._media = {}
+        self._lock = threading.Lock()
+        self._stopping = threading.Event()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        # Release the connections held by timeout faults first, shutdown waits for them otherwise
+        self._stopping.set()
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def add_fault(self, fault):
+        with self._lock:
+            self.faults.append(fault)
+        return fault
+
+    def clear_faults(self):
+        with self._lock:
+            self.faults.clear()
+
+    def _fault_for(self, path, user):
+        with self._lock:
+            self.requests[path] = self.requests.get(path, 0) + 1
+            for fault in self.faults:
+                if fault.applies(path, user):
+                    self.faults_injected += 1
+                    return fault
+        return None
+
+    def _media_file(self, name):
+        with self._lock:
+            if name not in self._media:
+                self._media[name] = product_image(name)
+            return self._media[name]
+
+    def _static_file(self, path):
+        """Returns the bytes of a file below the site directory, None if there is none."""
+        full_path = os.path.realpath(os.path.join(SITE_DIR, path))
+        if not full_path.startswith(SITE_DIR + os.sep) or not os.path.isfile(full_path):
+            return None
+        with open(full_path, 'rb') as file:
+            return file.read()
+
+    def _config_script(self) -> bytes:
+        return f"window.STAND_IN = {json.dumps({'latency': self.latency})};\n".encode()
+
+    def _make_handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def _reply(self, status, body, content_type):
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('Cache-Control', 'no-store')
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _user(self):
+                cookie = SimpleCookie(self.headers.get('Cookie', ''))
+                return cookie['session-username'].value if 'session-username' in cookie else None
+
+            def do_GET(self):
+                path = urlsplit(self.path).path.lstrip('/')
+                user = self._user()
+
+                fault = site._fault_for(path, user)
+                if fault is not None and fault.kind == 'timeout':
+                    site._stopping.wait(fault.hang_seconds)
+                    self.close_connection = True
+                    return
+                if fault is not None:
+                    self._reply(500, b'Internal Server Error', 'text/plain; charset=utf-8')
+                    return
+
+                if path in PAGES:
+                    delay = site.latency.get(user, {}).get(path or 'index.html', 0)
+                    if delay:
+                        site._stopping.wait(delay)
+                    self._reply(200, site._static_file('index.html'), CONTENT_TYPES['.html'])
+                elif path == 'stand-in/config.js':
+                    self._reply(200, site._config_script(), CONTENT_TYPES['.js'])
+                elif path.startswith('static/media/') and path.split('/')[-1] in MEDIA:
+                    self._reply(200, site._media_file(path.split('/')[-1]), CONTENT_TYPES['.jpg'])
+                else:
+                    body = site._static_file(path) if path.startswith('static/') else None
+                    if body is None:
+                        self._reply(404, b'Not Found', 'text/plain; charset=utf-8')
+                    else:
+                        self._reply(200, body, CONTENT_TYPES.get(os.path.splitext(path)[1],
+                                                                 'application/octet-stream'))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
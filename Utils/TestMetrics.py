@@ -0,0 +1,42 @@
+import json
+
+# Metrics of the running test and totals of the session, both keyed by metric name
+_test_metrics = {}
+_session_totals = {}
+
+
+def start_test():
+    """Starts collecting metrics for a new test."""
+    _test_metrics.clear()
+
+
+def record(name, value=1):
+    """Adds a value to a metric of the running test (counts, seconds, bytes...).
+
+    :param name: Metric name, e.g. 'reset.seconds'.
+    :param value: Value added to the metric.
+    """
+    _test_metrics[name] = _test_metrics.get(name, 0) + value
+
+
+def finish_test() -> dict:
+    """Returns the metrics of the test that just ended and adds them to the session totals."""
+    metrics = dict(_test_metrics)
+    for name, value in metrics.items():
+        _session_totals[name] = _session_totals.get(name, 0) + value
+    _test_metrics.clear()
+    return metrics
+
+
+def session_totals() -> dict:
+    """Returns the metrics summed over all tests of the session."""
+    return dict(_session_totals)
+
+
+def format_metrics(metrics) -> str:
+    """Renders metrics as indented JSON, rounding seconds to milliseconds.
+
+    :param metrics: Dict of metric name -> value.
+    """
+    return json.dumps({name: round(value, 3) if isinstance(value, float) else value
+                       for name, value in sorted(metrics.items())}, indent=2)
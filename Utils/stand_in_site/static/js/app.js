@@ -0,0 +1,524 @@
+/*
+ * Stand-in copy of the Swag Labs single page app (https://www.saucedemo.com/), served by Utils/StandInSite.py.
+ * Every route serves the same index.html, the page is rendered from location.pathname like the original.
+ * Moving between pages stays in the document, like the original's router: the URL is changed with
+ * history.pushState and the new page is rendered in place.
+ * State lives where the original keeps it: the logged in user in the 'session-username' cookie, the cart as a
+ * JSON list of product ids under the 'cart-contents' localStorage key.
+ */
+(function () {
+    'use strict';
+
+    var PRODUCTS = [
+        {id: 4, name: 'Sauce Labs Backpack', price: 29.99, image: 'sauce-backpack-1200x1500.jpg',
+            desc: 'carry.allTheThings() with the sleek, streamlined Sly Pack that melds uncompromising style with ' +
+                'unequaled laptop and tablet protection.'},
+        {id: 0, name: 'Sauce Labs Bike Light', price: 9.99, image: 'bike-light-1200x1500.jpg',
+            desc: "A red light isn't the desired state in testing but it sure helps when riding your bike at night. " +
+                'Water-resistant with 3 lighting modes, 1 AAA battery included.'},
+        {id: 1, name: 'Sauce Labs Bolt T-Shirt', price: 15.99, image: 'bolt-shirt-1200x1500.jpg',
+            desc: 'Get your testing superhero on with the Sauce Labs bolt T-shirt. From American Apparel, 100% ' +
+                'ringspun combed cotton, heather gray with red bolt.'},
+        {id: 5, name: 'Sauce Labs Fleece Jacket', price: 49.99, image: 'sauce-pullover-1200x1500.jpg',
+            desc: "It's not every day that you come across a midweight quarter-zip fleece jacket capable of handling " +
+                'everything from a relaxing day outdoors to a busy day at the office.'},
+        {id: 2, name: 'Sauce Labs Onesie', price: 7.99, image: 'red-onesie-1200x1500.jpg',
+            desc: 'Rib snap infant onesie for the junior automation engineer in development. Reinforced 3-snap ' +
+                "bottom closure, two-needle hemmed sleeved and bottom won't unravel."},
+        {id: 3, name: 'Test.allTheThings() T-Shirt (Red)', price: 15.99, image: 'red-tatt-1200x1500.jpg',
+            desc: 'This classic Sauce Labs t-shirt is perfect to wear when cozying up to your keyboard to automate a ' +
+                'few tests. Super-soft and comfy ringspun combed cotton.'}
+    ];
+    var BROKEN_IMAGE = 'sl-404.jpg';
+    var USERS = ['standard_user', 'locked_out_user', 'problem_user', 'performance_glitch_user', 'error_user',
+        'visual_user'];
+    var PASSWORD = 'secret_sauce';
+    var SESSION_COOKIE = 'session-username';
+    var CART_KEY = 'cart-contents';
+    var SORTS = [['az', 'Name (A to Z)'], ['za', 'Name (Z to A)'], ['lohi', 'Price (low to high)'],
+        ['hilo', 'Price (high to low)']];
+
+    // Per-user client side delays in seconds, written by the server: {user: {action: seconds}}
+    var config = window.STAND_IN || {latency: {}};
+
+    // ---- State ----
+
+    function currentUser() {
+        var prefix = SESSION_COOKIE + '=';
+        var cookie = document.cookie.split('; ').find(function (c) { return c.indexOf(prefix) === 0; });
+        return cookie ? cookie.substring(prefix.length) : null;
+    }
+
+    function setUser(user) {
+        document.cookie = SESSION_COOKIE + '=' + (user || '') + '; path=/' +
+            (user ? '' : '; expires=Thu, 01 Jan 1970 00:00:00 GMT');
+    }
+
+    function cart() {
+        try {
+            return JSON.parse(window.localStorage.getItem(CART_KEY)) || [];
+        } catch (e) {
+            return [];
+        }
+    }
+
+    function saveCart(ids) {
+        if (ids.length) {
+            window.localStorage.setItem(CART_KEY, JSON.stringify(ids.slice().sort(function (a, b) { return a - b; })));
+        } else {
+            window.localStorage.removeItem(CART_KEY);
+        }
+    }
+
+    function delay(action, user, callback) {
+        var seconds = ((config.latency || {})[user] || {})[action];
+        if (seconds) {
+            window.setTimeout(callback, seconds * 1000);
+        } else {
+            callback();
+        }
+    }
+
+    function product(id) {
+        return PRODUCTS.find(function (p) { return p.id === id; });
+    }
+
+    // ---- User quirks, reproduced deterministically ----
+
+    function imageOf(p, user, onInventory) {
+        if (user === 'problem_user' || (user === 'visual_user' && onInventory && p.id === 4)) {
+            return '/static/media/' + BROKEN_IMAGE;
+        }
+        return '/static/media/' + p.image;
+    }
+
+    function priceOf(p, user, onInventory) {
+        if (user === 'visual_user' && onInventory) {
+            // Every product shows the price of the next one
+            return PRODUCTS[(PRODUCTS.indexOf(p) + 1) % PRODUCTS.length].price;
+        }
+        return p.price;
+    }
+
+    function canAdd(p, user) {
+        return !(user === 'error_user' && p.id % 2 === 1);
+    }
+
+    // ---- DOM helpers ----
+
+    function el(tag, attributes, children) {
+        var node = document.createElement(tag);
+        Object.keys(attributes || {}).forEach(function (name) {
+            if (name === 'text') {
+                node.textContent = attributes[name];
+            } else if (name === 'html') {
+                node.innerHTML = attributes[name];
+            } else if (name.indexOf('on') === 0) {
+                node.addEventListener(name.substring(2), attributes[name]);
+            } else {
+                node.setAttribute(name, attributes[name]);
+            }
+        });
+        (children || []).forEach(function (child) { if (child) node.appendChild(child); });
+        return node;
+    }
+
+    function slug(name) {
+        return name.toLowerCase().replace(/ /g, '-');
+    }
+
+    function money(value) {
+        return '$' + value.toFixed(2);
+    }
+
+    // In-app navigation, the page's delay is applied by the app since no page is requested from the server
+    function go(page) {
+        delay(page.split('?')[0] || 'index.html', currentUser(), function () {
+            window.history.pushState(null, '', '/' + page);
+            route();
+        });
+    }
+
+    function errorBox(container, message) {
+        container.innerHTML = '';
+        container.className = 'error-message-container' + (message ? ' error' : '');
+        if (message) {
+            var close = el('button', {'class': 'error-button', 'data-test': 'error-button', 'aria-label': 'close',
+                onclick: function (event) { event.preventDefault(); errorBox(container, null); }});
+            container.appendChild(el('h3', {'data-test': 'error'}, [close, document.createTextNode(message)]));
+        }
+        document.querySelectorAll('.form_input').forEach(function (input) {
+            input.classList.toggle('input_error', !!message);
+        });
+    }
+
+    // ---- Shared layout ----
+
+    function cartBadge(link) {
+        var count = cart().length;
+        var badge = link.querySelector('.shopping_cart_badge');
+        if (!count && badge) badge.remove();
+        if (count && !badge) link.appendChild(el('span', {'class': 'shopping_cart_badge', 'data-test': 'shopping-cart-badge'}));
+        if (count) link.querySelector('.shopping_cart_badge').textContent = String(count);
+    }
+
+    function refreshBadge() {
+        cartBadge(document.querySelector('.shopping_cart_link'));
+    }
+
+    function layout(title, secondary, content) {
+        var menu = el('div', {'class': 'bm-menu-wrap', 'aria-hidden': 'true', hidden: ''}, [
+            el('nav', {'class': 'bm-item-list'}, [
+                el('a', {id: 'inventory_sidebar_link', 'class': 'bm-item menu-item', href: '/inventory.html',
+                    text: 'All Items'}),
+                el('a', {id: 'about_sidebar_link', 'class': 'bm-item menu-item', href: 'https://saucelabs.com/',
+                    text: 'About'}),
+                el('a', {id: 'logout_sidebar_link', 'class': 'bm-item menu-item', text: 'Logout',
+                    onclick: function () { setUser(null); go(''); }}),
+                el('a', {id: 'reset_sidebar_link', 'class': 'bm-item menu-item', text: 'Reset App State',
+                    onclick: function () { saveCart([]); refreshBadge(); resetButtons(); }})
+            ]),
+            el('button', {id: 'react-burger-cross-btn', type: 'button', text: 'Close Menu',
+                onclick: function () { menu.hidden = true; menu.setAttribute('aria-hidden', 'true'); }})
+        ]);
+        var cartLink = el('a', {'class': 'shopping_cart_link', 'data-test': 'shopping-cart-link', href: '/cart.html'});
+        cartBadge(cartLink);
+
+        var root = document.getElementById('root');
+        root.innerHTML = '';
+        root.appendChild(el('div', {id: 'page_wrapper', 'class': 'page_wrapper'}, [
+            el('div', {id: 'contents_wrapper'}, [
+                el('div', {id: 'header_container', 'class': 'header_container'}, [
+                    el('div', {'class': 'primary_header'}, [
+                        el('div', {id: 'menu_button_container'}, [
+                            el('div', {'class': 'bm-burger-button'}, [
+                                el('button', {id: 'react-burger-menu-btn', type: 'button', text: 'Open Menu',
+                                    onclick: function () { menu.hidden = false; menu.setAttribute('aria-hidden', 'false'); }})
+                            ]),
+                            menu
+                        ]),
+                        el('div', {'class': 'header_label'}, [el('div', {'class': 'app_logo', text: 'Swag Labs'})]),
+                        el('div', {id: 'shopping_cart_container', 'class': 'shopping_cart_container'}, [cartLink])
+                    ]),
+                    el('div', {'class': 'header_secondary_container'},
+                        [el('span', {'class': 'title', 'data-test': 'title', text: title})].concat(secondary || []))
+                ]),
+                content
+            ]),
+            el('footer', {'class': 'footer'}, [
+                el('ul', {'class': 'social'}, [
+                    el('li', {'class': 'social_twitter'}, [el('a', {href: 'https://twitter.com/saucelabs',
+                        target: '_blank', rel: 'noreferrer', text: 'Twitter'})]),
+                    el('li', {'class': 'social_facebook'}, [el('a', {href: 'https://www.facebook.com/saucelabs',
+                        target: '_blank', rel: 'noreferrer', text: 'Facebook'})]),
+                    el('li', {'class': 'social_linkedin'}, [el('a', {href: 'https://www.linkedin.com/company/sauce-labs/',
+                        target: '_blank', rel: 'noreferrer', text: 'LinkedIn'})])
+                ]),
+                el('div', {'class': 'footer_copy', text: '© 2024 Sauce Labs. All Rights Reserved. Sell my personal information.'})
+            ])
+        ]));
+    }
+
+    // Add / remove buttons are updated in place, so element references held by a test stay valid
+    function cartButton(p, user, idPrefix) {
+        var button = el('button', {'class': 'btn btn_small'});
+        function update() {
+            var inCart = cart().indexOf(p.id) >= 0;
+            var id = inCart ? 'remove' : 'add-to-cart';
+            button.id = idPrefix === null ? id : id + '-' + slug(p.name);
+            button.setAttribute('name', button.id);
+            button.setAttribute('data-test', button.id);
+            button.textContent = inCart ? 'Remove' : 'Add to cart';
+            button.className = 'btn btn_small btn_inventory ' + (inCart ? 'btn_secondary' : 'btn_primary');
+        }
+        button.addEventListener('click', function () {
+            var ids = cart();
+            if (ids.indexOf(p.id) >= 0) {
+                saveCart(ids.filter(function (id) { return id !== p.id; }));
+            } else if (canAdd(p, user)) {
+                saveCart(ids.concat([p.id]));
+            } else {
+                console.error('Failed to add item to the cart.');
+            }
+            update();
+            refreshBadge();
+        });
+        button.updateFromCart = update;
+        update();
+        return button;
+    }
+
+    function resetButtons() {
+        document.querySelectorAll('button.btn_inventory').forEach(function (button) {
+            if (button.updateFromCart) button.updateFromCart();
+        });
+    }
+
+    // ---- Pages ----
+
+    function loginPage(message) {
+        var user = el('input', {'class': 'input_error form_input', placeholder: 'Username', type: 'text',
+            'data-test': 'username', id: 'user-name', name: 'user-name', autocorrect: 'off', autocapitalize: 'none'});
+        var password = el('input', {'class': 'input_error form_input', placeholder: 'Password', type: 'password',
+            'data-test': 'password', id: 'password', name: 'password', autocorrect: 'off', autocapitalize: 'none'});
+        var errors = el('div', {'class': 'error-message-container'});
+        var form = el('form', {onsubmit: function (event) {
+            event.preventDefault();
+            var name = user.value, secret = password.value;
+            if (!name) return errorBox(errors, 'Epic sadface: Username is required');
+            if (!secret) return errorBox(errors, 'Epic sadface: Password is required');
+            if (USERS.indexOf(name) < 0 || secret !== PASSWORD) {
+                return errorBox(errors, 'Epic sadface: Username and password do not match any user in this service');
+            }
+            if (name === 'locked_out_user') return errorBox(errors, 'Epic sadface: Sorry, this user has been locked out.');
+            delay('login', name, function () {
+                setUser(name);
+                go('inventory.html');
+            });
+        }}, [
+            el('div', {'class': 'form_group'}, [user]),
+            el('div', {'class': 'form_group'}, [password]),
+            errors,
+            el('input', {type: 'submit', 'class': 'submit-button btn_action', 'data-test': 'login-button',
+                id: 'login-button', name: 'login-button', value: 'Login'})
+        ]);
+
+        var root = document.getElementById('root');
+        root.innerHTML = '';
+        root.appendChild(el('div', {'class': 'login_container'}, [
+            el('div', {'class': 'login_logo', text: 'Swag Labs'}),
+            el('div', {'class': 'login_wrapper'}, [
+                el('div', {'class': 'login_wrapper-inner'}, [
+                    el('div', {id: 'login_button_container', 'class': 'form_column'}, [
+                        el('div', {'class': 'login-box'}, [form])
+                    ])
+                ]),
+                el('div', {'class': 'login_credentials_wrap'}, [
+                    el('div', {'class': 'login_credentials_wrap-inner'}, [
+                        el('div', {id: 'login_credentials', 'class': 'login_credentials', 'data-test': 'login-credentials',
+                            html: '<h4>Accepted usernames are:</h4>' + USERS.join('<br>') + '<br>'}),
+                        el('div', {'class': 'login_password', 'data-test': 'login-password',
+                            html: '<h4>Password for all users:</h4>' + PASSWORD})
+                    ])
+                ])
+            ])
+        ]));
+        errorBox(errors, message);
+        document.querySelectorAll('.form_input').forEach(function (input) {
+            input.classList.toggle('input_error', !!message);
+        });
+    }
+
+    function inventoryPage(user) {
+        var list = el('div', {'class': 'inventory_list', 'data-test': 'inventory-list'});
+        var sortBy = 'az';
+        var sorters = {
+            az: function (a, b) { return a.name < b.name ? -1 : 1; },
+            za: function (a, b) { return a.name < b.name ? 1 : -1; },
+            lohi: function (a, b) { return priceOf(a, user, true) - priceOf(b, user, true) || (a.name < b.name ? -1 : 1); },
+            hilo: function (a, b) { return priceOf(b, user, true) - priceOf(a, user, true) || (a.name < b.name ? -1 : 1); }
+        };
+
+        function render() {
+            list.innerHTML = '';
+            PRODUCTS.slice().sort(sorters[sortBy]).forEach(function (p) {
+                list.appendChild(el('div', {'class': 'inventory_item', 'data-test': 'inventory-item'}, [
+                    el('div', {'class': 'inventory_item_img'}, [
+                        el('a', {id: 'item_' + p.id + '_img_link', href: '/inventory-item.html?id=' + p.id}, [
+                            el('img', {alt: p.name, 'class': 'inventory_item_img', src: imageOf(p, user, true)})
+                        ])
+                    ]),
+                    el('div', {'class': 'inventory_item_description'}, [
+                        el('div', {'class': 'inventory_item_label'}, [
+                            el('a', {id: 'item_' + p.id + '_title_link', href: '/inventory-item.html?id=' + p.id}, [
+                                el('div', {'class': 'inventory_item_name', 'data-test': 'inventory-item-name', text: p.name})
+                            ]),
+                            el('div', {'class': 'inventory_item_desc', 'data-test': 'inventory-item-desc', text: p.desc})
+                        ]),
+                        el('div', {'class': 'pricebar'}, [
+                            el('div', {'class': 'inventory_item_price', 'data-test': 'inventory-item-price',
+                                text: money(priceOf(p, user, true))}),
+                            cartButton(p, user, '')
+                        ])
+                    ])
+                ]));
+            });
+        }
+
+        var select = el('select', {'class': 'product_sort_container', 'data-test': 'product-sort-container',
+            onchange: function () {
+                var value = select.value;
+                delay('sort', user, function () { sortBy = value; render(); });
+            }}, SORTS.map(function (s) { return el('option', {value: s[0], text: s[1]}); }));
+        var sortLabel = el('span', {'class': 'select_container'}, [select]);
+
+        layout('Products', [sortLabel], el('div', {id: 'inventory_container', 'class': 'inventory_container'}, [list]));
+        render();
+    }
+
+    function itemPage(user) {
+        var id = parseInt(new URLSearchParams(window.location.search).get('id'), 10);
+        var p = product(id);
+        var back = el('button', {id: 'back-to-products', 'class': 'btn btn_secondary back btn_large',
+            'data-test': 'back-to-products', text: 'Back to products', onclick: function () { go('inventory.html'); }});
+        var details = p ? el('div', {'class': 'inventory_details_container'}, [
+            el('div', {'class': 'inventory_details'}, [
+                el('img', {alt: p.name, 'class': 'inventory_details_img', src: imageOf(p, user, false)}),
+                el('div', {'class': 'inventory_details_desc_container'}, [
+                    el('div', {'class': 'inventory_details_name large_size', 'data-test': 'inventory-item-name', text: p.name}),
+                    el('div', {'class': 'inventory_details_desc large_size', 'data-test': 'inventory-item-desc', text: p.desc}),
+                    el('div', {'class': 'inventory_details_price', 'data-test': 'inventory-item-price',
+                        text: money(priceOf(p, user, false))}),
+                    cartButton(p, user, null)
+                ])
+            ])
+        ]) : el('div', {'class': 'inventory_details_name large_size', text: 'ITEM NOT FOUND'});
+        layout('', [back], el('div', {id: 'inventory_item_container', 'class': 'inventory_item_container'}, [details]));
+    }
+
+    function cartItems(withButtons) {
+        return cart().map(product).filter(Boolean).map(function (p) {
+            var row = el('div', {'class': 'cart_item', 'data-test': 'inventory-item'}, [
+                el('div', {'class': 'cart_quantity', 'data-test': 'item-quantity', text: '1'}),
+                el('div', {'class': 'cart_item_label'}, [
+                    el('a', {id: 'item_' + p.id + '_title_link', href: '/inventory-item.html?id=' + p.id}, [
+                        el('div', {'class': 'inventory_item_name', 'data-test': 'inventory-item-name', text: p.name})
+                    ]),
+                    el('div', {'class': 'inventory_item_desc', text: p.desc}),
+                    el('div', {'class': 'item_pricebar'}, [
+                        el('div', {'class': 'inventory_item_price', 'data-test': 'inventory-item-price', text: money(p.price)})
+                    ])
+                ])
+            ]);
+            if (withButtons) {
+                row.querySelector('.item_pricebar').appendChild(el('button', {
+                    id: 'remove-' + slug(p.name), name: 'remove-' + slug(p.name), 'class': 'btn btn_secondary btn_small cart_button',
+                    text: 'Remove', onclick: function () {
+                        saveCart(cart().filter(function (id) { return id !== p.id; }));
+                        row.remove();
+                        refreshBadge();
+                    }}));
+            }
+            return row;
+        });
+    }
+
+    function cartPage() {
+        layout('Your Cart', [], el('div', {id: 'cart_contents_container'}, [
+            el('div', {'class': 'cart_list'}, [
+                el('div', {'class': 'cart_quantity_label', text: 'QTY'}),
+                el('div', {'class': 'cart_desc_label', text: 'Description'})
+            ].concat(cartItems(true))),
+            el('div', {'class': 'cart_footer'}, [
+                el('button', {id: 'continue-shopping', 'class': 'btn btn_secondary back btn_medium', text: 'Continue Shopping',
+                    onclick: function () { go('inventory.html'); }}),
+                el('button', {id: 'checkout', 'class': 'btn btn_action btn_medium checkout_button', text: 'Checkout',
+                    onclick: function () { go('checkout-step-one.html'); }})
+            ])
+        ]));
+    }
+
+    function checkoutInfoPage() {
+        function field(id, placeholder) {
+            return el('div', {'class': 'form_group'}, [el('input', {'class': 'input_error form_input', placeholder: placeholder,
+                type: 'text', id: id, name: id, 'data-test': id, autocorrect: 'off', autocapitalize: 'none'})]);
+        }
+        var errors = el('div', {'class': 'error-message-container'});
+        var form = el('form', {onsubmit: function (event) {
+            event.preventDefault();
+            var missing = [['first-name', 'First Name'], ['last-name', 'Last Name'], ['postal-code', 'Postal Code']]
+                .find(function (f) { return !document.getElementById(f[0]).value; });
+            if (missing) return errorBox(errors, 'Error: ' + missing[1] + ' is required');
+            go('checkout-step-two.html');
+        }}, [
+            el('div', {'class': 'checkout_info'}, [field('first-name', 'First Name'), field('last-name', 'Last Name'),
+                field('postal-code', 'Zip/Postal Code'), errors]),
+            el('div', {'class': 'checkout_buttons'}, [
+                el('button', {id: 'cancel', type: 'button', 'class': 'btn btn_secondary back btn_medium cart_cancel_link',
+                    text: 'Cancel', onclick: function () { go('cart.html'); }}),
+                el('input', {type: 'submit', 'class': 'submit-button btn btn_primary cart_button btn_action', id: 'continue',
+                    name: 'continue', 'data-test': 'continue', value: 'Continue'})
+            ])
+        ]);
+        layout('Checkout: Your Information', [], el('div', {id: 'checkout_info_container', 'class': 'checkout_info_container'},
+            [el('div', {'class': 'checkout_info_wrapper'}, [form])]));
+        errorBox(errors, null);
+    }
+
+    function checkoutOverviewPage() {
+        var subtotal = cart().map(product).filter(Boolean).reduce(function (sum, p) { return sum + p.price; }, 0);
+        var tax = Math.round(subtotal * 8) / 100;
+        layout('Checkout: Overview', [], el('div', {id: 'checkout_summary_container', 'class': 'checkout_summary_container'}, [
+            el('div', {'class': 'cart_list'}, cartItems(false)),
+            el('div', {'class': 'summary_info'}, [
+                el('div', {'class': 'summary_info_label', text: 'Payment Information:'}),
+                el('div', {'class': 'summary_value_label', text: 'SauceCard #31337'}),
+                el('div', {'class': 'summary_info_label', text: 'Shipping Information:'}),
+                el('div', {'class': 'summary_value_label', text: 'Free Pony Express Delivery!'}),
+                el('div', {'class': 'summary_info_label', text: 'Price Total'}),
+                el('div', {'class': 'summary_subtotal_label', 'data-test': 'subtotal-label', text: 'Item total: ' + money(subtotal)}),
+                el('div', {'class': 'summary_tax_label', 'data-test': 'tax-label', text: 'Tax: ' + money(tax)}),
+                el('div', {'class': 'summary_info_label summary_total_label', 'data-test': 'total-label',
+                    text: 'Total: ' + money(Math.round((subtotal + tax) * 100) / 100)}),
+                el('div', {'class': 'cart_footer'}, [
+                    el('button', {id: 'cancel', 'class': 'btn btn_secondary back btn_medium cart_cancel_link', text: 'Cancel',
+                        onclick: function () { go('inventory.html'); }}),
+                    el('button', {id: 'finish', 'class': 'btn btn_action btn_medium cart_button', 'data-test': 'finish',
+                        text: 'Finish', onclick: function () { saveCart([]); go('checkout-complete.html'); }})
+                ])
+            ])
+        ]));
+    }
+
+    function checkoutCompletePage() {
+        layout('Checkout: Complete!', [], el('div', {id: 'checkout_complete_container', 'class': 'checkout_complete_container'}, [
+            el('h2', {'class': 'complete-header', 'data-test': 'complete-header', text: 'Thank you for your order!'}),
+            el('div', {'class': 'complete-text', 'data-test': 'complete-text',
+                text: 'Your order has been dispatched, and will arrive just as fast as the pony can get there!'}),
+            el('button', {id: 'back-to-products', 'class': 'btn btn_primary btn_small', text: 'Back Home',
+                onclick: function () { go('inventory.html'); }})
+        ]));
+    }
+
+    // ---- Routing ----
+
+    var PAGES = {
+        'inventory.html': inventoryPage,
+        'inventory-item.html': itemPage,
+        'cart.html': cartPage,
+        'checkout-step-one.html': checkoutInfoPage,
+        'checkout-step-two.html': checkoutOverviewPage,
+        'checkout-complete.html': checkoutCompletePage
+    };
+
+    function route() {
+        var page = window.location.pathname.split('/').pop();
+        var user = currentUser();
+        window.scrollTo(0, 0);
+        if (!PAGES[page]) {
+            loginPage(window.sessionStorage.getItem('login-error'));
+            window.sessionStorage.removeItem('login-error');
+        } else if (!user || USERS.indexOf(user) < 0) {
+            window.sessionStorage.setItem('login-error',
+                "Epic sadface: You can only access '/" + page + "' when you are logged in.");
+            window.history.replaceState(null, '', '/');
+            route();
+        } else {
+            PAGES[page](user);
+        }
+    }
+
+    // Links to other pages of the app are followed in the document too
+    document.addEventListener('click', function (event) {
+        var link = event.target.closest && event.target.closest('a[href^="/"]');
+        if (!link || event.defaultPrevented || event.button !== 0 || event.ctrlKey || event.metaKey ||
+                event.shiftKey) {
+            return;
+        }
+        event.preventDefault();
+        go(link.getAttribute('href').substring(1));
+    });
+    window.addEventListener('popstate', route);
+
+    route();
+})();
@@ -2,6 +2,7 @@ import os
 import json
 import time
 from datetime import datetime
+import allure
 import pytest
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service as ChromeService
@@ -13,6 +14,25 @@ from selenium.webdriver.edge.options import Options as EdgeOptions
 from allure_commons._allure import label
 import logging
 
+from Utils.BaseClass import BaseClass
+from Utils.ChromeTrace import ChromeTracer, enable_trace_logging
+from Utils.CommandProfiler import CommandProfiler
+from Utils.CpuProfiles import CPU_PROFILES, apply_cpu_profile, cpu_comparison_table, get_cpu_profile
+from Utils.DevTools import browser_name, supports_cdp
+from Utils.DriverPool import DriverPool
+from Utils.GridScheduler import GridScheduler
+from Utils.LoadRunner import LoadRunner, ThinkTime, parse_stages
+from Utils.MemoryMonitor import MemoryMonitor
+from Utils.MethodProfiler import MethodProfiler
+from Utils.NetworkProfiles import NETWORK_PROFILES, apply_network_profile, get_network_profile
+from Utils.Parallel import FileLock, is_xdist_worker, merge_worker_logs
+from Utils.PerfHarness import PerfHarness
+from Utils.PerfHistory import PerfHistory
+from Utils.RunBenchmark import RunLog, pool_comparison, scaling_table, selection_key
+from Utils.ResourceMonitor import MB, ResourceMonitor
+from Utils.StandInSite import StandInSite, parse_faults
+from Utils import TestMetrics
+
 # Logger setup
 logger = logging.getLogger(__name__)
 logger.setLevel(logging.INFO)
@@ -21,6 +41,36 @@ logger.addHandler(console_handler)
 
 # Constants
 RUN_LABEL_FILE = "Reports/run_label.txt"
+RUN_BENCHMARK_FILE = "Reports/run_benchmarks.json"
+DRIVER_SCOPES = ("session", "module", "class", "function")
+
+# Session-wide pool of warm drivers, created by the driver_pool fixture
+driver_pool = None
+
+# Remote endpoint scheduler for --run_env docker, created with the driver pool
+grid_scheduler = None
+
+# Set on a test item when one of its phases failed or xfailed, its captured log is then kept
+log_kept_key = pytest.StashKey[bool]()
+
+# Summaries of the load profiles run in this process
+load_summaries = []
+
+# Records a performance trace around every browser test body with --chrome_trace
+chrome_tracer = None
+
+# Counts the WebDriver round trips of every test body with --command_profile or --max_round_trips
+command_profiler = None
+
+# Measures the CPU, memory and I/O of the local driver and browser processes per test with --resource_monitor
+resource_monitor = None
+
+# Local copy of the application under test, started by --stand_in (one per process)
+stand_in_site = None
+
+# Parallel run bookkeeping (controller process only)
+session_start_time = None
+worker_summaries = {}
 
 
 def get_next_run_label():
@@ -29,20 +79,26 @@ def get_next_run_label():
 
     If the label file exists, reads the current label, increments it, and writes the updated label back to the file.
     If the file doesn't exist, starts with a default label of 0.
+    The read-increment-write is done under a file lock and the new label is written atomically, so concurrent
+    sessions never get the same label.
 
     Returns:
         int: The next run label.
     """
-    if os.path.exists(RUN_LABEL_FILE):
-        with open(RUN_LABEL_FILE, "r") as file:
-            current_label = int(file.read().strip())
-    else:
-        current_label = 0
+    os.makedirs(os.path.dirname(RUN_LABEL_FILE), exist_ok=True)
+    with FileLock(RUN_LABEL_FILE + ".lock"):
+        if os.path.exists(RUN_LABEL_FILE):
+            with open(RUN_LABEL_FILE, "r") as file:
+                current_label = int(file.read().strip() or 0)
+        else:
+            current_label = 0
 
-    next_label = current_label + 1
+        next_label = current_label + 1
 
-    with open(RUN_LABEL_FILE, "w") as file:
-        file.write(str(next_label))
+        temp_file = RUN_LABEL_FILE + ".tmp"
+        with open(temp_file, "w") as file:
+            file.write(str(next_label))
+        os.replace(temp_file, RUN_LABEL_FILE)
 
     return next_label
 
@@ -73,12 +129,27 @@ def create_executor_file(allure_results_dir, run_label):
     logger.info(f"Executor file created: {executor_file_path}")
 
 
+def set_perf_run_key(config):
+    """
+    Key the perf samples of this session by run label, browser and environment in the perf history.
+
+    Args:
+        config (Config): The pytest configuration object.
+
+    Returns:
+        None
+    """
+    PerfHarness.run_key = (global_run_label, config.getoption("browser_type"), config.getoption("run_env"))
+
+
 @pytest.hookimpl(tryfirst=True)
 def pytest_sessionstart(session):
     """
     Generate and set the run label at the start of the test session.
 
     Also creates an executor.json file in the allure results directory.
+    In a parallel run the label is allocated once by the controller and handed to the workers,
+    which neither allocate a label nor write the executor file.
 
     Args:
         session (Session): The pytest session object.
@@ -86,10 +157,18 @@ def pytest_sessionstart(session):
     Returns:
         None
     """
-    global global_run_label
+    global global_run_label, session_start_time
+    if is_xdist_worker(session.config):
+        global_run_label = session.config.workerinput["run_label"]
+        label(session, "build", str(global_run_label))
+        set_perf_run_key(session.config)
+        return
+
+    session_start_time = time.perf_counter()
     global_run_label = get_next_run_label()
     logger.info(f"Run label for this session: {global_run_label}")
     label(session, "build", str(global_run_label))
+    set_perf_run_key(session.config)
 
     allure_results_dir = os.environ.get("ALLURE_RESULTS_PATH", "Reports/allure-results/default")
     logger.info(f"Using allure results directory: {allure_results_dir}")
@@ -97,6 +176,93 @@ def pytest_sessionstart(session):
     create_executor_file(allure_results_dir, global_run_label)
 
 
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    """
+    Hand the session's run label to a pytest-xdist worker before it starts.
+
+    Args:
+        node (WorkerController): The xdist worker being configured.
+
+    Returns:
+        None
+    """
+    node.workerinput["run_label"] = global_run_label
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_testnodedown(node, error):
+    """
+    Collect the end-of-run summaries reported by a pytest-xdist worker when it finishes.
+
+    Args:
+        node (WorkerController): The xdist worker that went down.
+        error (str): The error of the worker, if it crashed.
+
+    Returns:
+        None
+    """
+    summary = getattr(node, "workeroutput", {}).get("summary")
+    if summary:
+        worker_summaries[node.gateway.id] = summary
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_cmdline_main(config):
+    """
+    Translate --workers into a pytest-xdist run that keeps every test class on one worker.
+
+    Implemented as a wrapper so the options are in place before pytest-xdist reads them.
+
+    Args:
+        config (Config): The pytest configuration object.
+
+    Returns:
+        None
+    """
+    workers = config.getoption("workers")
+    # Workers receive the controller's command line, only the controller distributes
+    if workers and not is_xdist_worker(config):
+        if not config.pluginmanager.hasplugin("xdist"):
+            raise pytest.UsageError("--workers requires pytest-xdist (pip install pytest-xdist)")
+        config.option.numprocesses = workers if workers == "auto" else int(workers)
+        # Class-scoped fixtures (drivers, data) must not be split across workers
+        config.option.dist = "loadscope"
+    yield
+
+
+def pytest_sessionfinish(session, exitstatus):
+    """
+    Merge the per-worker log files once all workers are done, and report this worker's summaries.
+
+    Args:
+        session (Session): The pytest session object.
+        exitstatus (int): The exit status of the run.
+
+    Returns:
+        None
+    """
+    # Prewarmed browsers are created outside of the fixture, make sure none outlives the session
+    if driver_pool is not None:
+        driver_pool.shutdown()
+    if BaseClass.image_cache is not None:
+        BaseClass.image_cache.close()
+    if PerfHarness.history is not None:
+        PerfHarness.history.close()
+    if stand_in_site is not None:
+        stand_in_site.stop()
+    if resource_monitor is not None:
+        resource_monitor.stop()
+
+    # Flush the background log writer before the log files are merged
+    BaseClass.log_manager.shutdown()
+
+    if is_xdist_worker(session.config):
+        session.config.workeroutput["summary"] = end_of_run_summary()
+        return
+    merge_worker_logs(BaseClass.LOG_FILE)
+
+
 def pytest_addoption(parser):
     """
     Add custom command-line options for pytest.
@@ -113,6 +279,186 @@ def pytest_addoption(parser):
     parser.addoption(
         "--run_env", action="store", default="local", help="Specify the environment: local or docker"
     )
+    parser.addoption(
+        "--base_url", action="store", default=BaseClass.BASE_URL,
+        help="URL of the application under test"
+    )
+    parser.addoption(
+        "--stand_in", action="store_true", default=False,
+        help="Run against a local stand-in copy of the application instead of --base_url (no network needed)"
+    )
+    parser.addoption(
+        "--stand_in_faults", action="store", default="",
+        help="Faults injected by the stand-in site, e.g. 'inventory.html=500,cart.html@problem_user=timeout/3'"
+    )
+    parser.addoption(
+        "--ui_login", action="store_true", default=False,
+        help="Log in through the login form even in tests that use the session cookie fast path"
+    )
+    parser.addoption(
+        "--reset_mode", action="store", default="storage", choices=("storage", "ui"),
+        help="storage: reset the application by clearing cookies and web storage in one script call, "
+             "ui: reset through the sidebar menu"
+    )
+    parser.addoption(
+        "--keep_session", action="store_true", default=False,
+        help="Keep the logged in session across storage resets, so the next session login for the same user is free"
+    )
+    parser.addoption(
+        "--wait_timeout", action="store", type=float, default=4,
+        help="Seconds a page object waits for an element to appear (per-locator overrides excepted)"
+    )
+    parser.addoption(
+        "--poll_interval", action="store", type=float, default=0.1,
+        help="Seconds between two lookups while waiting for an element"
+    )
+    parser.addoption(
+        "--image_cache_dir", action="store", default="Reports/image_cache",
+        help="Directory of the on-disk image cache used by compare_images, empty to keep images in memory only"
+    )
+    parser.addoption(
+        "--json_log", action="store_true", default=False,
+        help="Write Logs/logfile.log as one JSON object per line instead of text lines"
+    )
+    parser.addoption(
+        "--log_capture", action="store_true", default=False,
+        help="Keep each test's log records in memory and write them only when the test fails or is xfailed"
+    )
+    parser.addoption(
+        "--log_capture_size", action="store", type=int, default=1000,
+        help="Number of log records kept per test by --log_capture, older records are dropped"
+    )
+    parser.addoption(
+        "--perf_warmup", action="store", type=int, default=1,
+        help="Untimed warmup iterations run before every action measured by the perf harness"
+    )
+    parser.addoption(
+        "--perf_iterations", action="store", type=int, default=10,
+        help="Timed iterations of every action measured by the perf harness"
+    )
+    parser.addoption(
+        "--perf_history", action="store", default="Reports/perf_history.db",
+        help="SQLite database keeping the perf samples of every run for regression detection, empty to disable"
+    )
+    parser.addoption(
+        "--perf_baseline_runs", action="store", type=int, default=10,
+        help="Number of earlier runs a perf step is compared with to detect regressions"
+    )
+    parser.addoption(
+        "--load_stages", action="store", default=None,
+        help="Run the load tests with this virtual user profile, e.g. '30s:5,2m:5,30s:0' (ramp-up, steady state, "
+             "ramp-down); load tests are skipped without it"
+    )
+    parser.addoption(
+        "--think_time", action="store", type=float, default=2.0,
+        help="Average pause in seconds of a virtual user between two steps of its flow"
+    )
+    parser.addoption(
+        "--think_model", action="store", default="exponential", choices=ThinkTime.MODELS,
+        help="Distribution of the virtual users' think time"
+    )
+    parser.addoption(
+        "--load_report_interval", action="store", type=float, default=5,
+        help="Seconds between two live throughput and latency reports of a load test"
+    )
+    parser.addoption(
+        "--network_profile", action="store", default="none",
+        help=f"Network conditions emulated in the browser (Chrome and Edge): {', '.join(NETWORK_PROFILES)} "
+             f"or custom:<latency ms>:<download kbps>[:<upload kbps>]"
+    )
+    parser.addoption(
+        "--network_matrix", action="store", default=None,
+        help="Comma separated network profiles, tests marked network_matrix run once per profile"
+    )
+    parser.addoption(
+        "--cpu_profile", action="store", default="1x",
+        help=f"Slow the browser's CPU down (Chrome and Edge): {', '.join(CPU_PROFILES)} or any '<slowdown>x'"
+    )
+    parser.addoption(
+        "--cpu_sweep", action="store_true", default=False,
+        help=f"Run the tests marked cpu_sweep once per CPU profile ({', '.join(CPU_PROFILES)}) and compare "
+             f"their latencies at the end of the run"
+    )
+    parser.addoption(
+        "--chrome_trace", action="store_true", default=False,
+        help="Record a Chrome performance trace around every browser test body (Chrome and Edge), stored gzipped "
+             "with its hot spots attached to the report"
+    )
+    parser.addoption(
+        "--chrome_trace_dir", action="store", default="Reports/traces",
+        help="Directory of the traces recorded by --chrome_trace"
+    )
+    parser.addoption(
+        "--memory_monitor", action="store_true", default=False,
+        help="Sample the page's JS heap, DOM nodes and event listeners at every page object creation and test end "
+             "(Chrome and Edge), flagging heap growth over --memory_budget_mb and growth across tests"
+    )
+    parser.addoption(
+        "--memory_budget_mb", action="store", type=float, default=10,
+        help="Largest heap growth within one test, in MB, before --memory_monitor flags it"
+    )
+    parser.addoption(
+        "--leak_runs", action="store", type=int, default=5,
+        help="Number of consecutive tests on the same driver a memory metric must grow in to be reported as a leak"
+    )
+    parser.addoption(
+        "--method_profile", action="store_true", default=False,
+        help="Time every public page object method, show each call as an allure step and print the slowest "
+             "methods of the run"
+    )
+    parser.addoption(
+        "--method_profile_top", action="store", type=int, default=15,
+        help="Number of methods listed in the hot path table of --method_profile"
+    )
+    parser.addoption(
+        "--command_profile", action="store_true", default=False,
+        help="Count and time the WebDriver commands of every browser test, by command and by the page object "
+             "method that sent them"
+    )
+    parser.addoption(
+        "--max_round_trips", action="store", type=int, default=None,
+        help="Round trip budget of every browser test (the max_round_trips marker overrides it), implies "
+             "--command_profile"
+    )
+    parser.addoption(
+        "--round_trip_budget", action="store", default="warn", choices=("warn", "fail"),
+        help="warn: report the tests going over their round trip budget, fail: fail them"
+    )
+    parser.addoption(
+        "--resource_monitor", action="store_true", default=False,
+        help="Measure the CPU time, peak memory (PSS) and I/O of the driver process and the browser it started during "
+             "every test (local drivers on Linux), and recommend a worker count for this machine"
+    )
+    parser.addoption(
+        "--resource_interval", action="store", type=float, default=0.5,
+        help="Seconds between two samples of the driver and browser processes with --resource_monitor"
+    )
+    parser.addoption(
+        "--driver_scope", action="store", default="class", choices=DRIVER_SCOPES,
+        help="How long a test keeps its leased browser: session, module, class or function"
+    )
+    parser.addoption(
+        "--driver_pool_size", action="store", type=int, default=1,
+        help="Maximum number of warm browsers kept by the driver pool"
+    )
+    parser.addoption(
+        "--driver_pool", action="store", default="on", choices=("on", "off"),
+        help="on: reuse warm browsers across leases, off: launch and quit a browser per lease (benchmark baseline)"
+    )
+    parser.addoption(
+        "--driver_prewarm", action="store", type=int, default=0,
+        help="Number of spare browsers launched in the background ahead of demand; "
+             "resets and quits then also run in the background"
+    )
+    parser.addoption(
+        "--grid_endpoints", action="store", default="http://localhost:4444",
+        help="Comma separated Remote endpoints for --run_env docker, each optionally with '=<slots>' "
+             "(e.g. http://node1:4444=4,http://node2:4444=2)"
+    )
+    parser.addoption(
+        "--workers", action="store", default=None,
+        help="Run test classes in parallel on N worker processes (or 'auto' for one per core), each with its own driver"
+    )
 
 
 def setup_browser_options(browser, run_env):
@@ -151,22 +497,23 @@ def setup_browser_options(browser, run_env):
         if run_env == "docker":
             options.add_argument("headless")
             options.add_argument("--disable-gpu")
+    if chrome_tracer is not None:
+        enable_trace_logging(options, browser)
     return options
 
 
-@pytest.fixture(scope="class")
-def setup_browser(request):
+def create_driver(browser_name, run_env, scheduler=None):
     """
-    Set up the WebDriver instance for the specified browser and environment.
+    Launch a new WebDriver instance for the specified browser and environment.
 
     Args:
-        request (FixtureRequest): The pytest request object.
+        browser_name (str): The browser type ('chrome', 'firefox', 'edge').
+        run_env (str): The environment ('local' or 'docker').
+        scheduler (GridScheduler): Picks the Remote endpoint for the docker environment.
 
-    Yields:
+    Returns:
         WebDriver: The initialized WebDriver instance.
     """
-    browser_name = request.config.getoption("browser_type")
-    run_env = request.config.getoption("run_env")
     driver = None
 
     if run_env == "local":
@@ -183,25 +530,571 @@ def setup_browser(request):
     elif run_env == "docker":
         logger.info("Running in DOCKER")
         if browser_name in ["chrome", "firefox", "edge"]:
-            driver = webdriver.Remote(
-                command_executor="http://localhost:4444",
-                options=setup_browser_options(browser_name, run_env),
-            )
+            driver = scheduler.create_driver(setup_browser_options(browser_name, run_env))
     else:
         raise ValueError("You should choose a browser between chrome, firefox, or edge")
 
-    driver.implicitly_wait(4)
-    driver.get("https://www.saucedemo.com/")
-    request.cls.driver = driver
+    # Lookups wait explicitly (BaseClass.find), so an absent element is reported right away
+    driver.implicitly_wait(0)
+    return driver
+
+
+def build_driver_pool(config):
+    """
+    Create the session-wide pool of WebDriver instances (and the grid scheduler for the docker environment).
+
+    Args:
+        config (Config): The pytest configuration object.
+
+    Returns:
+        DriverPool: The pool that setup_browser leases drivers from.
+    """
+    global driver_pool
+    prewarm = config.getoption("driver_prewarm")
+    # Spare browsers come on top of the ones leased by tests
+    driver_pool = new_driver_pool(config, config.getoption("driver_pool_size") + prewarm, prewarm)
+    return driver_pool
+
 
+def new_driver_pool(config, size, prewarm=0):
+    """
+    Create a pool of WebDriver instances for the configured browser and environment.
+
+    Args:
+        config (Config): The pytest configuration object.
+        size (int): Maximum number of drivers alive at the same time.
+        prewarm (int): Number of spare drivers launched ahead of demand.
+
+    Returns:
+        DriverPool: The new pool.
+    """
+    global grid_scheduler
+    browser_name = config.getoption("browser_type")
+    run_env = config.getoption("run_env")
+
+    driver_finalizer = None
+    if run_env == "docker":
+        if grid_scheduler is None:
+            grid_scheduler = GridScheduler.from_option(config.getoption("grid_endpoints"))
+        driver_finalizer = grid_scheduler.quit_driver
+
+    return DriverPool(
+        driver_factory=lambda: create_driver(browser_name, run_env, grid_scheduler),
+        base_url=BaseClass.BASE_URL,
+        size=size,
+        reuse=config.getoption("driver_pool") == "on",
+        driver_finalizer=driver_finalizer,
+        prewarm=prewarm,
+        background_teardown=prewarm > 0,
+    )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_collection(session):
+    """
+    Start prewarming browsers before collection, so their startup overlaps with it.
+
+    Skipped in the pytest-xdist controller, which runs no tests.
+
+    Args:
+        session (Session): The pytest session object.
+
+    Returns:
+        None
+    """
+    config = session.config
+    runs_tests = is_xdist_worker(config) or not getattr(config.option, "numprocesses", None)
+    if config.getoption("driver_prewarm") and runs_tests and not config.getoption("collectonly"):
+        build_driver_pool(config).prewarm()
     yield
-    time.sleep(4)
-    driver.quit()
+
+
+@pytest.fixture(scope="session")
+def setup_driver_pool(request):
+    """
+    Provide the session-wide pool of warm WebDriver instances.
+
+    Args:
+        request (FixtureRequest): The pytest request object.
+
+    Yields:
+        DriverPool: The pool that setup_browser leases drivers from.
+    """
+    pool = driver_pool or build_driver_pool(request.config)
+    yield pool
+    pool.shutdown()
+
+
+def determine_driver_scope(fixture_name, config):
+    """
+    Resolve the scope of setup_browser from the --driver_scope option.
+
+    Args:
+        fixture_name (str): The name of the fixture being scoped.
+        config (Config): The pytest configuration object.
+
+    Returns:
+        str: One of session, module, class or function.
+    """
+    return config.getoption("driver_scope")
+
+
+@pytest.fixture(scope=determine_driver_scope)
+def setup_browser(request, setup_driver_pool):
+    """
+    Lease a clean WebDriver from the pool for the configured scope and return it afterward.
+
+    The driver is bound to the test class as `driver`. For session and module scopes there is no single
+    class to bind to, so it is bound on BaseClass and shared by all its subclasses.
+
+    Args:
+        request (FixtureRequest): The pytest request object.
+        setup_driver_pool (DriverPool): The session-wide driver pool.
+
+    Yields:
+        WebDriver: The leased WebDriver instance.
+    """
+    driver = setup_driver_pool.lease()
+    target = request.cls if request.cls is not None else BaseClass
+    target.driver = driver
+
+    yield driver
+    setup_driver_pool.release(driver)
+
+
+def pytest_generate_tests(metafunc):
+    """
+    Run the tests marked network_matrix once per profile of --network_matrix, and the tests marked
+    cpu_sweep once per CPU profile with --cpu_sweep.
+
+    Args:
+        metafunc (Metafunc): The test function being parametrized.
+
+    Returns:
+        None
+    """
+    matrix = metafunc.config.getoption("network_matrix")
+    if matrix and metafunc.definition.get_closest_marker("network_matrix"):
+        names = [name.strip() for name in matrix.split(",") if name.strip()]
+        metafunc.parametrize("network_profile", names, indirect=True, ids=[f"net-{name}" for name in names])
+    if metafunc.config.getoption("cpu_sweep") and metafunc.definition.get_closest_marker("cpu_sweep"):
+        metafunc.parametrize("cpu_profile", list(CPU_PROFILES), indirect=True,
+                             ids=[f"cpu-{name}" for name in CPU_PROFILES])
+
+
+@pytest.fixture(autouse=True)
+def network_profile(request):
+    """
+    Emulate the test's network profile in its browser through the DevTools Protocol, and lift it afterward.
+
+    The profile comes from the --network_matrix parameter, else from the closest network_profile marker
+    (class or test), else from --network_profile. It is recorded in the test's properties, its allure
+    parameters and the names of its perf steps. Browsers without DevTools (Firefox) skip emulated tests.
+
+    Args:
+        request (FixtureRequest): The pytest request object.
+
+    Yields:
+        NetworkProfile: The active profile.
+    """
+    marker = request.node.get_closest_marker("network_profile")
+    name = getattr(request, "param", None) or (marker.args[0] if marker else None) \
+        or request.config.getoption("network_profile")
+    profile = get_network_profile(name)
+    if not profile.emulated or request.cls is None or not issubclass(request.cls, BaseClass):
+        yield profile
+        return
+
+    driver = devtools_driver(request, f"Network profile '{profile.name}'")
+    apply_network_profile(driver, profile)
+    request.node.user_properties.append(("network_profile", profile.name))
+    allure.dynamic.parameter("network profile", profile.name)
+    PerfHarness.conditions["network"] = profile.name
+    logger.info(f"Emulating network profile {profile}")
+
+    yield profile
+    PerfHarness.conditions.pop("network", None)
+    # The driver goes back to the pool, the next test starts on the runner's network
+    apply_network_profile(driver, NETWORK_PROFILES["none"])
+
+
+@pytest.fixture(autouse=True)
+def cpu_profile(request):
+    """
+    Throttle the CPU of the test's browser through the DevTools Protocol, and lift the throttling afterward.
+
+    The profile comes from the --cpu_sweep parameter, else from --cpu_profile. Its slowdown is recorded in the
+    test's metrics ("cpu.throttling_rate"), its allure parameters and the names of its perf steps. Browsers
+    without DevTools (Firefox) skip throttled tests.
+
+    Args:
+        request (FixtureRequest): The pytest request object.
+
+    Yields:
+        int: The slowdown factor, 1 when the CPU is not throttled.
+    """
+    name = getattr(request, "param", None) or request.config.getoption("cpu_profile")
+    rate = get_cpu_profile(name)
+    swept = hasattr(request, "param")
+    if (rate == 1 and not swept) or request.cls is None or not issubclass(request.cls, BaseClass):
+        yield rate
+        return
+
+    driver = devtools_driver(request, f"CPU profile '{name}'") if rate != 1 else None
+    if driver is not None:
+        apply_cpu_profile(driver, rate)
+        PerfHarness.conditions["cpu"] = name
+        logger.info(f"Throttling the browser CPU {rate}x")
+    TestMetrics.record("cpu.throttling_rate", rate)
+    allure.dynamic.parameter("cpu profile", name)
+
+    yield rate
+    if driver is not None:
+        PerfHarness.conditions.pop("cpu", None)
+        apply_cpu_profile(driver, 1)
+
+
+def devtools_driver(request, emulation):
+    """
+    Return the test's driver for a DevTools emulation, skipping the test when its browser has no DevTools.
+
+    Args:
+        request (FixtureRequest): The pytest request object.
+        emulation (str): What is emulated, for the skip reason.
+
+    Returns:
+        WebDriver: The leased WebDriver of a Chromium browser.
+    """
+    driver = request.getfixturevalue("setup_browser")
+    if not supports_cdp(driver):
+        pytest.skip(f"{emulation} needs DevTools emulation (Chrome or Edge), "
+                    f"not available in {browser_name(driver) or 'this browser'}")
+    return driver
+
+
+@pytest.fixture
+def load_runner(request):
+    """
+    Provide a load runner following --load_stages, with its own pool of one browser per virtual user.
+
+    The test sets the runner's flow and calls run(). Live reports go straight to the terminal.
+
+    Args:
+        request (FixtureRequest): The pytest request object.
+
+    Yields:
+        LoadRunner: The runner, without a flow yet.
+    """
+    config = request.config
+    if not config.getoption("load_stages"):
+        pytest.skip("Load tests run with --load_stages")
+    stages = parse_stages(config.getoption("load_stages"))
+    pool = new_driver_pool(config, max(stage.users for stage in stages))
+    terminal = config.pluginmanager.get_plugin("terminalreporter")
+
+    runner = LoadRunner(
+        pool, None, stages,
+        think_time=ThinkTime(config.getoption("think_time"), config.getoption("think_model")),
+        report_interval=config.getoption("load_report_interval"),
+        on_report=lambda line: terminal.write_line(f"[load] {line}") if terminal else logger.info(line),
+    )
+    yield runner
+    pool.shutdown()
+    if runner.stats.iterations:
+        load_summaries.append([f"{request.node.name}: {runner.stats.summary_lines()[0]}"]
+                              + runner.stats.summary_lines()[1:])
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_call(item):
+    """
+    Record a performance trace of the test body with --chrome_trace, store it and attach its hot spots,
+    take the end-of-test memory sample with --memory_monitor, measure the browser processes with
+    --resource_monitor and count the WebDriver round trips against the test's budget with --command_profile.
+
+    Args:
+        item (Item): The test item being run.
+
+    Yields:
+        None
+    """
+    driver = getattr(item.instance, "driver", None) if isinstance(item.instance, BaseClass) else None
+    traced = chrome_tracer is not None and driver is not None and chrome_tracer.begin(driver)
+    measured = resource_monitor is not None and resource_monitor.start_test(driver)
+    profiled = command_profiler is not None and driver is not None
+    if profiled:
+        command_profiler.attach(driver)
+        budget = item.get_closest_marker("max_round_trips")
+        command_profiler.start_test(item.nodeid, budget.args[0] if budget else None)
+    start = time.perf_counter()
+    outcome = yield
+    if profiled:
+        round_trips = command_profiler.finish_test()
+        TestMetrics.record("webdriver.round_trips", round_trips.by_command.total)
+        TestMetrics.record("webdriver.seconds", round_trips.by_command.total_seconds)
+        allure.attach(round_trips.report(), name="WebDriver commands", attachment_type=allure.attachment_type.TEXT)
+        if round_trips.over_budget:
+            message = (f"{item.nodeid}: {round_trips.by_command.total} WebDriver round trips, "
+                       f"over the budget of {round_trips.budget}")
+            if command_profiler.fail_over_budget and outcome.excinfo is None:
+                outcome.force_exception(pytest.fail.Exception(message, pytrace=False))
+            else:
+                logger.warning(message)
+    if measured:
+        usage = resource_monitor.finish_test(item.nodeid, item.cls.__name__ if item.cls else None)
+        TestMetrics.record("resources.cpu_seconds", round(usage.cpu_seconds, 3))
+        TestMetrics.record("resources.peak_pss_mb", round(usage.peak_memory / MB, 1))
+        TestMetrics.record("resources.io_read_mb", round(usage.read_bytes / MB, 2))
+        TestMetrics.record("resources.io_write_mb", round(usage.write_bytes / MB, 2))
+        allure.attach(usage.summary(), name="Resources", attachment_type=allure.attachment_type.TEXT)
+    if traced:
+        try:
+            summary, path = chrome_tracer.end(driver, item.nodeid, time.perf_counter() - start)
+            allure.attach(f"{summary}\n\nTrace: {path}", name="Performance trace",
+                          attachment_type=allure.attachment_type.TEXT)
+        except Exception as e:
+            logger.warning(f"Could not collect the performance trace of {item.nodeid}: {e}")
+
+    monitor = BaseClass.memory_monitor
+    if monitor is not None:
+        # The class-scoped driver stays on the class, so the samples of its successive tests are comparable
+        memory_report = monitor.finish_test(driver)
+        if memory_report:
+            TestMetrics.record("memory.heap_delta_mb", monitor.heap_delta_mb)
+            allure.attach(memory_report, name="Memory", attachment_type=allure.attachment_type.TEXT)
+
+
+def pytest_runtest_setup(item):
+    """
+    Start collecting the metrics of the test (reset cost, memory samples and the like).
+
+    Args:
+        item (Item): The test item about to run.
+
+    Returns:
+        None
+    """
+    TestMetrics.start_test()
+    BaseClass.log_manager.begin_test()
+    if BaseClass.memory_monitor is not None:
+        BaseClass.memory_monitor.start_test(item.nodeid)
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """
+    Attach the metrics collected during a test, and its captured log when it failed or was xfailed,
+    to its teardown report, the allure report and the html report.
+
+    Args:
+        item (Item): The test item.
+        call (CallInfo): The call information of the phase that just ran.
+
+    Yields:
+        None
+    """
+    outcome = yield
+    report = outcome.get_result()
+    if report.failed or hasattr(report, "wasxfail"):
+        item.stash[log_kept_key] = True
+    if call.when != "teardown":
+        return
+
+    captured_log = BaseClass.log_manager.end_test(keep=item.stash.get(log_kept_key, False))
+    if captured_log:
+        attach_to_reports(item, report, "Captured log", captured_log, allure.attachment_type.TEXT)
+
+    metrics = TestMetrics.finish_test()
+    if metrics:
+        for name, value in metrics.items():
+            item.user_properties.append((name, value))
+        attach_to_reports(item, report, "Test metrics", TestMetrics.format_metrics(metrics),
+                          allure.attachment_type.JSON)
+
+
+def attach_to_reports(item, report, name, text, attachment_type):
+    """
+    Attach a text to the allure result of a test and, when pytest-html is active, to its html report.
+
+    Args:
+        item (Item): The test item.
+        report (TestReport): The report the html extra is added to.
+        name (str): The attachment name.
+        text (str): The attachment content.
+        attachment_type (AttachmentType): The allure attachment type (TEXT or JSON).
+    """
+    try:
+        allure.attach(text, name=name, attachment_type=attachment_type)
+    except Exception as e:
+        logger.debug(f"Could not attach {name} to allure: {e}")
+    if item.config.pluginmanager.hasplugin("html"):
+        from pytest_html import extras
+        report.extras = getattr(report, "extras", []) + [extras.text(text, name=name)]
+
+
+def end_of_run_summary():
+    """
+    Collect the end-of-run report lines of this process (driver pool benchmark, grid utilization, reset, wait, log capture, image cache cost, load runs, CPU profile latencies, memory, page object hot paths, WebDriver round trips, browser resources, tracing cost and perf regressions).
+
+    Returns:
+        dict: Section title -> list of report lines.
+    """
+    summary = {}
+    if driver_pool is not None:
+        summary["driver pool"] = driver_pool.benchmark_summary()
+    if grid_scheduler is not None:
+        summary["grid utilization"] = grid_scheduler.utilization_report()
+    totals = TestMetrics.session_totals()
+    if totals.get("reset.count"):
+        resets, seconds = totals["reset.count"], totals.get("reset.seconds", 0.0)
+        summary["application reset"] = [
+            f"{resets} resets ({BaseClass.reset_mode} mode{', session kept' if BaseClass.keep_session else ''}): "
+            f"{seconds:.2f}s total, {seconds / resets:.3f}s per reset"
+        ]
+    if totals.get("wait.count") or totals.get("wait.instant_checks"):
+        summary["waits"] = [
+            f"{totals.get('wait.count', 0)} explicit waits ({totals.get('wait.timeouts', 0)} timed out): "
+            f"{totals.get('wait.seconds', 0.0):.2f}s waiting, {totals.get('wait.instant_checks', 0)} instant checks"
+        ]
+    if BaseClass.log_manager.capture_size:
+        summary["log capture"] = BaseClass.log_manager.capture_report()
+    if BaseClass.image_cache is not None:
+        stats = BaseClass.image_cache.stats
+        summary["image cache"] = [
+            f"{stats['memory_hits']} memory hits, {stats['disk_hits']} revalidated from disk, "
+            f"{stats['downloads']} downloads, {stats['fetch_time']:.2f}s fetching"
+        ]
+    for lines in load_summaries:
+        summary.setdefault("load", []).extend(lines)
+    cpu_table = cpu_comparison_table(PerfHarness.measurements)
+    if cpu_table:
+        summary["cpu profiles"] = cpu_table
+    if BaseClass.memory_monitor is not None and BaseClass.memory_monitor.tests:
+        summary["memory"] = BaseClass.memory_monitor.report()
+    if BaseClass.method_profiler is not None and BaseClass.method_profiler.stats:
+        summary["page object methods"] = BaseClass.method_profiler.hot_paths()
+    if command_profiler is not None and command_profiler.tests:
+        summary["webdriver commands"] = command_profiler.report()
+    if resource_monitor is not None and resource_monitor.tests:
+        summary["resources"] = resource_monitor.report()
+    if chrome_tracer is not None and chrome_tracer.traces:
+        summary["tracing"] = chrome_tracer.overhead_report(PerfHarness.measurements, PerfHarness.history,
+                                                           PerfHarness.run_key)
+    if PerfHarness.comparisons:
+        regressions = [c for c in PerfHarness.comparisons if c.regressed]
+        summary["perf history"] = [
+            f"{len(PerfHarness.comparisons)} perf steps compared with up to {PerfHarness.history.baseline_runs} "
+            f"earlier runs, {len(regressions)} significant regressions"
+        ] + [c.summary() for c in PerfHarness.comparisons]
+    return summary
+
+
+def pytest_terminal_summary(terminalreporter, exitstatus, config):
+    """
+    Print the end-of-run summaries and the parallel speedup at the end of the run, and record the run's wall time.
+
+    The speedup is the summed duration of all test phases divided by the session wall time, so runs with
+    different --workers values can be compared directly. The wall time is kept per test selection, pool mode
+    and worker count: the driver pool saving is measured against a run of the same tests with the other mode,
+    and the scaling table lists the wall time of the same tests at every worker count run so far.
+
+    Args:
+        terminalreporter (TerminalReporter): The pytest terminal reporter.
+        exitstatus (int): The exit status of the run.
+        config (Config): The pytest configuration object.
+
+    Returns:
+        None
+    """
+    for title, lines in end_of_run_summary().items():
+        terminalreporter.section(title)
+        for line in lines:
+            terminalreporter.write_line(line)
+
+    for worker, summary in sorted(worker_summaries.items()):
+        for title, lines in summary.items():
+            terminalreporter.section(f"{title} [{worker}]")
+            for line in lines:
+                terminalreporter.write_line(line)
+
+    workers = getattr(config.option, "numprocesses", None)
+    if session_start_time is None:
+        return
+    wall_time = time.perf_counter() - session_start_time
+    nodeids = {report.nodeid for reports in terminalreporter.stats.values() for report in reports
+               if getattr(report, "when", None) == "call" or getattr(report, "skipped", False)}
+    pool_mode = config.getoption("driver_pool")
+    scaling = []
+    if nodeids and exitstatus in (pytest.ExitCode.OK, pytest.ExitCode.TESTS_FAILED):
+        earlier = RunLog(RUN_BENCHMARK_FILE).record(
+            selection_key(nodeids, config.getoption("browser_type"), config.getoption("run_env")),
+            len(nodeids), wall_time, driver_pool=pool_mode, workers=workers or 1)
+        scaling = scaling_table(earlier, wall_time, workers or 1, pool_mode)
+        if driver_pool is not None or any("driver pool" in summary for summary in worker_summaries.values()):
+            terminalreporter.section("driver pool benchmark")
+            for line in pool_comparison(earlier, wall_time, len(nodeids), pool_mode, workers or 1):
+                terminalreporter.write_line(line)
+
+    if workers or scaling:
+        terminalreporter.section("parallel run")
+    for line in scaling:
+        terminalreporter.write_line(line)
+    if workers:
+        test_time = sum(
+            getattr(report, "duration", 0.0)
+            for reports in terminalreporter.stats.values()
+            for report in reports
+            if hasattr(report, "when")
+        )
+        speedup = test_time / wall_time if wall_time else 0.0
+        terminalreporter.write_line(
+            f"{workers} workers: test time {test_time:.2f}s, wall time {wall_time:.2f}s, "
+            f"speedup {speedup:.2f}x, efficiency {speedup / workers * 100:.0f}%"
+        )
+
+
+def resolve_base_url(config):
+    """
+    Resolve the URL of the application under test, starting this process's stand-in site for --stand_in.
+
+    Every pytest-xdist worker starts its own site on a free port.
+
+    Args:
+        config (Config): The pytest configuration object.
+
+    Returns:
+        str: The base URL, ending with a slash.
+    """
+    global stand_in_site
+    if not config.getoption("stand_in"):
+        return config.getoption("base_url").rstrip("/") + "/"
+    stand_in_site = StandInSite(faults=parse_faults(config.getoption("stand_in_faults"))).start()
+    logger.info(f"Running against the stand-in site at {stand_in_site.url}")
+    return stand_in_site.url + "/"
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Skip the tests that need external sites when running offline against the stand-in site.
+
+    Args:
+        config (Config): The pytest configuration object.
+        items (list): The collected test items.
+
+    Returns:
+        None
+    """
+    if not config.getoption("stand_in"):
+        return
+    skip_external = pytest.mark.skip(reason="External sites are not reachable with --stand_in")
+    for item in items:
+        if "external" in item.keywords:
+            item.add_marker(skip_external)
 
 
 def pytest_configure(config):
     """
-    Configure pytest to set up the HTML report file with a timestamp.
+    Configure pytest to set up the HTML report file with a timestamp, and apply the framework-wide switches.
 
     Args:
         config (Config): The pytest configuration object.
@@ -209,6 +1102,53 @@ def pytest_configure(config):
     Returns:
         None
     """
+    global chrome_tracer, command_profiler, resource_monitor
+    BaseClass.force_ui_login = config.getoption("ui_login")
+    BaseClass.reset_mode = config.getoption("reset_mode")
+    BaseClass.keep_session = config.getoption("keep_session")
+    BaseClass.image_cache_dir = config.getoption("image_cache_dir")
+    BaseClass.log_manager.configure(
+        json_format=config.getoption("json_log"),
+        capture_size=config.getoption("log_capture_size") if config.getoption("log_capture") else 0,
+    )
+    BaseClass.DEFAULT_TIMEOUT = config.getoption("wait_timeout")
+    BaseClass.POLL_INTERVAL = config.getoption("poll_interval")
+    BaseClass.BASE_URL = resolve_base_url(config)
+    if config.getoption("memory_monitor"):
+        BaseClass.memory_monitor = MemoryMonitor(config.getoption("memory_budget_mb"), config.getoption("leak_runs"))
+    if config.getoption("method_profile"):
+        BaseClass.method_profiler = MethodProfiler(top=config.getoption("method_profile_top"))
+        # Page objects imported before this point, the others are instrumented when their class is created
+        BaseClass.method_profiler.instrument_subclasses(BaseClass)
+    if config.getoption("command_profile") or config.getoption("max_round_trips") is not None:
+        command_profiler = CommandProfiler(config.getoption("max_round_trips"),
+                                           fail_over_budget=config.getoption("round_trip_budget") == "fail")
+    if config.getoption("resource_monitor"):
+        resource_monitor = ResourceMonitor(config.getoption("resource_interval"))
+    if config.getoption("chrome_trace"):
+        chrome_tracer = ChromeTracer(config.getoption("chrome_trace_dir"))
+        # Traced perf steps get their own perf history series, compared with the untraced ones for the overhead
+        PerfHarness.conditions["trace"] = "on"
+    config.addinivalue_line("markers", "external: the test leaves the application under test for another site")
+    config.addinivalue_line("markers", "network_profile(name): network conditions emulated for the class or test")
+    config.addinivalue_line("markers", "network_matrix: the test runs once per profile of --network_matrix")
+    config.addinivalue_line("markers", "max_round_trips(n): WebDriver round trip budget of the test")
+    config.addinivalue_line("markers", "cpu_sweep: the test runs once per CPU profile with --cpu_sweep")
+    for name in [config.getoption("network_profile")] + (config.getoption("network_matrix") or "").split(","):
+        try:
+            get_network_profile(name.strip()) if name.strip() else None
+        except ValueError as e:
+            raise pytest.UsageError(str(e))
+    try:
+        get_cpu_profile(config.getoption("cpu_profile"))
+    except ValueError as e:
+        raise pytest.UsageError(str(e))
+    PerfHarness.default_warmup = config.getoption("perf_warmup")
+    PerfHarness.default_iterations = config.getoption("perf_iterations")
+    if config.getoption("perf_history"):
+        PerfHarness.history = PerfHistory(config.getoption("perf_history"),
+                                          baseline_runs=config.getoption("perf_baseline_runs"))
+
     timestamp = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
     report_dir = "Reports"
     os.makedirs(report_dir, exist_ok=True)